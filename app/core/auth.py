@@ -1,3 +1,5 @@
+import functools
+import json
 import logging
 import time
 import uuid as uuid_lib
@@ -8,8 +10,14 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from pydantic import BaseModel
 import httpx
-from jose import jwt, jwk
-from jose.exceptions import JWTError, JWKError, ExpiredSignatureError, JWTClaimsError
+import jwt
+from jwt.exceptions import (
+    ExpiredSignatureError,
+    InvalidAudienceError,
+    InvalidIssuerError,
+    InvalidTokenError,
+    PyJWKError,
+)
 
 from app.db.session import get_db
 from app.models.user import User
@@ -141,6 +149,16 @@ def get_signing_key(token: str, jwks: Dict[str, Any]) -> Dict[str, Any]:
         )
 
 
+@functools.lru_cache(maxsize=16)
+def _construct_signing_key(jwk_json: str) -> jwt.PyJWK:
+    """
+    Build the PyJWT key for a serialized JWK, reusing it across requests.
+
+    Keyed by the full JWK (not just kid), so a rotated key under the same kid is rebuilt.
+    """
+    return jwt.PyJWK(json.loads(jwk_json))
+
+
 class Identity(BaseModel):
     """Represents the authenticated identity from the token."""
     provider: str
@@ -232,11 +250,10 @@ def verify_supabase_token(token: str) -> dict:
         # Get signing key from token header (kid)
         jwk_key = get_signing_key(token, jwks)
         
-        # Convert JWK to key object for verification
+        # Convert JWK to key object for verification (cached per JWK)
         try:
-            # jose.jwk.construct() creates a key object from JWK
-            key = jwk.construct(jwk_key)
-        except JWKError as e:
+            key = _construct_signing_key(json.dumps(jwk_key, sort_keys=True))
+        except PyJWKError as e:
             logger.error(f"Failed to construct key from JWK: {e}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -272,7 +289,7 @@ def verify_supabase_token(token: str) -> dict:
         try:
             payload = jwt.decode(
                 token,
-                key,
+                key.key,
                 algorithms=supported_algorithms,
                 audience=settings.supabase_jwt_audience,
                 issuer=settings.supabase_issuer,
@@ -293,13 +310,13 @@ def verify_supabase_token(token: str) -> dict:
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token verification failed"
             )
-        except JWTClaimsError as e:
+        except (InvalidAudienceError, InvalidIssuerError) as e:
             logger.warning(f"Token claims validation failed: {e}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token verification failed"
             )
-        except JWTError as e:
+        except InvalidTokenError as e:
             logger.warning(f"JWT verification error: {e}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -380,13 +397,12 @@ def get_current_identity(
     )
 
 
-def get_current_user_optional(
+def get_optional_auth_uid(
     credentials: HTTPAuthorizationCredentials | None = Depends(HTTPBearer(auto_error=False)),
-    db: Session = Depends(get_db)
-) -> User | None:
+) -> str | None:
     """
-    Get current user if authenticated, otherwise return None.
-    Does not create users; use for endpoints that work for both guests and authenticated users.
+    Verified, normalized Supabase uid from an optional Bearer token; None for guests or invalid tokens.
+    No DB access, so handlers can load the User together with their own rows.
     """
     if not credentials or not credentials.credentials:
         return None
@@ -395,9 +411,7 @@ def get_current_user_optional(
         uid = claims.get("sub")
         if not uid:
             return None
-        uid_str = str(_normalize_supabase_uid(uid))
-        user = db.query(User).filter(User.external_auth_uid == uid_str).first()
-        return user
+        return str(_normalize_supabase_uid(uid))
     except HTTPException:
         return None
     except Exception as e:
@@ -20,16 +20,34 @@ class Settings(BaseSettings):
     debug: bool = Field(default=False, alias="DEBUG")
     
     # Google Maps API key for Places API proxy endpoints (optional)
+    # The key's project needs both Places API and Places API (New): opening-hours grounding
+    # calls places:searchText (New), which returns HTTP 403 if that API is not enabled.
     google_maps_api_key: str | None = None
     
     # Gemini AI configuration (optional)
-    # gemini_api_key: used for ai_context and ai_notes generation (places, business_context, ai_notes_service)
+    # gemini_api_key: used for ai_context and ai_notes generation (places, business_context, business_ai_insights)
     gemini_api_key: str | None = None
     # gemini_api_key2: used only for the conversational chat endpoint (POST /api/v1/chat/business/{id})
     gemini_api_key2: str | None = None
     gemini_model: str = "gemini-2.5-flash"
-    # Cooldown in seconds after 429 RESOURCE_EXHAUSTED; used when RetryInfo not present
+    # Base cooldown in seconds after 429 RESOURCE_EXHAUSTED; doubles per consecutive 429
+    # (±25% jitter) up to gemini_quota_cooldown_cap_seconds. RetryInfo, when present, is a floor.
     gemini_quota_cooldown_seconds: int = 60
+    gemini_quota_cooldown_cap_seconds: int = 600
+    # Per-request timeout in seconds for async Gemini calls; a timed-out call returns None
+    gemini_request_timeout_s: float = 15.0
+    # Max concurrent async Gemini calls per worker; extra requests wait for a slot
+    gemini_max_concurrent_requests: int = 8
+    # Client-side pacing per API key (requests per minute, burst rpm/4) so we stay under the
+    # tier's limit instead of waiting out 429 cooldowns; 0 disables. A call that would wait
+    # longer than gemini_max_block_s for a slot returns None instead.
+    gemini_rpm_primary: int = 60
+    gemini_rpm_chat: int = 60
+    gemini_max_block_s: float = 2.0
+    
+    # Default per-request deadline in ms, used when the client sends no X-Request-Deadline-Ms.
+    # Gemini calls whose deadline has already passed are skipped instead of sent.
+    request_sla_ms: int = 30000
     
     @property
     def supabase_jwks_url(self) -> str:
@@ -0,0 +1,23 @@
+"""Per-request deadline for routes that wait on Gemini."""
+
+import time
+
+from fastapi import Header
+
+from app.core.config import settings
+
+
+def request_deadline(x_request_deadline_ms: str | None = Header(default=None)) -> float:
+    """
+    time.monotonic() value after which the caller has stopped waiting.
+
+    X-Request-Deadline-Ms is the client's remaining budget in milliseconds; without it
+    (or if it is invalid) settings.request_sla_ms applies.
+    """
+    budget_ms = settings.request_sla_ms
+    if x_request_deadline_ms:
+        try:
+            budget_ms = max(0, int(x_request_deadline_ms))
+        except ValueError:
+            pass
+    return time.monotonic() + budget_ms / 1000
@@ -1,6 +1,10 @@
 """Geo utilities: distance (Haversine) and unit conversion."""
 
 import math
+from collections.abc import Iterable
+
+_DEG2RAD = math.pi / 180
+_EARTH_RADIUS_M = 6371000.0
 
 
 def haversine_distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -19,6 +23,28 @@ def haversine_distance_km(lat1: float, lon1: float, lat2: float, lon2: float) ->
     return R * c
 
 
+def haversine_distances_m(
+    lat0: float, lng0: float, points: Iterable[tuple[float, float]]
+) -> list[float]:
+    """
+    Distances in meters from one origin to many (lat, lng) points.
+    Origin trig is computed once; each point costs one cos, two sin, one sqrt, one asin.
+    """
+    sin, cos, asin, sqrt = math.sin, math.cos, math.asin, math.sqrt
+    phi0 = lat0 * _DEG2RAD
+    lam0 = lng0 * _DEG2RAD
+    cos_phi0 = cos(phi0)
+    two_r = 2 * _EARTH_RADIUS_M
+    out: list[float] = []
+    for lat, lng in points:
+        phi = lat * _DEG2RAD
+        s1 = sin((phi - phi0) * 0.5)
+        s2 = sin((lng * _DEG2RAD - lam0) * 0.5)
+        a = s1 * s1 + cos_phi0 * cos(phi) * s2 * s2
+        out.append(two_r * asin(sqrt(min(a, 1.0))))
+    return out
+
+
 def km_to_miles(km: float) -> float:
     """Convert kilometers to miles."""
     return km * 0.621371
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, exists, select
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
 
@@ -18,6 +18,11 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def row_exists(db: Session, model, pk) -> bool:
+    """Existence probe by primary key: SELECT EXISTS(...) instead of loading the row."""
+    return bool(db.scalar(select(exists().where(model.id == pk))))
+
+
 def init_db() -> None:
     """Initialize database tables."""
     Base.metadata.create_all(bind=engine)
@@ -1,11 +1,26 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from app.core.config import settings
 from app.routers import users, businesses, menu_items, scan_sessions, recommendation_items, me, places, home, ai, chat
+from app.services.places_client import close_http_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release shared outbound HTTP connections on shutdown."""
+    yield
+    await close_http_client()
+
 
 app = FastAPI(
     title=settings.project_name,
     version="1.0.0",
+    lifespan=lifespan,
+    # Route bodies are rendered with orjson (C encoder) instead of stdlib json
+    default_response_class=ORJSONResponse,
 )
 
 # Include routers
@@ -37,3 +37,16 @@ class Business(Base):
         "BusinessChatMessage", back_populates="business", cascade="all, delete-orphan"
     )
 
+    @property
+    def full_address(self) -> str | None:
+        """Google Places address, falling back to the legacy address_full column."""
+        return self.address or self.address_full
+
+    @property
+    def coordinates(self) -> tuple[float, float] | None:
+        """(lat, lng) preferring the Google Places latitude/longitude columns; None if either is missing."""
+        lat = self.latitude if self.latitude is not None else self.lat
+        lng = self.longitude if self.longitude is not None else self.lng
+        if lat is None or lng is None:
+            return None
+        return (lat, lng)
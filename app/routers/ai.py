@@ -1,23 +1,50 @@
 """AI endpoints using Gemini."""
 
+import asyncio
 import json
 import logging
 import re
+import string
 import traceback
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, NamedTuple
 from uuid import UUID
 
+import anyio
+import anyio.to_thread
+import orjson
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, field_validator
-from sqlalchemy.orm import Session
-
-from app.services.gemini_client import generate_text, generate_text_with_system
+from sqlalchemy import select
+from sqlalchemy.orm import Session, raiseload
+
+from app.services._ttl_cache import TTLCache
+from app.services.business_cache import (
+    BUSINESS_SNAPSHOT_COLUMNS,
+    BusinessSnapshot,
+    cache_business,
+    get_cached_business,
+    load_business,
+)
+from app.services.user_prefs_cache import (
+    USER_PREFS_COLUMNS,
+    UserPrefs,
+    cache_user_prefs,
+    get_cached_user_prefs,
+    get_or_load,
+)
+from app.services.gemini_client import (
+    generate_text,
+    generate_text_with_system_async,
+    stream_text_with_system_async,
+)
 from app.services.places_client import (
     DEFAULT_NEARBY_RADIUS_M,
     find_place_with_hours,
     search_places_text,
 )
-from app.core.auth import get_current_user_optional
+from app.core.auth import get_optional_auth_uid
+from app.core.deadline import request_deadline
 from app.core.geo import haversine_distance_km, km_to_miles
 from app.db.session import get_db
 from app.models.user import User
@@ -125,6 +152,12 @@ PLACE_QUERY_MAP = [
     (re.compile(r'\bbakery\b', re.IGNORECASE), "bakery"),
     (re.compile(r'\bpizza\b', re.IGNORECASE), "pizza restaurant"),
 ]
+# PLACE_QUERY_MAP folded into one alternation with a named group per entry (q<index>), so a
+# message is scanned once instead of once per entry; the lowest matching index wins.
+_PLACE_QUERY_RE = re.compile(
+    "|".join(f"(?P<q{i}>{pattern.pattern})" for i, (pattern, _) in enumerate(PLACE_QUERY_MAP)),
+    re.IGNORECASE,
+)
 
 
 class HelloRequest(BaseModel):
@@ -179,6 +212,16 @@ class ChatResponse(BaseModel):
     recommended_places: list[RecommendedPlace] | None = None
 
 
+class _ChatTurn(NamedTuple):
+    """A /ai/chat turn that goes to Gemini: the prompt, plus what is returned alongside the reply."""
+
+    user_content: str
+    system_instruction: str
+    ai_context: dict | None = None
+    recommended_places: list[RecommendedPlace] | None = None
+    main_chat: bool = False  # main chat replies are returned stripped
+
+
 def _is_hours_query(message: str) -> bool:
     """Check if the message is asking about business hours."""
     return bool(HOURS_KEYWORDS.search(message))
@@ -259,7 +302,7 @@ def _merge_ai_context_into_payload(
 
 
 def _build_business_context_payload(
-    business: Business | None,
+    business: Business | BusinessSnapshot | None,
     business_context_dict: Dict[str, Any] | None,
     ai_context: Dict[str, Any] | None = None,
 ) -> Dict[str, Any]:
@@ -287,17 +330,14 @@ def _build_business_context_payload(
         payload["id"] = str(business.id)
         payload["name"] = business.name
         # Prefer address/state from Google Places columns; fall back to address_full
-        addr_full = getattr(business, "address", None) or business.address_full
-        addr_state = getattr(business, "state", None)
+        addr_full = business.full_address
+        addr_state = business.state
         if addr_full or addr_state:
             payload["address"] = {k: v for k, v in ({"full": addr_full, "state": addr_state}.items()) if v is not None}
-        elif business.address_full:
-            payload["address"] = {"full": business.address_full}
         # Prefer latitude/longitude (Google Places); fall back to lat/lng
-        lat_val = business.latitude if getattr(business, "latitude", None) is not None else business.lat
-        lng_val = business.longitude if getattr(business, "longitude", None) is not None else business.lng
-        if lat_val is not None and lng_val is not None:
-            payload["coordinates"] = {"lat": lat_val, "lng": lng_val}
+        coords = business.coordinates
+        if coords is not None:
+            payload["coordinates"] = {"lat": coords[0], "lng": coords[1]}
         payload["category"] = business.category
         if getattr(business, "ai_notes", None):
             payload["ai_notes"] = business.ai_notes
@@ -337,18 +377,31 @@ def _build_business_context_payload(
     return {k: v for k, v in payload.items() if v is not None}
 
 
+def _json_indented(value: Any) -> str:
+    """
+    Pretty JSON for prompt sections (orjson; non-ASCII text is kept as-is rather than escaped).
+
+    Client-sent dicts can hold values orjson rejects (integers wider than 64 bits); those
+    fall back to stdlib json.
+    """
+    try:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    except orjson.JSONEncodeError:
+        return json.dumps(value, indent=2, ensure_ascii=False)
+
+
 def _business_context_json_section(payload: Dict[str, Any]) -> str:
     """Serialize structured business context to a single system message string (JSON blob)."""
     if not payload:
         return ""
-    return f"BusinessContext (JSON): {json.dumps(payload, indent=2)}"
+    return f"BusinessContext (JSON): {_json_indented(payload)}"
 
 
 def _user_preferences_json_section(preferences: Dict[str, Any] | None) -> str:
     """Serialize user preferences to a single system message string (JSON blob)."""
     if not preferences or not isinstance(preferences, dict):
         return ""
-    return f"UserPreferences (JSON): {json.dumps(preferences, indent=2)}"
+    return f"UserPreferences (JSON): {_json_indented(preferences)}"
 
 
 def _user_location_context_section(area_hint: str | None) -> str:
@@ -365,19 +418,59 @@ def _candidate_businesses_section(places: list[RecommendedPlace] | None) -> str:
     return f"candidate_businesses (JSON): {json.dumps(payload)}"
 
 
+# Sections are separated by a blank paragraph
+_PROMPT_SECTION_SEP = "\n\n\n\n"
+
+# System prompt layouts, parsed once at import: the static instructions with $-placeholders for
+# the per-turn sections. Optional sections are substituted together with their separator.
+_MAIN_CHAT_PROMPT_TEMPLATE = string.Template(
+    MAIN_CHAT_SYSTEM_PROMPT.replace("$", "$$")
+    + _PROMPT_SECTION_SEP + "$location"
+    + _PROMPT_SECTION_SEP + "$candidates"
+    + "$preferences"
+)
+_CHAT_PROMPT_TEMPLATE = string.Template(CHAT_SYSTEM_PROMPT.replace("$", "$$") + "$business$preferences")
+
+
+def _optional_section(section: str) -> str:
+    return _PROMPT_SECTION_SEP + section if section else ""
+
+
+# Rendered system instructions keyed by their inputs (compact orjson bytes). Turns of one chat
+# session repeat the same business, preferences and location, so they get the same string
+# object back and its hash (for the Gemini config and reply caches) is computed only once.
+SYSTEM_INSTRUCTION_CACHE_MAXSIZE = 1024
+SYSTEM_INSTRUCTION_CACHE_TTL_SECONDS = 900
+_system_instruction_cache = TTLCache(SYSTEM_INSTRUCTION_CACHE_MAXSIZE, SYSTEM_INSTRUCTION_CACHE_TTL_SECONDS)
+
+
+def _memoized_instruction(key_parts: tuple, build: Callable[[], str]) -> str:
+    try:
+        key = orjson.dumps(key_parts, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        # Client-sent dicts orjson cannot encode (e.g. ints wider than 64 bits): build uncached
+        return build()
+    instruction = _system_instruction_cache.get(key)
+    if instruction is None:
+        instruction = build()
+        _system_instruction_cache.set(key, instruction)
+    return instruction
+
+
 def _build_main_chat_system_instruction(
     location_hint: str | None,
     preferences: Dict[str, Any] | None = None,
     candidate_businesses: list[RecommendedPlace] | None = None,
 ) -> str:
     """Build system instruction for main chat (local discovery + candidate list)."""
-    parts = [MAIN_CHAT_SYSTEM_PROMPT, "", _user_location_context_section(location_hint)]
-    parts.append("")
-    parts.append(_candidate_businesses_section(candidate_businesses))
-    if preferences and isinstance(preferences, dict):
-        parts.append("")
-        parts.append(_user_preferences_json_section(preferences))
-    return "\n\n".join(parts).strip()
+    return _memoized_instruction(
+        ("main", location_hint, preferences, [(p.name, p.place_id) for p in candidate_businesses or ()]),
+        lambda: _MAIN_CHAT_PROMPT_TEMPLATE.substitute(
+            location=_user_location_context_section(location_hint),
+            candidates=_candidate_businesses_section(candidate_businesses),
+            preferences=_optional_section(_user_preferences_json_section(preferences)),
+        ),
+    )
 
 
 def _parse_recommended_places_from_reply(raw_reply: str) -> tuple[str, list[RecommendedPlace] | None]:
@@ -412,16 +505,14 @@ def _is_place_like_message(message: str) -> bool:
 
 def _message_to_place_query(message: str) -> str | None:
     """Build a short search query for Google Places from the user message. Returns None if not place-like."""
-    if not _is_place_like_message(message):
+    m = PLACE_LIKE_KEYWORDS.search(message)
+    if not m:
         return None
-    for pattern, query in PLACE_QUERY_MAP:
-        if pattern.search(message):
-            return query
+    best = min((int(hit.lastgroup[1:]) for hit in _PLACE_QUERY_RE.finditer(message)), default=None)
+    if best is not None:
+        return PLACE_QUERY_MAP[best][1]
     # Fallback: use first matched keyword as query
-    m = PLACE_LIKE_KEYWORDS.search(message)
-    if m:
-        return m.group(0).strip()
-    return "place"
+    return m.group(0).strip()
 
 
 async def _fetch_recommended_places_for_message(
@@ -532,22 +623,55 @@ def ai_hello(request: HelloRequest) -> HelloResponse:
         )
 
 
-@router.post("/chat", response_model=ChatResponse)
-async def ai_chat(
+def _load_user_and_business(
+    db: Session,
+    auth_uid: str | None,
+    business_id: UUID | None,
+) -> tuple[UserPrefs | None, BusinessSnapshot | None]:
+    """
+    Load snapshots of the caller (by Supabase uid) and of the requested Business.
+    Both come from their caches when present (user_prefs_cache, business_cache); when both
+    miss this is a single SELECT: the business LEFT JOINed to the user row.
+    Only the columns the snapshots copy are selected, and relationships are raiseload'ed:
+    the chat path only reads those columns, and a lazy load sneaking into the prompt
+    builders should fail in tests rather than add queries.
+    """
+    user = get_cached_user_prefs(auth_uid) if auth_uid is not None else None
+    business = get_cached_business(business_id) if business_id is not None else None
+    need_user = auth_uid is not None and user is None
+    if business_id is not None and business is None:
+        if not need_user:
+            return user, load_business(db, business_id)
+        row = db.execute(
+            select(Business, User)
+            .outerjoin(User, User.external_auth_uid == auth_uid)
+            .where(Business.id == business_id)
+            .options(BUSINESS_SNAPSHOT_COLUMNS, USER_PREFS_COLUMNS, raiseload("*"))
+        ).first()
+        if row is None:
+            return None, None
+        return (cache_user_prefs(row.User) if row.User is not None else None), cache_business(row.Business)
+    if need_user:
+        user = get_or_load(
+            auth_uid,
+            lambda: db.scalars(
+                select(User)
+                .where(User.external_auth_uid == auth_uid)
+                .options(USER_PREFS_COLUMNS, raiseload("*"))
+            ).first(),
+        )
+    return user, business
+
+
+async def _prepare_chat_turn(
     request: ChatRequest,
-    current_user: User | None = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
-) -> ChatResponse:
+    auth_uid: str | None,
+    db: Session,
+) -> ChatResponse | _ChatTurn:
     """
-    Production AI chat endpoint with grounded responses.
-    
-    - For hours queries: Uses Google Places data (no hallucination)
-    - For preferences queries: Returns stored onboarding answers
-    - For other queries: Uses Gemini with strict system prompt + optional business context + user preferences
-    
-    Request may include optional business_context and onboarding_preferences (e.g. from business-linked chat).
-    Backward compatible: older clients sending only message still work.
-    Supports both authenticated users and guests.
+    Everything /ai/chat and /ai/chat/stream do before calling Gemini.
+    Returns the final ChatResponse for turns answered without Gemini (preferences, hours,
+    missing location); otherwise the _ChatTurn to send.
     """
     message = request.message.strip()
     location_hint = request.location_hint
@@ -565,12 +689,43 @@ async def ai_chat(
         onboarding_preferences_from_request is not None,
     )
 
-    # Resolve business: load from DB when business_id is provided, then build structured context
-    business_from_db: Business | None = None
-    if business_id is not None:
-        business_from_db = db.query(Business).filter(Business.id == business_id).first()
-        if not business_from_db:
-            raise HTTPException(status_code=404, detail="Business not found")
+    is_preferences_query = _is_preferences_query(message)
+    is_hours_query = _is_hours_query(message)
+    # Main chat without a location can only get the fixed reply (preferences and hours queries
+    # aside), so answer it before any DB or network work.
+    if business_id is None and not location_hint and not is_preferences_query and not is_hours_query:
+        logger.info("AI chat route: business_id=None, no_location_path=True")
+        return ChatResponse(reply=NO_LOCATION_MESSAGE, ai_context=None)
+
+    # A main-chat place search needs only the message and coordinates, so start Google Places
+    # now and let it overlap the caller lookup; Gemini then waits on both (the candidates go
+    # into its prompt).
+    places_task: asyncio.Task | None = None
+    if (
+        business_id is None
+        and location_hint
+        and request.latitude is not None
+        and request.longitude is not None
+        and _is_place_like_message(message)
+        and not is_preferences_query
+        and not is_hours_query
+    ):
+        places_task = asyncio.create_task(
+            _fetch_recommended_places_for_message(message, request.latitude, request.longitude)
+        )
+
+    # Resolve caller and business in one round trip. Sync session: run it in a worker thread
+    # so the event loop keeps serving requests.
+    try:
+        current_user, business_from_db = await anyio.to_thread.run_sync(
+            _load_user_and_business, db, auth_uid, business_id
+        )
+    except BaseException:
+        if places_task is not None:
+            places_task.cancel()
+        raise
+    if business_id is not None and not business_from_db:
+        raise HTTPException(status_code=404, detail="Business not found")
     business_context_payload = _build_business_context_payload(
         business_from_db,
         business_context_from_client,
@@ -624,52 +779,135 @@ async def ai_chat(
     )
 
     # Check if user is asking about their preferences
-    if _is_preferences_query(message):
+    if is_preferences_query:
         if not current_user and not onboarding_preferences_from_request:
             return ChatResponse(reply="Please sign in to view your saved preferences.", ai_context=None)
         reply = _format_preferences_response(preferences)
         return ChatResponse(reply=reply, ai_context=None)
 
     # Check if this is a hours-related query
-    if _is_hours_query(message):
+    if is_hours_query:
         return await _handle_hours_query(message, location_hint)
 
-    # Main chat (no specific business): local discovery only; require location_hint.
-    # Only trigger no-location path when business_id is None AND location_hint is missing/empty
-    # (validator already normalizes "" and whitespace-only to None).
+    # Main chat (no specific business): local discovery only. location_hint is set here; the
+    # no-location path (validator normalizes "" and whitespace-only to None) returned above.
     is_main_chat = business_id is None
-    no_location_path = is_main_chat and not location_hint
     logger.info(
-        "AI chat route: location_hint=%r, business_id=%s, is_main_chat=%s, no_location_path=%s",
+        "AI chat route: location_hint=%r, business_id=%s, is_main_chat=%s",
         location_hint,
         business_id,
         is_main_chat,
-        no_location_path,
     )
     if is_main_chat:
-        if not location_hint:
-            return ChatResponse(reply=NO_LOCATION_MESSAGE, ai_context=None)
-        return await _handle_main_chat_query(
+        return await _main_chat_turn(
             message,
             location_hint=location_hint,
             preferences=preferences,
             latitude=request.latitude,
             longitude=request.longitude,
+            places_task=places_task,
         )
 
     # Business chat: general query with business context + preferences + chat history
-    return _handle_general_query(
+    return _business_chat_turn(
         message,
         preferences=preferences,
         business_context_payload=business_context_payload,
         chat_history=chat_history,
-        db=db,
-        current_user=current_user,
-        business_id=business_id,
         ai_context_for_response=ai_context_for_response,
     )
 
 
+@router.post("/chat", response_model=ChatResponse)
+async def ai_chat(
+    request: ChatRequest,
+    auth_uid: str | None = Depends(get_optional_auth_uid),
+    db: Session = Depends(get_db),
+    deadline: float = Depends(request_deadline),
+) -> ChatResponse:
+    """
+    Production AI chat endpoint with grounded responses.
+    
+    - For hours queries: Uses Google Places data (no hallucination)
+    - For preferences queries: Returns stored onboarding answers
+    - For other queries: Uses Gemini with strict system prompt + optional business context + user preferences
+    
+    Request may include optional business_context and onboarding_preferences (e.g. from business-linked chat).
+    Backward compatible: older clients sending only message still work.
+    Supports both authenticated users and guests.
+    """
+    turn = await _prepare_chat_turn(request, auth_uid, db)
+    if isinstance(turn, ChatResponse):
+        response = turn
+    else:
+        try:
+            reply = await generate_text_with_system_async(turn.user_content, turn.system_instruction, deadline=deadline)
+        except Exception as e:
+            raise _gemini_http_error(e)
+        if reply is None:
+            raise _gemini_unavailable()
+        if turn.main_chat:
+            reply = reply.strip()
+        response = ChatResponse(reply=reply, ai_context=turn.ai_context, recommended_places=turn.recommended_places)
+    return response
+
+
+@router.post("/chat/stream")
+async def ai_chat_stream(
+    request: ChatRequest,
+    auth_uid: str | None = Depends(get_optional_auth_uid),
+    db: Session = Depends(get_db),
+    deadline: float = Depends(request_deadline),
+) -> StreamingResponse:
+    """
+    Streaming variant of POST /ai/chat (Server-Sent Events).
+
+    Gemini text is sent as `data: {"delta": ...}` chunks as it is generated, and the stream
+    ends with `event: done` carrying the rest of the ChatResponse (ai_context,
+    recommended_places). Turns answered without Gemini arrive as a single delta.
+    Failures before the first chunk get the same status codes as /ai/chat; a failure
+    mid-stream is sent as `event: error`.
+    """
+    turn = await _prepare_chat_turn(request, auth_uid, db)
+    chunks: AsyncIterator[str] | None = None
+    if isinstance(turn, ChatResponse):
+        first, response = turn.reply, turn
+    else:
+        chunks = stream_text_with_system_async(
+            turn.user_content,
+            turn.system_instruction,
+            deadline=deadline,
+        )
+        # Wait for the first chunk before committing to a 200 so early failures keep their status code
+        try:
+            first = await anext(chunks, None)
+        except Exception as e:
+            raise _gemini_http_error(e)
+        if first is None:
+            raise _gemini_unavailable()
+        response = ChatResponse(reply="", ai_context=turn.ai_context, recommended_places=turn.recommended_places)
+
+    async def events():
+        yield _sse_event({"delta": first})
+        if chunks is not None:
+            try:
+                async for text in chunks:
+                    yield _sse_event({"delta": text})
+            except Exception as e:
+                logger.error(f"Gemini stream error: {e}\n{traceback.format_exc()}")
+                yield _sse_event({"error": "gemini_error", "message": str(e)}, event="error")
+                return
+            finally:
+                await chunks.aclose()
+        yield _sse_event(response.model_dump(mode="json", exclude={"reply"}), event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 async def _handle_hours_query(message: str, location_hint: str | None) -> ChatResponse:
     """Handle queries about business hours using Google Places."""
     try:
@@ -716,51 +954,33 @@ async def _handle_hours_query(message: str, location_hint: str | None) -> ChatRe
         )
 
 
-async def _handle_main_chat_query(
+async def _main_chat_turn(
     message: str,
     location_hint: str,
     preferences: Dict[str, Any] | None = None,
     latitude: float | None = None,
     longitude: float | None = None,
-) -> ChatResponse:
-    """Handle main chat (no business): fetch candidates first, then Gemini with option-format rules and candidate list."""
-    try:
-        recommended_places: list[RecommendedPlace] | None = None
-        if _is_place_like_message(message) and latitude is not None and longitude is not None:
-            recommended_places = await _fetch_recommended_places_for_message(
-                message, latitude, longitude, preferences
-            )
-            recommended_places = recommended_places or None  # empty list -> None for response
-
-        system_instruction = _build_main_chat_system_instruction(
-            location_hint=location_hint,
-            preferences=preferences,
-            candidate_businesses=recommended_places,
+    places_task: Awaitable[list[RecommendedPlace]] | None = None,
+) -> _ChatTurn:
+    """
+    Main chat (no business): fetch candidates first, then prompt Gemini with option-format rules and candidate list.
+    places_task is a candidate search the caller already started; it is awaited instead of searching again.
+    """
+    recommended_places: list[RecommendedPlace] | None = None
+    if places_task is not None:
+        recommended_places = await places_task or None
+    elif _is_place_like_message(message) and latitude is not None and longitude is not None:
+        recommended_places = await _fetch_recommended_places_for_message(
+            message, latitude, longitude, preferences
         )
-        reply = generate_text_with_system(message, system_instruction)
+        recommended_places = recommended_places or None  # empty list -> None for response
 
-        if reply is None:
-            raise HTTPException(
-                status_code=503,
-                detail={"error": "gemini_unavailable", "message": "AI is temporarily unavailable; please try again later."},
-            )
-
-        reply_clean = reply.strip()
-        return ChatResponse(reply=reply_clean, ai_context=None, recommended_places=recommended_places)
-    except HTTPException:
-        raise
-    except ValueError as e:
-        logger.error(f"Gemini config error: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail={"error": str(e)}
-        )
-    except Exception as e:
-        logger.error(f"Gemini main chat error: {e}\n{traceback.format_exc()}")
-        raise HTTPException(
-            status_code=500,
-            detail={"error": "gemini_error", "message": str(e)}
-        )
+    system_instruction = _build_main_chat_system_instruction(
+        location_hint=location_hint,
+        preferences=preferences,
+        candidate_businesses=recommended_places,
+    )
+    return _ChatTurn(message, system_instruction, recommended_places=recommended_places, main_chat=True)
 
 
 def _build_chat_system_instruction(
@@ -769,27 +989,18 @@ def _build_chat_system_instruction(
 ) -> str:
     """
     Build the full system instruction for the chat model.
-    Gemini takes a single system_instruction string; we compose it from:
+    Gemini takes a single system_instruction string; _CHAT_PROMPT_TEMPLATE composes it from:
     1. System: main role + behavior (CHAT_SYSTEM_PROMPT)
     2. System: business context (JSON blob when present)
     3. System: user preferences (JSON blob when present)
     """
-    parts: list[str] = []
-
-    # System: main role + behavior
-    parts.append(CHAT_SYSTEM_PROMPT)
-
-    # System: business context
-    if business_context_payload:
-        parts.append("")
-        parts.append(_business_context_json_section(business_context_payload))
-
-    # System: user preferences
-    if preferences and isinstance(preferences, dict):
-        parts.append("")
-        parts.append(_user_preferences_json_section(preferences))
-
-    return "\n\n".join(parts).strip()
+    return _memoized_instruction(
+        ("business", business_context_payload, preferences),
+        lambda: _CHAT_PROMPT_TEMPLATE.substitute(
+            business=_optional_section(_business_context_json_section(business_context_payload or {})),
+            preferences=_optional_section(_user_preferences_json_section(preferences)),
+        ),
+    )
 
 
 def _build_user_content_with_history(chat_history: list[tuple[str, str]], message: str) -> str:
@@ -802,47 +1013,44 @@ def _build_user_content_with_history(chat_history: list[tuple[str, str]], messag
     return "\n\n".join(parts)
 
 
-def _handle_general_query(
+def _business_chat_turn(
     message: str,
     preferences: Dict[str, Any] | None = None,
     business_context_payload: Dict[str, Any] | None = None,
     chat_history: list[tuple[str, str]] | None = None,
-    db: Session | None = None,
-    current_user: User | None = None,
-    business_id: UUID | None = None,
     ai_context_for_response: dict | None = None,
-) -> ChatResponse:
-    """Handle non-hours queries using Gemini with chat system prompt, BusinessContext (JSON), UserPreferences (JSON), and optional chat history."""
-    try:
-        system_instruction = _build_chat_system_instruction(
-            business_context_payload=business_context_payload,
-            preferences=preferences,
-        )
-        user_content = (
-            _build_user_content_with_history(chat_history or [], message)
-            if (chat_history or []) or message
-            else message
-        )
-        reply = generate_text_with_system(user_content, system_instruction)
+) -> _ChatTurn:
+    """Business chat: chat system prompt with BusinessContext (JSON), UserPreferences (JSON), and optional chat history."""
+    system_instruction = _build_chat_system_instruction(
+        business_context_payload=business_context_payload,
+        preferences=preferences,
+    )
+    user_content = (
+        _build_user_content_with_history(chat_history or [], message)
+        if (chat_history or []) or message
+        else message
+    )
+    return _ChatTurn(user_content, system_instruction, ai_context=ai_context_for_response)
 
-        if reply is None:
-            raise HTTPException(
-                status_code=503,
-                detail={"error": "gemini_unavailable", "message": "AI is temporarily unavailable; please try again later."},
-            )
 
-        return ChatResponse(reply=reply, ai_context=ai_context_for_response)
-    except HTTPException:
-        raise
-    except ValueError as e:
+def _gemini_unavailable() -> HTTPException:
+    """503 for a Gemini call that returned nothing (quota cooldown, timeout, expired deadline)."""
+    return HTTPException(
+        status_code=503,
+        detail={"error": "gemini_unavailable", "message": "AI is temporarily unavailable; please try again later."},
+    )
+
+
+def _gemini_http_error(e: Exception) -> HTTPException:
+    """Log a failed Gemini call and map it to a 500 (ValueError: missing configuration)."""
+    if isinstance(e, ValueError):
         logger.error(f"Gemini config error: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail={"error": str(e)}
-        )
-    except Exception as e:
-        logger.error(f"Gemini API error: {e}\n{traceback.format_exc()}")
-        raise HTTPException(
-            status_code=500,
-            detail={"error": "gemini_error", "message": str(e)}
-        )
+        return HTTPException(status_code=500, detail={"error": str(e)})
+    logger.error(f"Gemini API error: {e}\n{traceback.format_exc()}")
+    return HTTPException(status_code=500, detail={"error": "gemini_error", "message": str(e)})
+
+
+def _sse_event(payload: Dict[str, Any], event: str | None = None) -> str:
+    """Format one Server-Sent Event with a JSON data line."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(payload)}\n\n"
@@ -16,6 +16,7 @@ from app.schemas.business import (
     BusinessAiNotesUpdate,
     BusinessAIInsightsResponse,
 )
+from app.services.business_cache import invalidate_business
 
 router = APIRouter(prefix="/businesses", tags=["businesses"])
 
@@ -50,7 +51,7 @@ def get_business(business_id: UUID, db: Session = Depends(get_db)):
     ai_notes are AI-generated summaries intended for injection into the AI chat context
     (e.g. top-mentioned items, halal/vegetarian notes, atmosphere).
     """
-    business = db.query(Business).filter(Business.id == business_id).first()
+    business = db.get(Business, business_id)
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     return business
@@ -66,7 +67,7 @@ def get_business_ai_insights(
     Get AI insights status and data for a business. Lightweight; frontend polls
     after GET /places/details returns ai_status="pending" to know when AI is ready.
     """
-    business = db.query(Business).filter(Business.id == business_id).first()
+    business = db.get(Business, business_id)
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
 
@@ -111,11 +112,12 @@ def update_business_ai_notes(
     special notes about halal, atmosphere, etc.). Used by the app or internal admin tools.
     Returns the full updated business row including id and ai_notes.
     """
-    business = db.query(Business).filter(Business.id == business_id).first()
+    business = db.get(Business, business_id)
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     business.ai_notes = body.ai_notes
     db.commit()
+    invalidate_business(business.id)
     db.refresh(business)
     return business
 
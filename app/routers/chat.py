@@ -4,7 +4,8 @@ Uses GEMINI_API_KEY2 only. Context is built from the authenticated user's
 onboarding preferences, the business (including ai_context and ai_notes),
 and conversation history from the request body (messages). Stateless: no
 server-side chat storage. On 429/quota, returns 503 with a friendly
-model_overloaded message.
+model_overloaded message. POST /chat/business/{id}/stream sends the same
+reply as Server-Sent Events while Gemini generates it.
 """
 
 import json
@@ -14,17 +15,24 @@ from datetime import datetime, timezone
 from typing import Any, Dict, Literal
 from uuid import UUID
 
+import anyio.to_thread
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user
 from app.core.config import settings
+from app.core.deadline import request_deadline
 from app.db.session import get_db
 from app.models.business import Business
 from app.models.user import User
-from app.routers.ai import _build_user_content_with_history
-from app.services.gemini_client import generate_business_chat_with_search
+from app.routers.ai import _build_user_content_with_history, _sse_event
+from app.services.business_cache import BusinessSnapshot, load_business
+from app.services.gemini_client import (
+    generate_business_chat_with_search,
+    stream_business_chat_with_search_async,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -55,7 +63,7 @@ Google Search (web search):
 
 
 def build_business_chat_context(
-    business: Business,
+    business: Business | BusinessSnapshot,
     distance_miles: float | None,
     user_preferences: dict,
 ) -> dict:
@@ -63,17 +71,14 @@ def build_business_chat_context(
     Build a single structured context dict for the business chat model.
     Contains business (identity, address, ai_context fields, ai_notes, distance) and user_profile.
     """
-    addr_full = getattr(business, "address", None) or business.address_full
-    addr_state = getattr(business, "state", None)
+    addr_full = business.full_address
+    addr_state = business.state
     address = None
     if addr_full or addr_state:
         address = {k: v for k, v in ({"full": addr_full, "state": addr_state}.items()) if v is not None}
-    elif business.address_full:
-        address = {"full": business.address_full}
 
-    lat_val = business.latitude if getattr(business, "latitude", None) is not None else business.lat
-    lng_val = business.longitude if getattr(business, "longitude", None) is not None else business.lng
-    coordinates = {"lat": lat_val, "lng": lng_val} if (lat_val is not None and lng_val is not None) else None
+    coords = business.coordinates
+    coordinates = {"lat": coords[0], "lng": coords[1]} if coords is not None else None
 
     ai_context = getattr(business, "ai_context", None) or {}
     if not isinstance(ai_context, dict):
@@ -142,30 +147,18 @@ class ChatBusinessResponse(BaseModel):
     metadata: ChatBusinessMetadata
 
 
-@router.post("/business/{business_id}", response_model=ChatBusinessResponse)
-def chat_business(
+def _build_business_chat_prompt(
     business_id: UUID,
     request: ChatBusinessRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> ChatBusinessResponse:
-    """
-    Conversational chat for a specific business.
-
-    Conversation history is taken from the request body (messages). Stateless:
-    no server-side chat storage. Uses the authenticated user's onboarding
-    preferences and the business (name, category, address, ai_context,
-    ai_notes). Responses are generated with GEMINI_API_KEY2. On quota/overload
-    (429), returns 503 with error "model_overloaded" and a friendly message.
-
-    Context (business + user_profile) is passed in the user content as JSON;
-    distance_miles when provided is included in context.business.
-    """
+    current_user: User,
+    db: Session,
+) -> tuple[str, str]:
+    """Validate the request, load the business and return (system_instruction, user_content)."""
     message = request.user_message.strip()
     if not message:
         raise HTTPException(status_code=400, detail="user_message must be non-empty")
 
-    business = db.query(Business).filter(Business.id == business_id).first()
+    business = load_business(db, business_id)
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
 
@@ -195,6 +188,29 @@ def chat_business(
         len(message),
         len(request.messages or []),
     )
+    return system_instruction, user_content
+
+
+@router.post("/business/{business_id}", response_model=ChatBusinessResponse)
+def chat_business(
+    business_id: UUID,
+    request: ChatBusinessRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> ChatBusinessResponse:
+    """
+    Conversational chat for a specific business.
+
+    Conversation history is taken from the request body (messages). Stateless:
+    no server-side chat storage. Uses the authenticated user's onboarding
+    preferences and the business (name, category, address, ai_context,
+    ai_notes). Responses are generated with GEMINI_API_KEY2. On quota/overload
+    (429), returns 503 with error "model_overloaded" and a friendly message.
+
+    Context (business + user_profile) is passed in the user content as JSON;
+    distance_miles when provided is included in context.business.
+    """
+    system_instruction, user_content = _build_business_chat_prompt(business_id, request, current_user, db)
 
     try:
         result = generate_business_chat_with_search(
@@ -234,3 +250,86 @@ def chat_business(
             business_id=business_id,
         ),
     )
+
+
+@router.post("/business/{business_id}/stream")
+async def chat_business_stream(
+    business_id: UUID,
+    request: ChatBusinessRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    deadline: float = Depends(request_deadline),
+) -> StreamingResponse:
+    """
+    Streaming variant of POST /chat/business/{business_id} (Server-Sent Events).
+
+    Each text chunk is sent as `data: {"delta": ...}` as soon as Gemini produces it, and
+    the stream ends with `event: done` carrying the same metadata as the JSON endpoint.
+    Failures before the first chunk get the same status codes as the JSON endpoint
+    (503 model_overloaded on quota/overload); a failure mid-stream is sent as `event: error`.
+    """
+    # The business lookup uses the sync session: run it in a worker thread so the event loop keeps serving
+    system_instruction, user_content = await anyio.to_thread.run_sync(
+        _build_business_chat_prompt, business_id, request, current_user, db
+    )
+    chunks = stream_business_chat_with_search_async(
+        system_instruction,
+        [{"role": "user", "content": user_content}],
+        deadline=deadline,
+    )
+
+    # Wait for the first chunk before committing to a 200 so early failures keep their status code
+    try:
+        first = await anext(chunks, None)
+    except ValueError as e:
+        logger.error("Chat Gemini config error: %s", e)
+        raise HTTPException(status_code=500, detail={"error": str(e)})
+    except Exception as e:
+        logger.error(
+            "Chat Gemini API error: %s\nTraceback:\n%s",
+            e,
+            traceback.format_exc(),
+        )
+        raise HTTPException(
+            status_code=500,
+            detail={"error": "gemini_error", "message": "Something went wrong. Please try again."},
+        )
+
+    if first is None:
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": "model_overloaded",
+                "message": "AI is temporarily busy. Please try again in a bit.",
+            },
+        )
+
+    async def events():
+        try:
+            yield _sse_event({"delta": first})
+            async for text in chunks:
+                yield _sse_event({"delta": text})
+        except Exception as e:
+            logger.error("Chat Gemini stream error: %s\n%s", e, traceback.format_exc())
+            yield _sse_event(
+                {"error": "gemini_error", "message": "Something went wrong. Please try again."},
+                event="error",
+            )
+            return
+        finally:
+            await chunks.aclose()
+        metadata = ChatBusinessMetadata(
+            model=settings.gemini_model,
+            created_at=datetime.now(timezone.utc),
+            business_id=business_id,
+        )
+        yield _sse_event(
+            {"chat_session_id": str(business_id), "metadata": metadata.model_dump(mode="json")},
+            event="done",
+        )
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
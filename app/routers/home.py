@@ -1,11 +1,12 @@
 """Home feed endpoint: nearby sections + AI-tag sections."""
 
+import asyncio
 import logging
-import math
 from fastapi import APIRouter, BackgroundTasks, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user, require_onboarding
+from app.core.geo import haversine_distances_m
 from app.db.session import get_db
 from app.models.business import Business
 from app.models.user import User
@@ -42,6 +43,9 @@ NEARBY_SECTION_SPECS = [
     ("parks_nearby", "Parks & Outdoors", "Parks and outdoor spots nearby", "park", 2500),
 ]
 
+# Max nearby-section Google calls in flight at once per feed request
+NEARBY_FETCH_CONCURRENCY = 5
+
 # AI-tag section config: (section_id, title, subtitle, tag value in ai_tags)
 TAG_SECTION_SPECS = [
     ("date_night", "Best for Date Night", "AI-picked date night spots", "date-night"),
@@ -54,18 +58,6 @@ TAG_SECTION_SPECS = [
 ]
 
 
-def _haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-    """Distance between two points in meters."""
-    R = 6371000
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlam = math.radians(lng2 - lng1)
-    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlam / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
-
-
 def _business_to_place_result(business: Business) -> PlaceResult:
     """Convert a DB Business to PlaceResult (same shape as /places/nearby) for iOS. Uses persisted photo when available."""
     lat = business.lat if business.lat is not None else business.latitude
@@ -75,7 +67,8 @@ def _business_to_place_result(business: Business) -> PlaceResult:
         photo_url = business.photo_url
     elif business.photo_reference:
         photo_url = _build_photo_url(business.photo_reference)
-    return PlaceResult(
+    # Trusted DB row with typed columns: skip per-field validation
+    return PlaceResult.model_construct(
         provider=business.provider or "google",
         provider_place_id=business.provider_place_id or "",
         name=business.name or "",
@@ -105,6 +98,8 @@ def _businesses_for_tag(
         .all()
     )
     matching: list[tuple[Business, float | None]] = []
+    located: list[Business] = []
+    points: list[tuple[float, float]] = []
     for b in all_with_tags:
         tags = b.ai_tags
         if not isinstance(tags, list):
@@ -116,7 +111,10 @@ def _businesses_for_tag(
         if blat is None or blng is None:
             matching.append((b, None))
             continue
-        dist = _haversine_m(lat, lng, blat, blng)
+        located.append(b)
+        points.append((blat, blng))
+    # Distances for all candidates in one batch (origin trig computed once)
+    for b, dist in zip(located, haversine_distances_m(lat, lng, points)):
         if dist <= radius_m:
             matching.append((b, dist))
     # Order by ai_context_last_updated desc (fresh first), then by distance asc
@@ -152,25 +150,40 @@ async def get_home_feed(
     sections: list[HomeFeedSection] = []
     all_nearby_results: list[PlaceResult] = []
 
-    # Nearby sections (per-spec radius; use request radius as fallback only for backward compat)
-    for section_id, title, subtitle, place_type, radius_m in NEARBY_SECTION_SPECS:
+    # Nearby sections (per-spec radius; use request radius as fallback only for backward compat).
+    # Each is one Google round trip, so they run concurrently (at most NEARBY_FETCH_CONCURRENCY
+    # at once); gather keeps the spec order.
+    limiter = asyncio.Semaphore(NEARBY_FETCH_CONCURRENCY)
+
+    async def fetch_section(section_id: str, place_type: str, radius_m: int) -> list[PlaceResult]:
+        effective_radius = radius if radius is not None else radius_m
         try:
-            effective_radius = radius if radius is not None else radius_m
-            results, _ = await _fetch_nearby_places_async(
-                lat, lng, effective_radius, place_type
-            )
-            if results:
-                all_nearby_results.extend(results)
-                sections.append(
-                    HomeFeedSection(
-                        id=section_id,
-                        title=title,
-                        subtitle=subtitle,
-                        businesses=results,
-                    )
+            async with limiter:
+                results, _ = await _fetch_nearby_places_async(
+                    lat, lng, effective_radius, place_type
                 )
+            return results
         except Exception as e:
             logger.warning("Home feed section %s failed: %s", section_id, e, exc_info=True)
+            return []
+
+    nearby_results = await asyncio.gather(
+        *(
+            fetch_section(section_id, place_type, radius_m)
+            for section_id, _, _, place_type, radius_m in NEARBY_SECTION_SPECS
+        )
+    )
+    for (section_id, title, subtitle, _, _), results in zip(NEARBY_SECTION_SPECS, nearby_results):
+        if results:
+            all_nearby_results.extend(results)
+            sections.append(
+                HomeFeedSection(
+                    id=section_id,
+                    title=title,
+                    subtitle=subtitle,
+                    businesses=results,
+                )
+            )
 
     # AI-tag sections (only include if we have at least one business)
     for section_id, title, subtitle, tag in TAG_SECTION_SPECS:
@@ -7,6 +7,7 @@ from app.db.session import get_db
 from app.core.auth import get_current_user
 from app.models.user import User
 from app.models.scan_session import ScanSession
+from app.services.user_prefs_cache import invalidate_user_prefs
 from app.schemas.user import (
     MeRead,
     OnboardingPreferences,
@@ -30,7 +31,8 @@ def get_me(
     User is resolved by auth (get_current_user); this route only reads,
     never creates users.
     """
-    return MeRead.model_validate(current_user)
+    # response_model=MeRead validates the ORM row once; no explicit model_validate here
+    return current_user
 
 
 @router.put("/preferences", response_model=MeRead)
@@ -100,23 +102,14 @@ def update_preferences(
     
     # Handle onboarding_completed_at (partial update support)
     if preferences.onboarding_completed_at is not None:
-        try:
-            # Parse ISO datetime string into timezone-aware datetime
-            parsed_dt = datetime.fromisoformat(preferences.onboarding_completed_at.replace('Z', '+00:00'))
-            # Ensure it's timezone-aware (if not, assume UTC)
-            if parsed_dt.tzinfo is None:
-                parsed_dt = parsed_dt.replace(tzinfo=timezone.utc)
-            # Convert to UTC if needed
-            completed_at = parsed_dt.astimezone(timezone.utc)
-            current_user.onboarding_completed_at = completed_at
-            has_changes = True
-            logger.info(f"Updating onboarding_completed_at to: {completed_at.isoformat()}")
-        except (ValueError, TypeError, AttributeError) as e:
-            logger.error(f"Invalid datetime format for onboarding_completed_at: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid datetime format for onboarding_completed_at. Expected ISO 8601 format (e.g., '2024-01-15T10:30:00Z'): {str(e)}"
-            )
+        # Already parsed by the schema; treat naive values as UTC and normalize to UTC
+        completed_at = preferences.onboarding_completed_at
+        if completed_at.tzinfo is None:
+            completed_at = completed_at.replace(tzinfo=timezone.utc)
+        completed_at = completed_at.astimezone(timezone.utc)
+        current_user.onboarding_completed_at = completed_at
+        has_changes = True
+        logger.info(f"Updating onboarding_completed_at to: {completed_at.isoformat()}")
     elif preferences.onboarding_preferences is not None:
         # If onboarding_completed_at omitted but onboarding_preferences provided, set to now
         current_user.onboarding_completed_at = now
@@ -129,6 +122,7 @@ def update_preferences(
         
         # Commit the update
         db.commit()
+        invalidate_user_prefs(current_user.external_auth_uid)
         
         # Log the update summary
         logger.info(
@@ -211,7 +205,7 @@ def get_onboarding(
     return OnboardingRead(
         answers=current_user.onboarding_preferences,
         completed=current_user.onboarding_completed_at is not None,
-        completed_at=current_user.onboarding_completed_at.isoformat() if current_user.onboarding_completed_at else None
+        completed_at=current_user.onboarding_completed_at,
     )
 
 
@@ -237,9 +231,10 @@ def update_onboarding(
 
     db.add(current_user)
     db.commit()
+    invalidate_user_prefs(current_user.external_auth_uid)
     db.refresh(current_user)
 
     logger.info(f"Onboarding saved for user id={current_user.id}")
 
-    return MeRead.model_validate(current_user)
+    return current_user
 
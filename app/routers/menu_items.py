@@ -18,7 +18,7 @@ def create_menu_item(
 ):
     """Create a menu item under a business."""
     # Verify business exists
-    business = db.query(Business).filter(Business.id == business_id).first()
+    business = db.get(Business, business_id)
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     
@@ -37,7 +37,7 @@ def create_menu_item(
 def list_menu_items(business_id: UUID, db: Session = Depends(get_db)):
     """List menu items for a business."""
     # Verify business exists
-    business = db.query(Business).filter(Business.id == business_id).first()
+    business = db.get(Business, business_id)
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     
@@ -48,7 +48,7 @@ def list_menu_items(business_id: UUID, db: Session = Depends(get_db)):
 @router.get("/menu-items/{menu_item_id}", response_model=MenuItemRead)
 def get_menu_item(menu_item_id: UUID, db: Session = Depends(get_db)):
     """Get menu item by ID."""
-    menu_item = db.query(MenuItem).filter(MenuItem.id == menu_item_id).first()
+    menu_item = db.get(MenuItem, menu_item_id)
     if not menu_item:
         raise HTTPException(status_code=404, detail="Menu item not found")
     return menu_item
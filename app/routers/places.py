@@ -1,28 +1,41 @@
 """Google Places API proxy endpoints."""
 
+import functools
 import logging
 import re
 import traceback
 from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
-from fastapi.responses import JSONResponse
+import anyio
+import anyio.to_thread
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
 import httpx
+import orjson
+from urllib.parse import urlencode
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.auth import get_current_user, require_onboarding
+from app.core.geo import haversine_distances_m
 from app.db.session import get_db
 from app.models.user import User
 from app.models.business import Business
 from app.db.session import SessionLocal
 from app.services.business_ai_insights import generate_and_save_business_ai_insights
-import math
+from app.services.business_cache import invalidate_business
+from app.services.places_client import get_http_client
 
 # Max businesses to prewarm per request (cap to avoid runaway background jobs)
 PREWARM_CAP = 15
+# Max prewarm jobs in flight at once per request (each holds a worker thread and a DB connection)
+PREWARM_CONCURRENCY = 5
 
+from app.schemas.ai_context import BusinessAIContext
 from app.schemas.places import (
+    PLACE_RESULT_LIST,
+    PLACE_SEARCH_RESULT_LIST,
     NearbySearchResponse,
     PlaceResult,
     PlaceDetailsResponse,
@@ -40,10 +53,39 @@ router = APIRouter(prefix="/places", tags=["places"])
 GOOGLE_PLACES_BASE = "https://maps.googleapis.com/maps/api/place"
 REQUEST_TIMEOUT = 10.0  # seconds
 
+_API_KEY_RE = re.compile(r'key=[^&]+')
+
+# Field mask for Place Details: only what the normalizers, upsert and AI insights read.
+# (Legacy Nearby/Text Search take no field mask; they always return the basic set.)
+_DETAILS_FIELDS = ",".join((
+    "place_id",
+    "name",
+    "types",
+    "rating",
+    "user_ratings_total",
+    "formatted_address",
+    "formatted_phone_number",
+    "website",
+    "opening_hours",
+    "photos",
+    "geometry",
+    "address_components",
+    "reviews",
+    "price_level",
+))
+
+# Place types too broad to use as a category
+_GENERIC_TYPES: frozenset[str] = frozenset({"point_of_interest", "establishment"})
+
 
 def _redact_api_key(url: str) -> str:
     """Remove API key from URL for safe logging."""
-    return re.sub(r'key=[^&]+', 'key=REDACTED', str(url))
+    return _API_KEY_RE.sub('key=REDACTED', str(url))
+
+
+def _safe_url(url: str, params: dict) -> str:
+    """Full request URL with the API key redacted; built only when it is logged."""
+    return _redact_api_key(f"{url}?{urlencode(params)}")
 
 
 def _get_api_key() -> str:
@@ -57,17 +99,21 @@ def _get_api_key() -> str:
     return settings.google_maps_api_key
 
 
+@functools.lru_cache(maxsize=4)
+def _photo_prefix(max_width: int = 1200) -> str:
+    """
+    Build the photo URL up to (and including) the photo_reference parameter.
+    Cached per max_width so the API key is read from settings once, not per photo.
+    """
+    query = urlencode({"maxwidth": max_width, "key": settings.google_maps_api_key or ""})
+    return "".join((GOOGLE_PLACES_BASE, "/photo?", query, "&photo_reference="))
+
+
 def _build_photo_url(photo_reference: str | None, max_width: int = 1200) -> str | None:
     """Build Google Places photo URL from photo reference."""
     if not photo_reference:
         return None
-    api_key = settings.google_maps_api_key
-    return (
-        f"{GOOGLE_PLACES_BASE}/photo"
-        f"?maxwidth={max_width}"
-        f"&photo_reference={photo_reference}"
-        f"&key={api_key}"
-    )
+    return _photo_prefix(max_width) + photo_reference
 
 
 def _extract_state_from_address_components(place: dict) -> str | None:
@@ -92,50 +138,37 @@ def _extract_primary_type(place: dict) -> str | None:
     if primary_type := place.get("primary_type"):
         return primary_type
     # Fall back to first type that's not generic
-    types = place.get("types", [])
-    generic_types = {"point_of_interest", "establishment"}
-    for t in types:
-        if t not in generic_types:
-            return t
-    return types[0] if types else None
-
-
-def _haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> int:
-    """Calculate distance between two points in meters using Haversine formula."""
-    R = 6371000  # Earth's radius in meters
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    delta_phi = math.radians(lat2 - lat1)
-    delta_lambda = math.radians(lng2 - lng1)
-    
-    a = math.sin(delta_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    
-    return int(R * c)
+    if types := place.get("types"):
+        for t in types:
+            if t not in _GENERIC_TYPES:
+                return t
+        return types[0]
+    return None
 
 
-def _normalize_search_place(
-    place: dict,
-    origin_lat: float | None = None,
-    origin_lng: float | None = None
-) -> PlaceSearchResult:
-    """Normalize a Google text search result to our schema."""
+def _place_lat_lng(place: dict) -> tuple[float, float]:
+    """(lat, lng) of a Google Places result, 0.0 where missing."""
     location = place.get("geometry", {}).get("location", {})
+    return location.get("lat", 0.0), location.get("lng", 0.0)
+
+
+def _normalize_search_place(place: dict, distance_m: int | None = None) -> PlaceSearchResult:
+    """
+    Normalize a Google text search result to our schema.
+
+    The _normalize_* helpers build models with model_construct (no validation):
+    their input is a Google Places response and every field is coerced here.
+    The search endpoints validate the final payload once (_validated_results).
+    """
     photos = place.get("photos", [])
     photo_ref = photos[0].get("photo_reference") if photos else None
     
-    place_lat = location.get("lat", 0.0)
-    place_lng = location.get("lng", 0.0)
-    
-    # Calculate distance if origin provided
-    distance_m = None
-    if origin_lat is not None and origin_lng is not None:
-        distance_m = _haversine_distance(origin_lat, origin_lng, place_lat, place_lng)
+    place_lat, place_lng = _place_lat_lng(place)
     
     # Text search uses formatted_address instead of vicinity
     address = place.get("formatted_address") or place.get("vicinity")
     
-    return PlaceSearchResult(
+    return PlaceSearchResult.model_construct(
         provider="google",
         provider_place_id=place.get("place_id", ""),
         name=place.get("name", ""),
@@ -152,13 +185,25 @@ def _normalize_search_place(
     )
 
 
+def _validated_results(adapter: TypeAdapter, results: list) -> list[dict]:
+    """
+    Dump model_construct'ed results for ORJSONResponse, validating the payload once.
+
+    Stands in for the response_model check these endpoints bypass: a malformed result
+    raises ValidationError (500) instead of going out on the wire.
+    """
+    payload = adapter.dump_python(results)
+    adapter.validate_python(payload)
+    return payload
+
+
 def _normalize_nearby_place(place: dict) -> PlaceResult:
     """Normalize a Google place result to our schema."""
     location = place.get("geometry", {}).get("location", {})
     photos = place.get("photos", [])
     photo_ref = photos[0].get("photo_reference") if photos else None
     
-    return PlaceResult(
+    return PlaceResult.model_construct(
         provider="google",
         provider_place_id=place.get("place_id", ""),
         name=place.get("name", ""),
@@ -178,18 +223,22 @@ def _normalize_opening_hours(hours_data: dict | None) -> OpeningHours | None:
     if not hours_data:
         return None
     
+    # Periods are validated (day 0-6, "HHMM" times); malformed ones from Google are dropped here
     periods = []
     for p in hours_data.get("periods", []):
         open_info = p.get("open", {})
         close_info = p.get("close", {})
-        periods.append(OpeningHoursPeriod(
-            open_day=open_info.get("day", 0),
-            open_time=open_info.get("time", "0000"),
-            close_day=close_info.get("day") if close_info else None,
-            close_time=close_info.get("time") if close_info else None,
-        ))
+        try:
+            periods.append(OpeningHoursPeriod.model_validate({
+                "open_day": open_info.get("day", 0),
+                "open_time": open_info.get("time", "0000"),
+                "close_day": close_info.get("day") if close_info else None,
+                "close_time": close_info.get("time") if close_info else None,
+            }))
+        except ValidationError as e:
+            logger.warning("Dropping malformed opening-hours period %r: %s", p, e.errors(include_url=False))
     
-    return OpeningHours(
+    return OpeningHours.model_construct(
         open_now=hours_data.get("open_now"),
         weekday_text=hours_data.get("weekday_text", []),
         periods=periods,
@@ -200,26 +249,24 @@ def _normalize_place_details(
     place: dict,
     ai_notes: str | None = None,
     business_id: Business | None = None,
-    ai_context: dict | None = None,
+    ai_context: BusinessAIContext | None = None,
 ) -> PlaceDetails:
     """Normalize Google place details to our schema. Optionally attach cached ai_notes, business_id, ai_context."""
     location = place.get("geometry", {}).get("location", {})
     photos = place.get("photos", [])
     
-    # Extract up to 10 photo URLs for carousel support
+    # Extract up to 10 photo URLs for carousel support (prefix computed once per response)
+    prefix = _photo_prefix(max_width=1200)
     photo_urls = [
-        url for url in (
-            _build_photo_url(p.get("photo_reference"))
-            for p in photos[:10]  # Limit to 10 photos for carousel
-            if p.get("photo_reference")
-        )
-        if url is not None
+        prefix + p["photo_reference"]
+        for p in photos[:10]  # Limit to 10 photos for carousel
+        if p.get("photo_reference")
     ]
     
     # Set single photo_url for backwards compatibility
     photo_url = photo_urls[0] if photo_urls else None
     
-    return PlaceDetails(
+    return PlaceDetails.model_construct(
         provider="google",
         provider_place_id=place.get("place_id", ""),
         name=place.get("name", ""),
@@ -252,29 +299,14 @@ def _fetch_place_details_sync(place_id: str) -> dict | None:
         url = f"{GOOGLE_PLACES_BASE}/details/json"
         params = {
             "place_id": place_id,
-            "fields": ",".join([
-                "place_id",
-                "name",
-                "types",
-                "rating",
-                "user_ratings_total",
-                "formatted_address",
-                "formatted_phone_number",
-                "website",
-                "opening_hours",
-                "photos",
-                "geometry",
-                "address_components",
-                "reviews",
-                "price_level",
-            ]),
+            "fields": _DETAILS_FIELDS,
             "key": api_key,
         }
         with httpx.Client(timeout=REQUEST_TIMEOUT) as client:
             response = client.get(url, params=params)
         if response.status_code != 200:
             return None
-        data = response.json()
+        data = orjson.loads(response.content)
         if data.get("status") != "OK" or not data.get("result"):
             return None
         return data
@@ -290,43 +322,41 @@ async def _call_google_api(url: str, params: dict) -> dict:
     Returns parsed JSON on success.
     Raises HTTPException with detailed error info on failure.
     """
-    # Build the full URL for logging (will redact key)
-    full_url = httpx.URL(url, params=params)
-    safe_url = _redact_api_key(str(full_url))
-    
-    logger.info(f"Calling Google Places API: {safe_url}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Calling Google Places API: %s", _safe_url(url, params))
     
     try:
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-            response = await client.get(url, params=params)
-            response_text = response.text
-            truncated_body = response_text[:500] if response_text else "(empty)"
-            
-            logger.info(
-                f"Google API response: status={response.status_code}, "
-                f"body_preview={truncated_body}"
+        response = await get_http_client().get(url, params=params)
+
+        # Only decode the body for the preview when it will actually be logged
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Google API response: status=%s, body_preview=%s",
+                response.status_code,
+                response.text[:500] or "(empty)",
             )
-            
-            # Check HTTP status first
-            if response.status_code != 200:
-                logger.error(
-                    f"Google API HTTP error: url={safe_url}, "
-                    f"status={response.status_code}, body={truncated_body}"
-                )
-                raise HTTPException(
-                    status_code=502,
-                    detail={
-                        "error": "google_error",
-                        "status": response.status_code,
-                        "body": truncated_body
-                    }
-                )
-            
-            return response.json()
-            
+        
+        # Check HTTP status first
+        if response.status_code != 200:
+            truncated_body = response.text[:500] or "(empty)"
+            logger.error(
+                f"Google API HTTP error: url={_safe_url(url, params)}, "
+                f"status={response.status_code}, body={truncated_body}"
+            )
+            raise HTTPException(
+                status_code=502,
+                detail={
+                    "error": "google_error",
+                    "status": response.status_code,
+                    "body": truncated_body
+                }
+            )
+        
+        return orjson.loads(response.content)
+        
     except httpx.TimeoutException as e:
         logger.error(
-            f"Google API timeout: url={safe_url}\n"
+            f"Google API timeout: url={_safe_url(url, params)}\n"
             f"Traceback:\n{traceback.format_exc()}"
         )
         raise HTTPException(
@@ -338,7 +368,7 @@ async def _call_google_api(url: str, params: dict) -> dict:
         )
     except httpx.RequestError as e:
         logger.error(
-            f"Google API request error: url={safe_url}, error={str(e)}\n"
+            f"Google API request error: url={_safe_url(url, params)}, error={str(e)}\n"
             f"Traceback:\n{traceback.format_exc()}"
         )
         raise HTTPException(
@@ -411,36 +441,56 @@ def prewarm_insights_for_places(
     background_tasks.add_task(_prewarm_ai_insights_for_place_ids, place_ids)
 
 
-def _prewarm_ai_insights_for_place_ids(place_ids: list[str]) -> None:
+def _prewarm_ai_insights_for_place_id(place_id: str) -> None:
     """
-    Best-effort background task: for each place_id fetch details, upsert business,
-    and run AI insights generation if missing/stale (same TTL as details). Failures are logged and skipped.
+    Fetch details for one place_id, upsert the business, and run AI insights generation
+    if missing/stale (same TTL as details). Failures are logged and skipped.
     """
-    for place_id in place_ids:
+    try:
+        data = _fetch_place_details_sync(place_id)
+        if not data or not data.get("result"):
+            return
+        result = data["result"]
+        db = SessionLocal()
         try:
-            data = _fetch_place_details_sync(place_id)
-            if not data or not data.get("result"):
-                continue
-            result = data["result"]
-            db = SessionLocal()
-            try:
-                business = _upsert_business_from_place(db, place_id, result)
-                now_utc = datetime.now(timezone.utc)
-                last_updated = business.ai_context_last_updated
-                if last_updated is not None and last_updated.tzinfo is None:
-                    last_updated = last_updated.replace(tzinfo=timezone.utc)
-                needs_ai = (
-                    not (business.ai_notes and business.ai_notes.strip())
-                    or business.ai_context is None
-                    or last_updated is None
-                    or (now_utc - last_updated) > timedelta(hours=AI_CONTEXT_TTL_HOURS)
+            business = _upsert_business_from_place(db, place_id, result)
+            now_utc = datetime.now(timezone.utc)
+            last_updated = business.ai_context_last_updated
+            if last_updated is not None and last_updated.tzinfo is None:
+                last_updated = last_updated.replace(tzinfo=timezone.utc)
+            needs_ai = (
+                not (business.ai_notes and business.ai_notes.strip())
+                or business.ai_context is None
+                or last_updated is None
+                or (now_utc - last_updated) > timedelta(hours=AI_CONTEXT_TTL_HOURS)
+            )
+            if needs_ai:
+                generate_and_save_business_ai_insights(business.id, result)
+        finally:
+            db.close()
+    except Exception as e:
+        logger.warning("Prewarm AI failed for place_id=%s: %s", place_id, e, exc_info=True)
+
+
+async def _prewarm_ai_insights_for_place_ids(place_ids: list[str]) -> None:
+    """
+    Best-effort background task: prewarm AI insights for each place_id.
+
+    Each place is blocked on Google and Gemini network I/O, so the per-place jobs run
+    concurrently in worker threads (at most PREWARM_CONCURRENCY at once) instead of
+    one after another.
+    """
+    limiter = anyio.CapacityLimiter(PREWARM_CONCURRENCY)
+    async with anyio.create_task_group() as tg:
+        for place_id in place_ids:
+            tg.start_soon(
+                functools.partial(
+                    anyio.to_thread.run_sync,
+                    _prewarm_ai_insights_for_place_id,
+                    place_id,
+                    limiter=limiter,
                 )
-                if needs_ai:
-                    generate_and_save_business_ai_insights(business.id, result)
-            finally:
-                db.close()
-        except Exception as e:
-            logger.warning("Prewarm AI failed for place_id=%s: %s", place_id, e, exc_info=True)
+            )
 
 
 @router.get("/nearby", response_model=NearbySearchResponse)
@@ -502,7 +552,8 @@ async def nearby_search(
     if background_tasks is not None and results:
         prewarm_insights_for_places(background_tasks, results)
 
-    return NearbySearchResponse(results=results)
+    # Validated once and serialized straight to orjson (response_model stays for the OpenAPI schema only)
+    return ORJSONResponse({"results": _validated_results(PLACE_RESULT_LIST, results)})
 
 
 def _upsert_business_from_place(db: Session, place_id: str, result: dict) -> Business:
@@ -545,6 +596,7 @@ def _upsert_business_from_place(db: Session, place_id: str, result: dict) -> Bus
         business.photo_reference = photo_ref
         business.photo_url = photo_url
         db.commit()
+        invalidate_business(business.id)
         db.refresh(business)
         return business
 
@@ -600,22 +652,7 @@ async def place_details(
     url = f"{GOOGLE_PLACES_BASE}/details/json"
     params = {
         "place_id": place_id,
-        "fields": ",".join([
-            "place_id",
-            "name",
-            "types",
-            "rating",
-            "user_ratings_total",
-            "formatted_address",
-            "formatted_phone_number",
-            "website",
-            "opening_hours",
-            "photos",
-            "geometry",
-            "address_components",
-            "reviews",
-            "price_level",
-        ]),
+        "fields": _DETAILS_FIELDS,
         "key": api_key,
     }
 
@@ -652,6 +689,15 @@ async def place_details(
     # Upsert business so we can cache ai_notes and ai_context
     business = _upsert_business_from_place(db, place_id, result)
 
+    # Typed once here; the same instance is embedded in result and at top level. A stored
+    # context that no longer validates is treated as missing, so the background job replaces it.
+    ai_context = None
+    if business.ai_context is not None:
+        try:
+            ai_context = BusinessAIContext.model_validate(business.ai_context)
+        except ValidationError as e:
+            logger.warning("Ignoring invalid stored ai_context for business %s: %s", business.id, e)
+
     now_utc = datetime.now(timezone.utc)
     last_updated = business.ai_context_last_updated
     if last_updated is not None and last_updated.tzinfo is None:
@@ -659,27 +705,20 @@ async def place_details(
     has_fresh_ai = (
         business.ai_notes
         and business.ai_notes.strip()
-        and business.ai_context is not None
+        and ai_context is not None
         and last_updated is not None
         and (now_utc - last_updated) <= timedelta(hours=AI_CONTEXT_TTL_HOURS)
     )
-
     if has_fresh_ai:
         ai_status = "ready"
         ai_notes = business.ai_notes
-        ai_context = business.ai_context
     else:
         ai_notes = business.ai_notes if (business.ai_notes and business.ai_notes.strip()) else None
-        ai_context = business.ai_context
         ai_status = "pending"
         if background_tasks is not None:
-            background_tasks.add_task(
-                generate_and_save_business_ai_insights,
-                business.id,
-                result,
-            )
+            background_tasks.add_task(generate_and_save_business_ai_insights, business.id, result)
 
-    return PlaceDetailsResponse(
+    response = PlaceDetailsResponse(
         result=_normalize_place_details(
             result,
             ai_notes=ai_notes,
@@ -690,6 +729,11 @@ async def place_details(
         ai_context=ai_context,
         ai_status=ai_status,
     )
+    # Serialize straight to JSON bytes in pydantic-core (no intermediate dict / re-validation)
+    return Response(
+        content=response.model_dump_json(),
+        media_type="application/json",
+    )
 
 
 @router.get("/search", response_model=TextSearchResponse)
@@ -755,13 +799,18 @@ async def text_search(
     
     # Normalize results (limit to requested count)
     raw_results = data.get("results", [])[:limit]
+    distances: list[int | None] = [None] * len(raw_results)
+    if lat is not None and lng is not None:
+        # Distances for all results in one batch (origin trig computed once)
+        distances = [int(d) for d in haversine_distances_m(lat, lng, map(_place_lat_lng, raw_results))]
     results = [
-        _normalize_search_place(place, origin_lat=lat, origin_lng=lng)
-        for place in raw_results
+        _normalize_search_place(place, distance_m)
+        for place, distance_m in zip(raw_results, distances)
     ]
     
     # Sort by distance if we have location
     if lat is not None and lng is not None:
         results.sort(key=lambda r: r.distance_m or float('inf'))
     
-    return TextSearchResponse(results=results)
+    # Same shape as TextSearchResponse; validated once instead of by response_model
+    return ORJSONResponse({"results": _validated_results(PLACE_SEARCH_RESULT_LIST, results)})
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 from uuid import UUID
 
-from app.db.session import get_db
+from app.db.session import get_db, row_exists
 from app.models.recommendation_item import RecommendationItem
 from app.models.scan_session import ScanSession
 from app.models.menu_item import MenuItem
@@ -15,22 +17,18 @@ from app.schemas.recommendation_item import (
 router = APIRouter(tags=["recommendations"])
 
 
-@router.post("/scan-sessions/{scan_session_id}/recommendations", response_model=list[RecommendationItemRead], status_code=201)
-def create_recommendation_items(
+def _create_recommendation_items_sync(
     scan_session_id: UUID,
     bulk_create: RecommendationItemBulkCreate,
-    db: Session = Depends(get_db)
-):
-    """Create recommendation items for a scan session (bulk)."""
+    db: Session,
+) -> list[RecommendationItemRead]:
     # Verify scan session exists
-    scan_session = db.query(ScanSession).filter(ScanSession.id == scan_session_id).first()
-    if not scan_session:
+    if not row_exists(db, ScanSession, scan_session_id):
         raise HTTPException(status_code=404, detail="Scan session not found")
     
     # Verify all menu items exist
     menu_item_ids = {item.menu_item_id for item in bulk_create.items}
-    existing_menu_items = db.query(MenuItem).filter(MenuItem.id.in_(menu_item_ids)).all()
-    existing_ids = {item.id for item in existing_menu_items}
+    existing_ids = set(db.scalars(select(MenuItem.id).where(MenuItem.id.in_(menu_item_ids))).all())
     missing_ids = menu_item_ids - existing_ids
     if missing_ids:
         raise HTTPException(
@@ -38,28 +36,35 @@ def create_recommendation_items(
             detail=f"Menu items not found: {missing_ids}"
         )
     
-    # Create recommendation items
-    db_items = []
-    for item_data in bulk_create.items:
-        item_dict = item_data.model_dump()
-        item_dict["scan_session_id"] = scan_session_id
-        db_item = RecommendationItem(**item_dict)
-        db.add(db_item)
-        db_items.append(db_item)
-    
+    if not bulk_create.items:
+        return []
+
+    # Create recommendation items in one INSERT ... RETURNING (no per-item refresh),
+    # returned in request order
+    rows = [
+        item.model_dump() | {"scan_session_id": scan_session_id}
+        for item in bulk_create.items
+    ]
+    db_items = db.scalars(
+        insert(RecommendationItem).returning(RecommendationItem, sort_by_parameter_order=True),
+        rows,
+    ).all()
+    # Snapshot while the RETURNING values are loaded (commit expires the instances).
+    # Rows come straight from the INSERT, so build the read models without re-validating.
+    created = [
+        RecommendationItemRead.model_construct(
+            **{name: getattr(db_item, name) for name in RecommendationItemRead.model_fields}
+        )
+        for db_item in db_items
+    ]
     db.commit()
-    for db_item in db_items:
-        db.refresh(db_item)
-    
-    return db_items
 
+    return created
 
-@router.get("/scan-sessions/{scan_session_id}/recommendations", response_model=list[RecommendationItemRead])
-def get_recommendation_items(scan_session_id: UUID, db: Session = Depends(get_db)):
-    """Get recommendation items for a scan session."""
+
+def _get_recommendation_items_sync(scan_session_id: UUID, db: Session) -> list[RecommendationItem]:
     # Verify scan session exists
-    scan_session = db.query(ScanSession).filter(ScanSession.id == scan_session_id).first()
-    if not scan_session:
+    if not row_exists(db, ScanSession, scan_session_id):
         raise HTTPException(status_code=404, detail="Scan session not found")
     
     recommendation_items = (
@@ -70,3 +75,19 @@ def get_recommendation_items(scan_session_id: UUID, db: Session = Depends(get_db
     )
     return recommendation_items
 
+
+@router.post("/scan-sessions/{scan_session_id}/recommendations", response_model=list[RecommendationItemRead], status_code=201)
+async def create_recommendation_items(
+    scan_session_id: UUID,
+    bulk_create: RecommendationItemBulkCreate,
+    db: Session = Depends(get_db)
+):
+    """Create recommendation items for a scan session (bulk)."""
+    return await run_in_threadpool(_create_recommendation_items_sync, scan_session_id, bulk_create, db)
+
+
+@router.get("/scan-sessions/{scan_session_id}/recommendations", response_model=list[RecommendationItemRead])
+async def get_recommendation_items(scan_session_id: UUID, db: Session = Depends(get_db)):
+    """Get recommendation items for a scan session."""
+    return await run_in_threadpool(_get_recommendation_items_sync, scan_session_id, db)
+
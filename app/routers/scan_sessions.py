@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from uuid import UUID
 
-from app.db.session import get_db
+from app.db.session import get_db, row_exists
 from app.models.scan_session import ScanSession
 from app.models.user import User
 from app.models.business import Business
@@ -11,9 +12,7 @@ from app.schemas.scan_session import ScanSessionCreate, ScanSessionRead
 router = APIRouter(prefix="/scan-sessions", tags=["scan-sessions"])
 
 
-@router.post("", response_model=ScanSessionRead, status_code=201)
-def create_scan_session(scan_session: ScanSessionCreate, db: Session = Depends(get_db)):
-    """Create a new scan session."""
+def _create_scan_session_sync(scan_session: ScanSessionCreate, db: Session) -> ScanSession:
     # Enforce: at least one of user_id or device_id must be set
     if not scan_session.user_id and not scan_session.device_id:
         raise HTTPException(
@@ -23,14 +22,12 @@ def create_scan_session(scan_session: ScanSessionCreate, db: Session = Depends(g
     
     # Verify user exists if provided
     if scan_session.user_id:
-        user = db.query(User).filter(User.id == scan_session.user_id).first()
-        if not user:
+        if not row_exists(db, User, scan_session.user_id):
             raise HTTPException(status_code=404, detail="User not found")
     
     # Verify business exists if provided
     if scan_session.business_id:
-        business = db.query(Business).filter(Business.id == scan_session.business_id).first()
-        if not business:
+        if not row_exists(db, Business, scan_session.business_id):
             raise HTTPException(status_code=404, detail="Business not found")
     
     db_scan_session = ScanSession(**scan_session.model_dump())
@@ -40,11 +37,21 @@ def create_scan_session(scan_session: ScanSessionCreate, db: Session = Depends(g
     return db_scan_session
 
 
-@router.get("/{scan_session_id}", response_model=ScanSessionRead)
-def get_scan_session(scan_session_id: UUID, db: Session = Depends(get_db)):
-    """Get scan session by ID."""
-    scan_session = db.query(ScanSession).filter(ScanSession.id == scan_session_id).first()
+def _get_scan_session_sync(scan_session_id: UUID, db: Session) -> ScanSession:
+    scan_session = db.get(ScanSession, scan_session_id)
     if not scan_session:
         raise HTTPException(status_code=404, detail="Scan session not found")
     return scan_session
 
+
+@router.post("", response_model=ScanSessionRead, status_code=201)
+async def create_scan_session(scan_session: ScanSessionCreate, db: Session = Depends(get_db)):
+    """Create a new scan session."""
+    return await run_in_threadpool(_create_scan_session_sync, scan_session, db)
+
+
+@router.get("/{scan_session_id}", response_model=ScanSessionRead)
+async def get_scan_session(scan_session_id: UUID, db: Session = Depends(get_db)):
+    """Get scan session by ID."""
+    return await run_in_threadpool(_get_scan_session_sync, scan_session_id, db)
+
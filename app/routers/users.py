@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from uuid import UUID
 
-from app.db.session import get_db
+from app.db.session import get_db, row_exists
 from app.models.user import User
 from app.models.scan_session import ScanSession
 from app.schemas.user import UserCreate, UserRead
@@ -11,16 +12,8 @@ from app.schemas.scan_session import ScanSessionRead
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-def _normalize_uid(uid: UUID | str) -> str:
-    if isinstance(uid, UUID):
-        return str(uid)
-    return str(UUID(str(uid)))
-
-
-@router.post("", response_model=UserRead, status_code=201)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
-    """Create a new user (programmatic only). Prefer auth flow for real users."""
-    uid_str = _normalize_uid(user.external_auth_uid)
+def _create_user_sync(user: UserCreate, db: Session) -> User:
+    uid_str = str(user.external_auth_uid)  # canonical form; parsed as UUID by the schema
     existing = db.query(User).filter(
         (User.external_auth_uid == uid_str)
         | (User.email == user.email)
@@ -37,23 +30,35 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     return db_user
 
 
-@router.get("/{user_id}", response_model=UserRead)
-def get_user(user_id: UUID, db: Session = Depends(get_db)):
-    """Get user by ID."""
-    user = db.query(User).filter(User.id == user_id).first()
+def _get_user_sync(user_id: UUID, db: Session) -> User:
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 
-@router.get("/{user_id}/scan-sessions", response_model=list[ScanSessionRead])
-def list_user_scan_sessions(user_id: UUID, db: Session = Depends(get_db)):
-    """List scan sessions for a user."""
+def _list_user_scan_sessions_sync(user_id: UUID, db: Session) -> list[ScanSession]:
     # Verify user exists
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    if not row_exists(db, User, user_id):
         raise HTTPException(status_code=404, detail="User not found")
     
-    scan_sessions = db.query(ScanSession).filter(ScanSession.user_id == user_id).all()
-    return scan_sessions
+    return db.query(ScanSession).filter(ScanSession.user_id == user_id).all()
+
+
+@router.post("", response_model=UserRead, status_code=201)
+async def create_user(user: UserCreate, db: Session = Depends(get_db)):
+    """Create a new user (programmatic only). Prefer auth flow for real users."""
+    return await run_in_threadpool(_create_user_sync, user, db)
+
+
+@router.get("/{user_id}", response_model=UserRead)
+async def get_user(user_id: UUID, db: Session = Depends(get_db)):
+    """Get user by ID."""
+    return await run_in_threadpool(_get_user_sync, user_id, db)
+
+
+@router.get("/{user_id}/scan-sessions", response_model=list[ScanSessionRead])
+async def list_user_scan_sessions(user_id: UUID, db: Session = Depends(get_db)):
+    """List scan sessions for a user."""
+    return await run_in_threadpool(_list_user_scan_sessions_sync, user_id, db)
 
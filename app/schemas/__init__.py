@@ -1,28 +1,24 @@
-from app.schemas.user import UserCreate, UserRead, UserUpdate, UserReadWithSessions
-from app.schemas.business import BusinessCreate, BusinessRead, BusinessUpdate, BusinessReadWithItems
-from app.schemas.menu_item import MenuItemCreate, MenuItemRead, MenuItemUpdate, MenuItemReadWithBusiness
+from app.schemas.user import UserCreate, UserRead, UserUpdate
+from app.schemas.business import BusinessCreate, BusinessRead, BusinessUpdate
+from app.schemas.menu_item import MenuItemCreate, MenuItemRead, MenuItemUpdate
 from app.schemas.scan_session import ScanSessionCreate, ScanSessionRead, ScanSessionUpdate
 from app.schemas.recommendation_item import (
     RecommendationItemCreate,
     RecommendationItemRead,
     RecommendationItemUpdate,
     RecommendationItemBulkCreate,
-    RecommendationItemReadWithRelations,
 )
 
 __all__ = [
     "UserCreate",
     "UserRead",
     "UserUpdate",
-    "UserReadWithSessions",
     "BusinessCreate",
     "BusinessRead",
     "BusinessUpdate",
-    "BusinessReadWithItems",
     "MenuItemCreate",
     "MenuItemRead",
     "MenuItemUpdate",
-    "MenuItemReadWithBusiness",
     "ScanSessionCreate",
     "ScanSessionRead",
     "ScanSessionUpdate",
@@ -30,6 +26,5 @@ __all__ = [
     "RecommendationItemRead",
     "RecommendationItemUpdate",
     "RecommendationItemBulkCreate",
-    "RecommendationItemReadWithRelations",
 ]
 
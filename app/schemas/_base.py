@@ -0,0 +1,9 @@
+"""Shared base classes for API schemas."""
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ORMRead(BaseModel):
+    """Base for read schemas built from ORM rows. Output-only, so instances are frozen."""
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
@@ -1,11 +1,7 @@
 from pydantic import BaseModel, ConfigDict
 from uuid import UUID
 from datetime import datetime
-from typing import Literal, Optional, Any, TYPE_CHECKING
-
-if TYPE_CHECKING:
-    from app.schemas.menu_item import MenuItemRead
-    from app.schemas.scan_session import ScanSessionRead
+from typing import Literal, Optional, Any
 
 
 class BusinessBase(BaseModel):
@@ -55,13 +51,6 @@ class BusinessRead(BusinessBase):
     model_config = ConfigDict(from_attributes=True)
 
 
-class BusinessReadWithItems(BusinessRead):
-    menu_items: list["MenuItemRead"] = []
-    scan_sessions: list["ScanSessionRead"] = []
-
-    model_config = ConfigDict(from_attributes=True)
-
-
 class BusinessAIInsightsResponse(BaseModel):
     """Response for GET /businesses/{id}/ai-insights. Frontend polls to know when AI is ready."""
 
@@ -69,4 +58,3 @@ class BusinessAIInsightsResponse(BaseModel):
     ai_status: Literal["ready", "pending", "unavailable", "error"]
     ai_notes: Optional[str] = None
     ai_context: Optional[dict[str, Any]] = None
-
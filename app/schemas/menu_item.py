@@ -1,15 +1,17 @@
 from pydantic import BaseModel, ConfigDict
 from uuid import UUID
 from datetime import datetime
-from typing import Optional, TYPE_CHECKING
+from typing import Literal, Optional
 
-if TYPE_CHECKING:
-    from app.schemas.business import BusinessRead
+from app.schemas._base import ORMRead
+
+
+ItemType = Literal["FOOD", "DRINK", "SERVICE", "PERSON", "OTHER"]
 
 
 class MenuItemBase(BaseModel):
     name: str
-    item_type: str  # FOOD, DRINK, SERVICE, PERSON, OTHER
+    item_type: ItemType
     total_mentions: int = 0
     positive_mentions: int = 0
     negative_mentions: int = 0
@@ -24,7 +26,7 @@ class MenuItemCreate(MenuItemBase):
 
 class MenuItemUpdate(BaseModel):
     name: Optional[str] = None
-    item_type: Optional[str] = None
+    item_type: Optional[ItemType] = None
     total_mentions: Optional[int] = None
     positive_mentions: Optional[int] = None
     negative_mentions: Optional[int] = None
@@ -32,18 +34,11 @@ class MenuItemUpdate(BaseModel):
     top_positive_snippet: Optional[str] = None
     top_negative_snippet: Optional[str] = None
 
+    model_config = ConfigDict(defer_build=True)
 
-class MenuItemRead(MenuItemBase):
+
+class MenuItemRead(MenuItemBase, ORMRead):
     id: UUID
     business_id: UUID
     created_at: datetime
     updated_at: datetime
-
-    model_config = ConfigDict(from_attributes=True)
-
-
-class MenuItemReadWithBusiness(MenuItemRead):
-    business: Optional["BusinessRead"] = None
-
-    model_config = ConfigDict(from_attributes=True)
-
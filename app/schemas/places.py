@@ -1,9 +1,11 @@
 """Schemas for Google Places API proxy responses."""
 
 from uuid import UUID
-from typing import Literal, Optional, Any
+from typing import Annotated, Literal, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+from app.schemas.ai_context import BusinessAIContext
 
 
 class PlaceResult(BaseModel):
@@ -20,25 +22,32 @@ class PlaceResult(BaseModel):
     photo_url: Optional[str] = None
     price_level: Optional[int] = None
 
+    model_config = ConfigDict(frozen=True)
+
 
 class NearbySearchResponse(BaseModel):
     """Response for nearby search endpoint."""
     results: list[PlaceResult]
 
 
+# Google opening-hours encoding: day 0 (Sunday) to 6, time as 24h "HHMM"
+DayOfWeek = Annotated[int, Field(ge=0, le=6)]
+HHMM = Annotated[str, Field(pattern=r"^\d{4}$")]
+
+
 class OpeningHoursPeriod(BaseModel):
     """Opening hours period."""
-    open_day: int
-    open_time: str
-    close_day: Optional[int] = None
-    close_time: Optional[str] = None
+    open_day: DayOfWeek
+    open_time: HHMM
+    close_day: Optional[DayOfWeek] = None
+    close_time: Optional[HHMM] = None
 
 
 class OpeningHours(BaseModel):
     """Opening hours information."""
     open_now: Optional[bool] = None
-    weekday_text: list[str] = []
-    periods: list[OpeningHoursPeriod] = []
+    weekday_text: list[str] = Field(default_factory=list)
+    periods: list[OpeningHoursPeriod] = Field(default_factory=list)
 
 
 class PlaceDetails(BaseModel):
@@ -72,7 +81,7 @@ class PlaceDetails(BaseModel):
     provider_place_id: str
     name: str
     category: Optional[str] = None
-    types: list[str] = []
+    types: list[str] = Field(default_factory=list)
     rating: Optional[float] = None
     review_count: Optional[int] = None
     formatted_address: Optional[str] = None
@@ -82,7 +91,7 @@ class PlaceDetails(BaseModel):
     # Single photo URL for backwards compatibility
     photo_url: Optional[str] = None
     # Multiple photo URLs for carousel support (up to 10)
-    photo_urls: list[str] = []
+    photo_urls: list[str] = Field(default_factory=list)
     lat: Optional[float] = None
     lng: Optional[float] = None
     # AI-generated summary for chat context (cached per business)
@@ -90,7 +99,7 @@ class PlaceDetails(BaseModel):
     # Business UUID for chat and future calls (same identifier as chat endpoint)
     business_id: Optional[UUID] = None
     # Structured AI context (summary, pros, cons, vibe, best_for_user_profile, etc.)
-    ai_context: Optional[dict[str, Any]] = None
+    ai_context: Optional[BusinessAIContext] = None
     price_level: Optional[int] = None
 
 
@@ -98,30 +107,19 @@ class PlaceDetailsResponse(BaseModel):
     """Response for place details endpoint. Top-level business_id, ai_context, and ai_status for client decoding."""
     result: PlaceDetails
     business_id: Optional[UUID] = None
-    ai_context: Optional[dict[str, Any]] = None
+    ai_context: Optional[BusinessAIContext] = None
     ai_status: Literal["ready", "pending", "unavailable"] = "ready"
 
     model_config = ConfigDict(serialization_exclude_none=True)
 
 
-class PlaceSearchResult(BaseModel):
+class PlaceSearchResult(PlaceResult):
     """
     Place result for text search - extends PlaceResult with additional fields.
     Compatible with /nearby results for iOS card reuse.
     """
-    provider: str = "google"
-    provider_place_id: str
-    name: str
-    category: Optional[str] = None
-    rating: Optional[float] = None
-    review_count: Optional[int] = None
-    address_short: Optional[str] = None
-    lat: float
-    lng: float
-    photo_url: Optional[str] = None
     # Additional fields for search results
-    types: list[str] = []
-    price_level: Optional[int] = None
+    types: list[str] = Field(default_factory=list)
     distance_m: Optional[int] = None
 
 
@@ -129,3 +127,7 @@ class TextSearchResponse(BaseModel):
     """Response for text search endpoint."""
     results: list[PlaceSearchResult]
 
+
+# Reusable list adapters (validator/serializer built once, not per request)
+PLACE_RESULT_LIST = TypeAdapter(list[PlaceResult])
+PLACE_SEARCH_RESULT_LIST = TypeAdapter(list[PlaceSearchResult])
@@ -1,17 +1,18 @@
 from pydantic import BaseModel, ConfigDict
 from uuid import UUID
 from datetime import datetime
-from typing import Optional, TYPE_CHECKING
+from typing import Literal, Optional
 
-if TYPE_CHECKING:
-    from app.schemas.scan_session import ScanSessionRead
-    from app.schemas.menu_item import MenuItemRead
+from app.schemas._base import ORMRead
+
+
+RecommendationLabel = Literal["HIGHLY_RECOMMENDED", "RECOMMENDED", "NOT_RECOMMENDED"]
 
 
 class RecommendationItemBase(BaseModel):
     rank: int
     is_recommended: bool
-    recommendation_label: str  # HIGHLY_RECOMMENDED, RECOMMENDED, NOT_RECOMMENDED
+    recommendation_label: RecommendationLabel
     display_mention_count: int
     display_avg_rating: Optional[float] = None
     display_positive_snippet: Optional[str] = None
@@ -29,25 +30,17 @@ class RecommendationItemBulkCreate(BaseModel):
 class RecommendationItemUpdate(BaseModel):
     rank: Optional[int] = None
     is_recommended: Optional[bool] = None
-    recommendation_label: Optional[str] = None
+    recommendation_label: Optional[RecommendationLabel] = None
     display_mention_count: Optional[int] = None
     display_avg_rating: Optional[float] = None
     display_positive_snippet: Optional[str] = None
     display_negative_snippet: Optional[str] = None
 
+    model_config = ConfigDict(defer_build=True)
 
-class RecommendationItemRead(RecommendationItemBase):
+
+class RecommendationItemRead(RecommendationItemBase, ORMRead):
     id: UUID
     scan_session_id: UUID
     menu_item_id: UUID
     created_at: datetime
-
-    model_config = ConfigDict(from_attributes=True)
-
-
-class RecommendationItemReadWithRelations(RecommendationItemRead):
-    scan_session: Optional["ScanSessionRead"] = None
-    menu_item: Optional["MenuItemRead"] = None
-
-    model_config = ConfigDict(from_attributes=True)
-
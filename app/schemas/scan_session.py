@@ -1,13 +1,18 @@
 from pydantic import BaseModel, ConfigDict
 from uuid import UUID
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
+
+from app.schemas._base import ORMRead
+
+
+ScanStatus = Literal["PENDING", "PROCESSING", "COMPLETED", "FAILED"]
 
 
 class ScanSessionBase(BaseModel):
     image_url: str
     detected_text_raw: str
-    status: str  # PENDING, PROCESSING, COMPLETED, FAILED
+    status: ScanStatus
 
 
 class ScanSessionCreate(ScanSessionBase):
@@ -21,17 +26,16 @@ class ScanSessionUpdate(BaseModel):
     business_id: Optional[UUID] = None
     image_url: Optional[str] = None
     detected_text_raw: Optional[str] = None
-    status: Optional[str] = None
+    status: Optional[ScanStatus] = None
     completed_at: Optional[datetime] = None
 
+    model_config = ConfigDict(defer_build=True)
 
-class ScanSessionRead(ScanSessionBase):
+
+class ScanSessionRead(ScanSessionBase, ORMRead):
     id: UUID
     user_id: Optional[UUID] = None
     device_id: Optional[str] = None
     business_id: Optional[UUID] = None
     created_at: datetime
     completed_at: Optional[datetime] = None
-
-    model_config = ConfigDict(from_attributes=True)
-
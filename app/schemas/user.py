@@ -1,10 +1,9 @@
-from pydantic import BaseModel, ConfigDict, model_validator, model_serializer
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, computed_field, model_validator, model_serializer
 from uuid import UUID
 from datetime import datetime
-from typing import Optional, Dict, Any, Union, List, TYPE_CHECKING
+from typing import Optional, Dict, Any, List
 
-if TYPE_CHECKING:
-    from app.schemas.scan_session import ScanSessionRead
+from app.schemas._base import ORMRead
 
 
 class OnboardingPreferences(BaseModel):
@@ -15,32 +14,25 @@ class OnboardingPreferences(BaseModel):
     output always uses canonical keys only (intents, priorities).
     """
     companion: Optional[str] = None
-    intents: Optional[List[str]] = None
-    priorities: Optional[List[str]] = None
+    # Legacy keys are accepted on input via alias (resolved in pydantic-core, no Python validator)
+    intents: Optional[List[str]] = Field(
+        default=None, validation_alias=AliasChoices("intents", "intent_selections")
+    )
+    priorities: Optional[List[str]] = Field(
+        default=None, validation_alias=AliasChoices("priorities", "priority_selections")
+    )
     place_interests: Optional[List[str]] = None
     travel_frequency: Optional[str] = None
     exploration_level: Optional[float] = None
     dietary_restrictions: Optional[List[str]] = None
 
-    model_config = ConfigDict(extra="allow")
-
-    @model_validator(mode="before")
-    @classmethod
-    def map_legacy_keys(cls, data: Any) -> Any:
-        """Map legacy keys to canonical: intent_selections → intents, priority_selections → priorities."""
-        if not isinstance(data, dict):
-            return data
-        data = dict(data)
-        if data.get("intents") is None and data.get("intent_selections") is not None:
-            data["intents"] = data["intent_selections"]
-        if data.get("priorities") is None and data.get("priority_selections") is not None:
-            data["priorities"] = data["priority_selections"]
-        return data
+    # Unknown and legacy keys are dropped on input, so they can never be emitted
+    model_config = ConfigDict(extra="ignore")
 
-    @model_serializer
-    def _serialize_exclude_none(self):
-        """Emit only set fields; never include legacy keys (they are not model fields)."""
-        return {k: getattr(self, k) for k in self.model_fields if getattr(self, k) is not None}
+    @model_serializer(mode="wrap")
+    def _serialize_exclude_none(self, handler):
+        """Drop None values when nested in responses (e.g. MeRead); fields are serialized by pydantic-core."""
+        return {k: v for k, v in handler(self).items() if v is not None}
 
 
 class UserBase(BaseModel):
@@ -50,18 +42,22 @@ class UserBase(BaseModel):
 
 class UserCreate(UserBase):
     """For programmatic/create-user API only. Auth flow uses get_or_create_user_for_supabase_uid."""
-    external_auth_uid: Union[str, UUID]  # Required; 1:1 with Supabase JWT sub
+    external_auth_uid: UUID  # Required; 1:1 with Supabase JWT sub
+
+    model_config = ConfigDict(defer_build=True)
 
 
 class UserUpdate(BaseModel):
     auth_provider_id: Optional[str] = None
     email: Optional[str] = None
 
+    model_config = ConfigDict(defer_build=True)
+
 
-class UserRead(BaseModel):
+class UserRead(ORMRead):
     id: UUID
     external_auth_provider: Optional[str] = None
-    external_auth_uid: Optional[Union[str, UUID]] = None  # JWT sub; UUID in DB, str in API
+    external_auth_uid: Optional[UUID] = None  # JWT sub; UUID string in DB and API
     onboarding_preferences: Optional[OnboardingPreferences] = None
     onboarding_completed_at: Optional[datetime] = None
     created_at: Optional[datetime] = None
@@ -69,21 +65,12 @@ class UserRead(BaseModel):
     # Legacy fields (for backward compatibility)
     auth_provider_id: Optional[str] = None
     email: Optional[str] = None
-    needs_onboarding: bool = False
-
-    model_config = ConfigDict(from_attributes=True)
 
-    @model_validator(mode="after")
-    def set_needs_onboarding(self) -> "UserRead":
+    @computed_field
+    @property
+    def needs_onboarding(self) -> bool:
         """needs_onboarding is True iff onboarding_completed_at is NULL (source of truth for iOS)."""
-        self.needs_onboarding = self.onboarding_completed_at is None
-        return self
-
-
-class UserReadWithSessions(UserRead):
-    scan_sessions: list["ScanSessionRead"] = []
-
-    model_config = ConfigDict(from_attributes=True)
+        return self.onboarding_completed_at is None
 
 
 # New schemas for /me endpoints
@@ -92,12 +79,16 @@ class MeRead(UserRead):
     pass
 
 
+# Top-level keys of a flattened preferences payload that are not themselves preferences
+_PREFERENCES_UPDATE_EXCLUDED = frozenset({"onboarding_completed_at", "onboarding_completed"})
+
+
 class UserPreferencesUpdate(BaseModel):
     """Request model for updating user preferences (supports partial updates).
     
     Accepts:
     - onboarding_preferences: Optional JSONB dict with user preferences
-    - onboarding_completed_at: Optional ISO datetime string to set specific completion time
+    - onboarding_completed_at: Optional ISO 8601 datetime to set specific completion time
     
     Both fields are optional to support partial updates. However, if onboarding_completed_at
     is provided, onboarding_preferences must also be provided.
@@ -132,7 +123,7 @@ class UserPreferencesUpdate(BaseModel):
     ```
     """
     onboarding_preferences: Optional[Dict[str, Any]] = None
-    onboarding_completed_at: Optional[str] = None  # ISO datetime string
+    onboarding_completed_at: Optional[datetime] = None  # ISO 8601 in the payload; parsed by pydantic
     
     # Allow extra fields for flattened payload support
     model_config = ConfigDict(extra="allow")
@@ -140,51 +131,46 @@ class UserPreferencesUpdate(BaseModel):
     @model_validator(mode="before")
     @classmethod
     def wrap_flattened_fields(cls, data: Any) -> Any:
-        """Wrap flattened fields into onboarding_preferences if needed."""
-        if isinstance(data, dict):
-            # If onboarding_preferences is already present, return as-is
-            if "onboarding_preferences" in data and data["onboarding_preferences"] is not None:
+        """Wrap flattened fields into onboarding_preferences if needed (single pass over the payload)."""
+        if not isinstance(data, dict):
+            return data
+        prefs = None
+        for k, v in data.items():
+            if v is None or k in _PREFERENCES_UPDATE_EXCLUDED:
+                continue
+            # onboarding_preferences already present: return as-is
+            if k == "onboarding_preferences":
                 return data
-            
-            # Check if there are any fields that look like flattened preferences
-            # (i.e., fields other than onboarding_completed_at)
-            excluded_fields = {"onboarding_completed_at", "onboarding_completed"}
-            flattened_fields = {
-                k: v for k, v in data.items()
-                if k not in excluded_fields and v is not None
-            }
-            
-            # If we have flattened fields, wrap them into onboarding_preferences
-            if flattened_fields:
-                wrapped_data = {
-                    "onboarding_preferences": flattened_fields,
-                    "onboarding_completed_at": data.get("onboarding_completed_at")
-                }
-                return wrapped_data
-        
-        return data
-    
-    @model_validator(mode="after")
-    def validate_consistency(self) -> "UserPreferencesUpdate":
-        """Validate that if onboarding_completed_at is provided, onboarding_preferences must also be provided."""
-        if self.onboarding_completed_at is not None and self.onboarding_preferences is None:
-            raise ValueError("onboarding_preferences is required when onboarding_completed_at is provided")
-        return self
+            if prefs is None:
+                prefs = {}
+            prefs[k] = v
+        # No flattened fields: nothing to wrap, but a completion time needs preferences
+        if prefs is None:
+            if data.get("onboarding_completed_at") is not None:
+                raise ValueError("onboarding_preferences is required when onboarding_completed_at is provided")
+            return data
+        return {
+            "onboarding_preferences": prefs,
+            "onboarding_completed_at": data.get("onboarding_completed_at"),
+        }
 
 
 class GuestUpgradeRequest(BaseModel):
     """Request model for upgrading guest sessions to user."""
     device_id: str
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class OnboardingUpdate(BaseModel):
     """Request model for saving onboarding answers."""
     answers: Dict[str, Any]
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class OnboardingRead(BaseModel):
     """Response model for getting onboarding answers."""
     answers: Optional[Dict[str, Any]] = None
     completed: bool = False
-    completed_at: Optional[str] = None
-
+    completed_at: Optional[datetime] = None
@@ -1,4 +1,5 @@
 import uuid
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.models.user import User
@@ -7,17 +8,33 @@ from app.models.menu_item import MenuItem
 from app.models.scan_session import ScanSession
 from app.models.recommendation_item import RecommendationItem
 
+# Children before parents, so the sqlite fallback never trips a foreign key.
+_SEED_TABLES = (
+    RecommendationItem.__tablename__,
+    ScanSession.__tablename__,
+    MenuItem.__tablename__,
+    Business.__tablename__,
+    User.__tablename__,
+)
+
+
+def _reset_tables(db: Session) -> None:
+    """Empty the seeded tables without committing, with one TRUNCATE on PostgreSQL."""
+    dialect = db.get_bind().dialect.name
+    tables = ", ".join(_SEED_TABLES)
+    if dialect == "postgresql":
+        db.execute(text(f"TRUNCATE TABLE {tables} RESTART IDENTITY CASCADE"))
+    else:
+        for table in _SEED_TABLES:
+            db.execute(text(f"DELETE FROM {table}"))
+
 
 def seed_db(db: Session) -> None:
     """Seed the database with sample data."""
     
-    # Clear existing data (optional - comment out if you want to preserve data)
-    db.query(RecommendationItem).delete()
-    db.query(ScanSession).delete()
-    db.query(MenuItem).delete()
-    db.query(Business).delete()
-    db.query(User).delete()
-    db.commit()
+    # Clear existing data (optional - comment out if you want to preserve data).
+    # No commit here: the reset and the inserts below land in one transaction.
+    _reset_tables(db)
     
     # Create Users (external_auth_uid required; 1:1 with Supabase auth)
     user1 = User(
@@ -32,11 +49,6 @@ def seed_db(db: Session) -> None:
         auth_provider_id="supabase_user_2",
         email="bob@example.com",
     )
-    db.add(user1)
-    db.add(user2)
-    db.commit()
-    db.refresh(user1)
-    db.refresh(user2)
     
     # Create Businesses
     business1 = Business(
@@ -61,11 +73,6 @@ def seed_db(db: Session) -> None:
         lng=-74.0007,
         category="salon"
     )
-    db.add(business1)
-    db.add(business2)
-    db.commit()
-    db.refresh(business1)
-    db.refresh(business2)
     
     # Create Menu Items for Business 1 (Pizza)
     menu_item1 = MenuItem(
@@ -142,21 +149,7 @@ def seed_db(db: Session) -> None:
         top_positive_snippet="Beautiful color work",
         top_negative_snippet="Expensive but worth it"
     )
-    
-    db.add(menu_item1)
-    db.add(menu_item2)
-    db.add(menu_item3)
-    db.add(menu_item4)
-    db.add(menu_item5)
-    db.add(menu_item6)
-    db.commit()
-    db.refresh(menu_item1)
-    db.refresh(menu_item2)
-    db.refresh(menu_item3)
-    db.refresh(menu_item4)
-    db.refresh(menu_item5)
-    db.refresh(menu_item6)
-    
+
     # Create Scan Sessions
     scan1 = ScanSession(
         id=uuid.uuid4(),
@@ -183,15 +176,7 @@ def seed_db(db: Session) -> None:
         detected_text_raw="TONY'S PIZZA\nPepperoni Pizza $18\nMargherita Pizza $16",
         status="PROCESSING"
     )
-    
-    db.add(scan1)
-    db.add(scan2)
-    db.add(scan3)
-    db.commit()
-    db.refresh(scan1)
-    db.refresh(scan2)
-    db.refresh(scan3)
-    
+
     # Create Recommendation Items for Scan 1
     rec1 = RecommendationItem(
         id=uuid.uuid4(),
@@ -255,14 +240,18 @@ def seed_db(db: Session) -> None:
         display_positive_snippet="Great cuts, very professional",
         display_negative_snippet="Wait time can be long"
     )
-    
-    db.add(rec1)
-    db.add(rec2)
-    db.add(rec3)
-    db.add(rec4)
-    db.add(rec5)
+
+    # IDs are assigned client-side, so everything can be flushed in one go
+    # without refreshing rows back from the database.
+    db.add_all([
+        user1, user2,
+        business1, business2,
+        menu_item1, menu_item2, menu_item3, menu_item4, menu_item5, menu_item6,
+        scan1, scan2, scan3,
+        rec1, rec2, rec3, rec4, rec5,
+    ])
     db.commit()
-    
+
     print("Database seeded successfully!")
     print(f"Created: 2 users, 2 businesses, 6 menu items, 3 scan sessions, 5 recommendation items")
 
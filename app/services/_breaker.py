@@ -0,0 +1,90 @@
+"""
+Minimal thread-safe circuit breaker for outbound API calls (used by gemini_client).
+
+CLOSED: calls pass; consecutive failures are counted and the breaker opens at the threshold.
+OPEN: calls are short-circuited until the open window elapses.
+HALF_OPEN: a single probe call is admitted; success closes the breaker, failure re-opens it
+with a doubled window (capped).
+"""
+
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-dependency breaker; callers report outcomes with record_success / record_failure / trip."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_after: float = 30.0,
+        max_reset_after: float = 600.0,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.max_reset_after = max_reset_after
+        self.state = CLOSED
+        self.failure_count = 0
+        self.opened_at = 0.0
+        self.open_for = reset_after
+        self.probe_inflight = False
+        self.probe_started_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if a call may go out now. In HALF_OPEN, only one probe is admitted at a time."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == OPEN:
+                if now - self.opened_at < self.open_for:
+                    return False
+                self.state = HALF_OPEN
+                self.probe_inflight = False
+            # A probe that never reported back (e.g. an unexpected exception) must not wedge the breaker
+            if self.probe_inflight and now - self.probe_started_at < self.reset_after:
+                return False
+            self.probe_inflight = True
+            self.probe_started_at = now
+            return True
+
+    def record_success(self) -> None:
+        """The dependency answered; close the breaker and forget past failures."""
+        with self._lock:
+            self.state = CLOSED
+            self.failure_count = 0
+            self.open_for = self.reset_after
+            self.probe_inflight = False
+
+    def record_failure(self) -> None:
+        """A tripping failure (timeout, 5xx). Opens at the threshold, or at once from HALF_OPEN."""
+        with self._lock:
+            self.failure_count += 1
+            if self.state == HALF_OPEN:
+                self._open(min(self.open_for * 2, self.max_reset_after))
+            elif self.state == CLOSED and self.failure_count >= self.failure_threshold:
+                self._open(self.reset_after)
+
+    def trip(self, seconds: float) -> None:
+        """Open immediately for the given window (e.g. the server told us to back off)."""
+        with self._lock:
+            self.failure_count += 1
+            self._open(seconds)
+
+    def release_probe(self) -> None:
+        """A non-tripping outcome (e.g. 400); let the next call probe instead of waiting."""
+        with self._lock:
+            self.probe_inflight = False
+
+    def _open(self, seconds: float) -> None:
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.open_for = seconds
+        self.probe_inflight = False
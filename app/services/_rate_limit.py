@@ -0,0 +1,47 @@
+"""
+Minimal thread-safe token bucket for pacing outbound API calls (used by gemini_client).
+
+Tokens refill continuously at rate_per_minute / 60 per second up to burst. A caller reserves
+one token and gets back how long to wait before sending; reservations that would wait longer
+than the caller allows are refused without consuming a token. A rate of 0 disables pacing.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Per-key request pacer; callers sleep for the delay returned by reserve()."""
+
+    def __init__(self, name: str, rate_per_minute: float, burst: Optional[float] = None) -> None:
+        self.name = name
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst if burst is not None else max(1.0, rate_per_minute / 4)
+        self.tokens = self.burst
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """
+        Take one token. Returns seconds to wait before the call may go out (0 if a token was
+        available), or None if that would exceed max_wait; nothing is taken in that case.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            # Tokens may go negative: each queued reservation pushes the next one further out
+            wait = max(0.0, (1.0 - self.tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            self.tokens -= 1.0
+            return wait
+
+    def reset(self) -> None:
+        """Refill to burst (e.g. after a config change or in tests)."""
+        with self._lock:
+            self.tokens = self.burst
+            self.last_refill = time.monotonic()
@@ -5,23 +5,57 @@ Replaces separate generate_ai_notes_for_business and generate_business_ai_contex
 so GET /places/details can trigger a single background job and avoid blocking.
 """
 
-import json
+import hashlib
 import logging
 import re
-from typing import Any
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable
 from uuid import UUID
 
+import orjson
+from pydantic import ValidationError
+from sqlalchemy import bindparam, update
+
+from app.db.session import SessionLocal
 from app.models.business import Business
 from app.schemas.ai_context import BusinessAIContext
-from app.services.gemini_client import generate_text_with_system
+from app.services._ttl_cache import TTLCache
+from app.services.business_cache import invalidate_business
+from app.services.gemini_client import stream_text_with_cached_system
 
 logger = logging.getLogger(__name__)
 
+# Markdown code fence the model sometimes wraps its JSON in.
+_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)\s*```")
+
+# Core UPDATE for the insights write, built once; its compiled form is reused from
+# SQLAlchemy's statement cache on every job.
+_UPDATE_AI_INSIGHTS = (
+    update(Business)
+    .where(Business.id == bindparam("b_id"))
+    .values(
+        ai_notes=bindparam("b_notes"),
+        ai_context=bindparam("b_context"),
+        ai_tags=bindparam("b_tags"),
+        ai_context_last_updated=bindparam("b_updated"),
+    )
+    .execution_options(synchronize_session=False)
+)
+
+# Parsed insights keyed by (business_id, place_details digest) so duplicate jobs for the
+# same business and Google payload reuse one Gemini round trip. LRU-evicted, TTL-expired.
+_INSIGHTS_CACHE_MAXSIZE = 1024
+_INSIGHTS_CACHE_TTL = 3600  # seconds
+_insights_cache = TTLCache(_INSIGHTS_CACHE_MAXSIZE, _INSIGHTS_CACHE_TTL)
+
 # Fixed vocabulary for AI tags (home feed sections). Model must choose 1–4 from this set.
 AI_TAG_VOCABULARY = frozenset({
     "date-night", "groups", "solo", "quick-bite", "healthy",
     "coffee", "dessert", "study-spot", "fancy", "budget",
 })
+# Vocabulary tag -> interned canonical string; stored tags share one object per tag.
+_TAG_CANON: dict[str, str] = {tag: sys.intern(tag) for tag in AI_TAG_VOCABULARY}
 
 SYSTEM_PROMPT = """You are PickRight, an AI guide that summarizes a SINGLE local business. You never make things up that contradict the data you are given. You write in a friendly, concise tone. Do not personalize to any specific user; describe the place objectively.
 
@@ -59,10 +93,15 @@ def _format_review_snippets(place_data: dict, max_reviews: int = 3, max_chars_pe
 
 def _extract_city(place_data: dict) -> str:
     """Extract city/locality from Google Place address_components."""
-    for comp in place_data.get("address_components") or []:
-        if "locality" in (comp.get("types") or []):
-            return comp.get("long_name") or comp.get("short_name") or ""
-    return ""
+    components = place_data.get("address_components") or ()
+    return next(
+        (
+            comp.get("long_name") or comp.get("short_name") or ""
+            for comp in components
+            if "locality" in (comp.get("types") or ())
+        ),
+        "",
+    )
 
 
 def _build_prompt(business: Business, place_details: dict) -> str:
@@ -74,7 +113,7 @@ def _build_prompt(business: Business, place_details: dict) -> str:
         if place_details.get("types")
         else "Not specified"
     )
-    address = business.address or business.address_full or ""
+    address = business.full_address or ""
     city = _extract_city(place_details)
     state = getattr(business, "state", None) or ""
     rating = place_details.get("rating")
@@ -98,17 +137,62 @@ Sample review snippets (truncated):
 Respond with a single JSON object only: {{"notes": "...", "context": {{...}}, "tags": [...]}}."""
 
 
+def _collect_json_response(chunks: Iterable[str]) -> str:
+    """
+    Accumulate streamed text and stop as soon as the first top-level JSON object closes.
+
+    Braces inside JSON strings are ignored. Anything before the opening brace (e.g. a
+    code fence) is kept out of the result. If the stream ends before the object closes,
+    the whole buffer is returned for _parse_json_from_response to deal with.
+    """
+    parts: list[str] = []
+    start = -1  # offset of the opening brace within the joined buffer
+    offset = 0
+    depth = 0
+    in_string = False
+    escaped = False
+    try:
+        for chunk in chunks:
+            parts.append(chunk)
+            for i, ch in enumerate(chunk):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == "\\":
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"':
+                    if start >= 0:
+                        in_string = True
+                elif ch == "{":
+                    if start < 0:
+                        start = offset + i
+                    depth += 1
+                elif ch == "}" and start >= 0:
+                    depth -= 1
+                    if depth == 0:
+                        return "".join(parts)[start:offset + i + 1]
+            offset += len(chunk)
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+    return "".join(parts)
+
+
 def _parse_json_from_response(text: str) -> dict[str, Any]:
     """Extract JSON from model response; may be wrapped in markdown code block."""
     if not text or not text.strip():
         return {}
     raw = text.strip()
-    match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", raw)
-    if match:
-        raw = match.group(1).strip()
+    if not (raw[0] == "{" and raw[-1] == "}"):
+        match = _FENCE_RE.search(raw)
+        if match:
+            raw = match.group(1).strip()
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError as e:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError as e:
         logger.warning("Unified AI insights JSON parse failed: %s; raw snippet: %s", e, raw[:200])
         return {}
 
@@ -121,18 +205,19 @@ def _normalize_context_for_store(context: dict[str, Any]) -> dict[str, Any]:
     else:
         best_for_user_profile = str(best_for) if best_for else ""
 
+    pros = context.get("pros")
+    cons = context.get("cons")
     raw = {
         "summary": context.get("summary") or "",
-        "pros": context.get("pros") if isinstance(context.get("pros"), list) else [],
-        "cons": context.get("cons") if isinstance(context.get("cons"), list) else [],
+        "pros": pros if isinstance(pros, list) else [],
+        "cons": cons if isinstance(cons, list) else [],
         "best_for_user_profile": best_for_user_profile,
         "vibe": context.get("vibe") or "",
         "reliability_notes": context.get("reliability_notes") or "",
         "source_notes": context.get("source_notes") or "",
     }
     try:
-        ctx = BusinessAIContext.model_validate(raw)
-        return ctx.to_store_dict() if hasattr(ctx, "to_store_dict") else ctx.model_dump(exclude_none=True)
+        return BusinessAIContext.model_validate(raw).to_store_dict()
     except Exception as e:
         logger.warning("BusinessAIContext validation failed, using raw: %s", e)
         return {k: v for k, v in raw.items() if k in BusinessAIContext.model_fields}
@@ -144,11 +229,31 @@ def _normalize_tags(raw_tags: Any) -> list[str]:
         return []
     out: list[str] = []
     for item in raw_tags[:4]:
-        if isinstance(item, str) and item.strip() in AI_TAG_VOCABULARY:
-            out.append(item.strip())
+        if isinstance(item, str):
+            canon = _TAG_CANON.get(item.strip())
+            if canon is not None:
+                out.append(canon)
     return out
 
 
+def _insights_cache_key(business: Business, place_details: dict) -> tuple[str, bytes] | None:
+    """Key on business id plus a digest of the sorted place details; None if not serializable."""
+    try:
+        payload = orjson.dumps(place_details, option=orjson.OPT_SORT_KEYS)
+    except TypeError:
+        return None
+    return (str(business.id), hashlib.blake2b(payload, digest_size=16).digest())
+
+
+def _insights_cache_get(key: tuple[str, bytes]) -> tuple[str, dict, list[str]] | None:
+    """Cached insights for key as fresh copies (callers may mutate them), or None."""
+    value = _insights_cache.get(key)
+    if value is None:
+        return None
+    notes, context, tags = value
+    return (notes, dict(context), list(tags))
+
+
 def generate_business_ai_insights(business: Business, place_details: dict) -> tuple[str, dict, list[str]]:
     """
     Call Gemini once and return ai_notes, ai_context, and ai_tags.
@@ -161,6 +266,8 @@ def generate_business_ai_insights(business: Business, place_details: dict) -> tu
         (ai_notes_string, ai_context_dict, ai_tags_list). ai_context_dict is JSON-serializable
         and suitable for Business.ai_context (BusinessAIContext shape). ai_tags_list is
         1–4 tags from the fixed vocabulary; defaults to [] if missing or invalid.
+        Successfully parsed results are cached for an hour per (business id, place_details),
+        so a repeated call with the same inputs skips the LLM; fallbacks are never cached.
 
     Raises:
         RuntimeError: If the LLM returns nothing or JSON parsing fails and we have no fallback.
@@ -172,9 +279,17 @@ def generate_business_ai_insights(business: Business, place_details: dict) -> tu
     }
     fallback_tags: list[str] = []
 
+    cache_key = _insights_cache_key(business, place_details)
+    if cache_key is not None:
+        cached = _insights_cache_get(cache_key)
+        if cached is not None:
+            logger.debug("Using cached AI insights for business %s", business.id)
+            return cached
+
     prompt = _build_prompt(business, place_details)
     try:
-        response_text = generate_text_with_system(prompt, SYSTEM_PROMPT)
+        # Stream and stop once the JSON object closes; the model sometimes keeps going
+        response_text = _collect_json_response(stream_text_with_cached_system(prompt, SYSTEM_PROMPT))
     except Exception as e:
         logger.exception("generate_business_ai_insights LLM failed for business %s: %s", business.id, e)
         raise RuntimeError("AI insights generation failed") from e
@@ -195,29 +310,38 @@ def generate_business_ai_insights(business: Business, place_details: dict) -> tu
     tags = _normalize_tags(raw_tags) if raw_tags is not None else fallback_tags
     if raw_tags is not None and not isinstance(raw_tags, list):
         logger.debug("AI insights tags not a list for business %s; using empty list", business.id)
+    if cache_key is not None:
+        _insights_cache.set(cache_key, (notes, dict(ai_context), list(tags)))
     return (notes, ai_context, tags)
 
 
+def _stored_context_is_valid(raw: Any) -> bool:
+    """True if a stored ai_context is present and still reads back as BusinessAIContext."""
+    if not raw:
+        return False
+    try:
+        BusinessAIContext.model_validate(raw)
+    except ValidationError:
+        return False
+    return True
+
+
 def generate_and_save_business_ai_insights(business_id: UUID, place_details: dict) -> None:
     """
     Load business, generate AI insights in one LLM call, and persist to DB.
 
-    Intended to be run in a FastAPI BackgroundTask. Re-checks needs_ai to avoid
-    duplicate work. Uses a new DB session; catches and logs errors so failures
-    do not crash the background worker.
+    Intended to be run in a FastAPI BackgroundTask. Re-checks freshness on the loaded
+    row, so concurrent jobs for the same business skip once another worker has saved.
+    Uses a new DB session; catches and logs errors so failures do not crash the
+    background worker.
 
     Args:
         business_id: Business UUID (from Business.id).
         place_details: Raw Google Place Details API result (the "result" dict).
     """
-    from datetime import datetime, timedelta, timezone
-
-    from app.db.session import SessionLocal
-    from app.models.business import Business
-
     db = SessionLocal()
     try:
-        business = db.query(Business).filter(Business.id == business_id).first()
+        business = db.get(Business, business_id)
         if not business:
             logger.warning("generate_and_save_business_ai_insights: business %s not found", business_id)
             return
@@ -228,7 +352,7 @@ def generate_and_save_business_ai_insights(business_id: UUID, place_details: dic
             last_updated = last_updated.replace(tzinfo=timezone.utc)
         if (
             business.ai_notes
-            and business.ai_context
+            and _stored_context_is_valid(business.ai_context)
             and last_updated is not None
             and (now - last_updated) <= timedelta(hours=24)
         ):
@@ -236,11 +360,19 @@ def generate_and_save_business_ai_insights(business_id: UUID, place_details: dic
             return
 
         ai_notes, ai_context, ai_tags = generate_business_ai_insights(business, place_details)
-        business.ai_notes = ai_notes
-        business.ai_context = ai_context
-        business.ai_tags = ai_tags
-        business.ai_context_last_updated = now
+        # Core UPDATE: no dirty-attribute scan or flush for four plain column writes
+        db.execute(
+            _UPDATE_AI_INSIGHTS,
+            {
+                "b_id": business_id,
+                "b_notes": ai_notes,
+                "b_context": ai_context,
+                "b_tags": ai_tags,
+                "b_updated": now,
+            },
+        )
         db.commit()
+        invalidate_business(business_id)
         logger.info("Saved AI insights for business %s", business_id)
     except Exception as e:
         logger.exception("generate_and_save_business_ai_insights failed for business %s: %s", business_id, e)
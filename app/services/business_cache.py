@@ -0,0 +1,86 @@
+"""
+Short-lived read-through cache of the Business columns the chat endpoints read.
+
+A chat session keeps asking about the same place, so each turn re-reading the row is a
+wasted round trip. Entries are immutable snapshots (no Session attached) keyed by business
+id, LRU-evicted and expired after BUSINESS_CACHE_TTL_SECONDS. Writers of these columns
+call invalidate_business() after committing; other workers see the change once the entry
+expires.
+"""
+
+from typing import Any, NamedTuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, load_only, raiseload
+
+from app.models.business import Business
+from app.services._ttl_cache import TTLCache
+
+BUSINESS_CACHE_MAXSIZE = 1024
+BUSINESS_CACHE_TTL_SECONDS = 300
+
+# Loads run in threadpool workers (sync routes, anyio.to_thread); TTLCache is thread-safe
+_business_cache = TTLCache(BUSINESS_CACHE_MAXSIZE, BUSINESS_CACHE_TTL_SECONDS)
+
+
+class BusinessSnapshot(NamedTuple):
+    """Read-only copy of the Business fields used to build chat context. ai_context must not be mutated."""
+
+    id: UUID
+    name: str
+    address: str | None
+    address_full: str | None
+    state: str | None
+    lat: float | None
+    lng: float | None
+    latitude: float | None
+    longitude: float | None
+    category: str | None
+    ai_notes: str | None
+    ai_context: dict[str, Any] | None
+
+    @classmethod
+    def from_business(cls, business: Business) -> "BusinessSnapshot":
+        return cls(*(getattr(business, field) for field in cls._fields))
+
+    # Same fallbacks as the Business model properties
+    full_address = Business.full_address
+    coordinates = Business.coordinates
+
+
+# Loader option for chat-path selects: only the columns a snapshot copies (no provider ids, photos, tags)
+BUSINESS_SNAPSHOT_COLUMNS = load_only(*(getattr(Business, field) for field in BusinessSnapshot._fields))
+
+
+def get_cached_business(business_id: UUID) -> BusinessSnapshot | None:
+    """Return the cached snapshot for business_id, or None if absent or expired."""
+    return _business_cache.get(business_id)
+
+
+def cache_business(business: Business) -> BusinessSnapshot:
+    """Snapshot a loaded Business row into the cache and return the snapshot."""
+    snapshot = BusinessSnapshot.from_business(business)
+    _business_cache.set(snapshot.id, snapshot)
+    return snapshot
+
+
+def invalidate_business(business_id: UUID) -> None:
+    """Drop business_id from the cache (call after committing a change to its cached columns)."""
+    _business_cache.pop(business_id)
+
+
+def clear_business_cache() -> None:
+    """Empty the cache (tests)."""
+    _business_cache.clear()
+
+
+def load_business(db: Session, business_id: UUID) -> BusinessSnapshot | None:
+    """Return the business snapshot from cache, loading and caching the row on a miss; None if not found."""
+    snapshot = get_cached_business(business_id)
+    if snapshot is not None:
+        return snapshot
+    business = db.scalars(
+        select(Business).where(Business.id == business_id).options(BUSINESS_SNAPSHOT_COLUMNS, raiseload("*"))
+    ).first()
+    return cache_business(business) if business is not None else None
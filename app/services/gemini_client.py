@@ -4,22 +4,75 @@ Primary key (GEMINI_API_KEY) is used for ai_context and ai_notes generation.
 GEMINI_API_KEY2 is used only for the conversational chat endpoint.
 """
 
+import asyncio
+import functools
+import hashlib
 import logging
+import random
 import re
+import threading
+import time
+import weakref
+from contextlib import aclosing
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import AsyncIterator, Awaitable, Callable, Iterator, NamedTuple, Optional, TypeVar
 
+import httpx
 from google import genai
 from google.genai import errors as genai_errors
 
 from app.core.config import settings
+from app.services._breaker import CircuitBreaker
+from app.services._rate_limit import TokenBucket
+from app.services._ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
-# Cooldown after 429 RESOURCE_EXHAUSTED; skip all Gemini calls until this time
-_quota_cooldown_until: Optional[datetime] = None
-# Separate cooldown for chat (GEMINI_API_KEY2) so key1 and key2 do not block each other
-_quota_cooldown_until_chat: Optional[datetime] = None
+# RetryInfo.retryDelay, e.g. "34s" or "60.123s"
+_RETRY_DELAY_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*s")
+
+# Circuit breaker per API key: opens on 429 (for the backoff window below) or after repeated
+# timeouts / 5xx, then admits one probe. Separate for chat (GEMINI_API_KEY2) so key1 and key2
+# do not block each other.
+_breaker = CircuitBreaker("gemini")
+_breaker_chat = CircuitBreaker("gemini_chat")
+# Consecutive 429s per key label; the cooldown doubles with each one and resets on success
+_consec_429: dict[str, int] = {}
+
+# Retry policy per failure class: transient 5xx back off and retry, a dropped connection is
+# retried once right away, and 429 / other 4xx are never retried here (429 goes to the breaker).
+RETRYABLE_SERVER_CODES = frozenset({500, 502, 503, 504})
+SERVER_RETRY_BASE_SECONDS = 0.25
+NETWORK_RETRY_DELAY_SECONDS = 0.1
+MAX_RETRIES = 2
+
+_T = TypeVar("_T")
+
+# Client-side pacing per API key, so bursts are spread out before Gemini answers 429
+_bucket = TokenBucket("gemini", settings.gemini_rpm_primary)
+_bucket_chat = TokenBucket("gemini_chat", settings.gemini_rpm_chat)
+
+# Server-side context caches for fixed system prompts, keyed by system instruction.
+# Value is (cached_content name, or None if creation failed, and when to re-check).
+# Guarded by a lock: insights jobs call in from several worker threads at once.
+_system_cache_handles: dict[str, tuple[Optional[str], datetime]] = {}
+_system_cache_lock = threading.Lock()
+SYSTEM_CACHE_TTL_SECONDS = 3600
+# Gemini rejects context caches below a minimum token count (1024 on Flash models); shorter
+# system instructions are sent inline without trying. ~4 characters per token.
+SYSTEM_CACHE_MIN_TOKENS = 1024
+SYSTEM_CACHE_MIN_CHARS = SYSTEM_CACHE_MIN_TOKENS * 4
+
+# Single-flight for async calls: concurrent identical (model, system, prompt) requests share
+# one in-flight Gemini call, and completed replies are reused briefly.
+_inflight: "dict[bytes, _SharedCall]" = {}
+RECENT_RESULTS_MAXSIZE = 512
+RECENT_RESULTS_TTL_SECONDS = 300
+_recent_results = TTLCache(RECENT_RESULTS_MAXSIZE, RECENT_RESULTS_TTL_SECONDS)
+
+# Per-event-loop cap on concurrent async Gemini calls; bursts queue here instead of fanning
+# out into 429s. Keyed weakly by loop since asyncio primitives are loop-bound.
+_call_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
 
 # System instruction for PickRight AI (original, used by /ai/hello)
 SYSTEM_INSTRUCTION = "You are PickRight, helpful and concise. Return markdown."
@@ -68,47 +121,352 @@ def _extract_retry_delay_seconds(exc: BaseException) -> Optional[int]:
             delay_str = item.get("retryDelay")
             if delay_str is None:
                 continue
-            # Format is often "34s" or "60.123s"
-            match = re.match(r"^(\d+(?:\.\d+)?)\s*s", str(delay_str).strip())
+            match = _RETRY_DELAY_RE.match(str(delay_str).strip())
             if match:
                 return int(float(match.group(1)))
     return None
 
 
-def _should_skip_due_to_quota() -> bool:
-    """True if we are still in the quota cooldown window."""
-    global _quota_cooldown_until
-    if _quota_cooldown_until is None:
+def _backoff_seconds(retry_sec: Optional[int], consecutive: int) -> float:
+    """
+    Exponential backoff with ±25% jitter: base * 2**consecutive, capped.
+
+    base is gemini_quota_cooldown_seconds; the server's retryDelay, when present, is a floor.
+    """
+    backoff = min(
+        settings.gemini_quota_cooldown_seconds * (2 ** consecutive),
+        settings.gemini_quota_cooldown_cap_seconds,
+    )
+    return max(retry_sec or 0, backoff * random.uniform(0.75, 1.25))
+
+
+def _retry_delay(exc: Exception, attempt: int, max_retries: int) -> Optional[float]:
+    """Seconds to wait before retrying after exc on this (0-based) attempt, or None to re-raise."""
+    if attempt >= max_retries:
+        return None
+    if isinstance(exc, genai_errors.ServerError) and exc.code in RETRYABLE_SERVER_CODES:
+        return SERVER_RETRY_BASE_SECONDS * (2 ** attempt)
+    if isinstance(exc, (httpx.RequestError, ConnectionError)) and attempt == 0:
+        return NETWORK_RETRY_DELAY_SECONDS
+    return None
+
+
+def _call_with_policy(fn: Callable[..., _T], **kwargs) -> _T:
+    """Run fn(**kwargs) (one SDK call), retrying transient 5xx and network errors; everything else propagates."""
+    attempt = 0
+    while True:
+        try:
+            return fn(**kwargs)
+        except Exception as e:
+            delay = _retry_delay(e, attempt, MAX_RETRIES)
+            if delay is None:
+                raise
+            logger.info("Gemini call failed (%s); retry %s in %.2f s", e, attempt + 1, delay)
+            time.sleep(delay)
+            attempt += 1
+
+
+async def _call_with_policy_async(fn: Callable[..., Awaitable[_T]], **kwargs) -> _T:
+    """Async _call_with_policy; callers bound the whole sequence with their timeout."""
+    attempt = 0
+    while True:
+        try:
+            return await fn(**kwargs)
+        except Exception as e:
+            delay = _retry_delay(e, attempt, MAX_RETRIES)
+            if delay is None:
+                raise
+            logger.info("Gemini call failed (%s); retry %s in %.2f s", e, attempt + 1, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+def _paced(bucket: TokenBucket) -> bool:
+    """Block until bucket grants a request slot; False if that would take longer than gemini_max_block_s."""
+    wait = bucket.reserve(settings.gemini_max_block_s)
+    if wait is None:
+        logger.info("Skipping Gemini call; local rate limit for %s", bucket.name)
         return False
-    if datetime.now(timezone.utc) >= _quota_cooldown_until:
-        _quota_cooldown_until = None
+    if wait:
+        time.sleep(wait)
+    return True
+
+
+async def _paced_async(bucket: TokenBucket, deadline: Optional[float] = None) -> bool:
+    """Async _paced; the wait is also bounded by the caller's deadline."""
+    max_wait = settings.gemini_max_block_s
+    if deadline is not None:
+        max_wait = min(max_wait, deadline - time.monotonic())
+    wait = bucket.reserve(max_wait)
+    if wait is None:
+        logger.info("Skipping Gemini call; local rate limit for %s", bucket.name)
         return False
+    if wait:
+        await asyncio.sleep(wait)
     return True
 
 
+@functools.lru_cache(maxsize=2)
+def _client_for_key(api_key: str) -> genai.Client:
+    """One long-lived client per API key, so its HTTP connection pool is reused across calls."""
+    return genai.Client(api_key=api_key)
+
+
 def _get_client() -> genai.Client:
     """Get Gemini client (GEMINI_API_KEY), raising error if API key not configured."""
     if not settings.gemini_api_key:
         raise ValueError("GEMINI_API_KEY missing")
-    return genai.Client(api_key=settings.gemini_api_key)
-
-
-def _should_skip_due_to_quota_chat() -> bool:
-    """True if we are still in the chat quota cooldown window (GEMINI_API_KEY2)."""
-    global _quota_cooldown_until_chat
-    if _quota_cooldown_until_chat is None:
-        return False
-    if datetime.now(timezone.utc) >= _quota_cooldown_until_chat:
-        _quota_cooldown_until_chat = None
-        return False
-    return True
+    return _client_for_key(settings.gemini_api_key)
 
 
 def _get_client_chat() -> genai.Client:
     """Get Gemini client for chat (GEMINI_API_KEY2), raising error if API key not configured."""
     if not settings.gemini_api_key2:
         raise ValueError("GEMINI_API_KEY2 missing")
-    return genai.Client(api_key=settings.gemini_api_key2)
+    return _client_for_key(settings.gemini_api_key2)
+
+
+@functools.lru_cache(maxsize=32)
+def _config_for(system_instruction: str) -> genai.types.GenerateContentConfig:
+    """Shared request config per system instruction; the SDK only reads it, so one instance serves every call."""
+    return genai.types.GenerateContentConfig(system_instruction=system_instruction)
+
+
+@functools.lru_cache(maxsize=8)
+def _search_config_for(system_instruction: str) -> genai.types.GenerateContentConfig:
+    """_config_for plus the Google Search grounding tool (business chat)."""
+    return genai.types.GenerateContentConfig(
+        system_instruction=system_instruction,
+        tools=[genai.types.Tool(google_search=genai.types.GoogleSearch())],
+    )
+
+
+class _KeyState(NamedTuple):
+    """Everything that differs between calls on GEMINI_API_KEY and GEMINI_API_KEY2."""
+
+    label: str
+    get_client: Callable[[], genai.Client]
+    breaker: CircuitBreaker
+    bucket: TokenBucket
+
+
+def _primary() -> _KeyState:
+    """GEMINI_API_KEY state. Module globals are read per call, so they can be swapped (e.g. in tests)."""
+    return _KeyState("Gemini", _get_client, _breaker, _bucket)
+
+
+def _chat() -> _KeyState:
+    """GEMINI_API_KEY2 (chat) state."""
+    return _KeyState("Gemini chat", _get_client_chat, _breaker_chat, _bucket_chat)
+
+
+def _record_success(key: _KeyState) -> None:
+    """A call on key succeeded: close its breaker; the next 429 starts from the base cooldown."""
+    _consec_429[key.label] = 0
+    key.breaker.record_success()
+
+
+def _next_quota_cooldown_seconds(key: _KeyState, retry_sec: Optional[int]) -> float:
+    """Cooldown for this 429 on key; bumps its consecutive-429 count."""
+    consecutive = _consec_429.get(key.label, 0)
+    _consec_429[key.label] = consecutive + 1
+    return _backoff_seconds(retry_sec, consecutive)
+
+
+def _trip_on_quota_error(e: genai_errors.ClientError, key: _KeyState) -> bool:
+    """If e is a 429, open key's breaker for the backoff window and return True."""
+    if not _is_quota_error(e):
+        return False
+    retry_sec = _extract_retry_delay_seconds(e)
+    cooldown_sec = _next_quota_cooldown_seconds(key, retry_sec)
+    key.breaker.trip(cooldown_sec)
+    logger.warning(
+        "%s quota exceeded (429 RESOURCE_EXHAUSTED); model=%s cooldown=%.0f s retryDelay=%s",
+        key.label,
+        settings.gemini_model,
+        cooldown_sec,
+        retry_sec,
+    )
+    return True
+
+
+def _generate(
+    prompt: str,
+    config: genai.types.GenerateContentConfig,
+    key: _KeyState,
+) -> Optional[str]:
+    """One sync Gemini call on key, with breaker, pacing, retry policy and 429 handling."""
+    if not key.breaker.allow():
+        logger.debug("Skipping %s call; circuit open (quota cooldown or repeated failures)", key.label)
+        return None
+    if not _paced(key.bucket):
+        key.breaker.release_probe()
+        return None
+
+    try:
+        client = key.get_client()
+        model = settings.gemini_model
+
+        log_info = logger.isEnabledFor(logging.INFO)
+        if log_info:
+            logger.info("Calling %s model=%s, prompt_length=%s", key.label, model, len(prompt))
+
+        response = _call_with_policy(client.models.generate_content, model=model, contents=prompt, config=config)
+
+        result = response.text
+        if log_info:
+            logger.info("%s response_length=%s", key.label, len(result) if result else 0)
+        _record_success(key)
+        return result
+
+    except genai_errors.ClientError as e:
+        if _trip_on_quota_error(e, key):
+            return None
+        key.breaker.release_probe()
+        raise
+    except genai_errors.ServerError:
+        key.breaker.record_failure()
+        raise
+
+
+def _stream(
+    prompt: str,
+    config: genai.types.GenerateContentConfig,
+    key: _KeyState,
+    *,
+    cached_system: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    One sync streamed Gemini call on key, with breaker, pacing and 429 handling.
+
+    With cached_system, the call goes through a server-side cache of that system instruction
+    when one is available; if there is none, config (inline) is used, and a rejected handle
+    is dropped and retried inline before the first chunk. The caller may stop iterating
+    early; closing the generator ends the HTTP stream.
+    """
+    if not key.breaker.allow():
+        logger.debug("Skipping %s stream; circuit open (quota cooldown or repeated failures)", key.label)
+        return
+    if not _paced(key.bucket):
+        key.breaker.release_probe()
+        return
+
+    yielded = False
+    try:
+        client = key.get_client()
+        model = settings.gemini_model
+        cached_config = _cached_system_config(client, model, cached_system) if cached_system is not None else None
+
+        logger.info(
+            "Streaming %s model=%s (cached system=%s), prompt_length=%s",
+            key.label,
+            model,
+            cached_config is not None,
+            len(prompt),
+        )
+
+        try:
+            for chunk in client.models.generate_content_stream(
+                model=model,
+                contents=prompt,
+                config=config if cached_config is None else cached_config,
+            ):
+                if chunk.text:
+                    if not yielded:
+                        _record_success(key)
+                    yielded = True
+                    yield chunk.text
+        except genai_errors.ClientError as e:
+            if _is_quota_error(e) or cached_config is None or yielded:
+                raise
+            _drop_cached_system(cached_system, e)
+            for chunk in client.models.generate_content_stream(model=model, contents=prompt, config=config):
+                if chunk.text:
+                    if not yielded:
+                        _record_success(key)
+                    yielded = True
+                    yield chunk.text
+
+    except genai_errors.ClientError as e:
+        if _trip_on_quota_error(e, key):
+            return
+        key.breaker.release_probe()
+        raise
+    except genai_errors.ServerError:
+        key.breaker.record_failure()
+        raise
+
+
+async def _generate_async(
+    prompt: str,
+    config: genai.types.GenerateContentConfig,
+    key: _KeyState,
+    deadline: Optional[float] = None,
+) -> Optional[str]:
+    """One async Gemini call on key, with timeout, deadline, breaker, pacing, retries and 429 handling."""
+    if not key.breaker.allow():
+        logger.debug("Skipping %s call; circuit open (quota cooldown or repeated failures)", key.label)
+        return None
+    if not await _paced_async(key.bucket, deadline):
+        key.breaker.release_probe()
+        return None
+
+    try:
+        client = key.get_client()
+        model = settings.gemini_model
+
+        log_info = logger.isEnabledFor(logging.INFO)
+        if log_info:
+            logger.info("Calling %s (async) model=%s, prompt_length=%s", key.label, model, len(prompt))
+
+        async with _call_slot():
+            # Checked after queueing for a slot: the caller may have given up meanwhile
+            timeout = _call_timeout(deadline)
+            if timeout is None:
+                logger.info("Skipping %s call; caller deadline already passed", key.label)
+                key.breaker.release_probe()
+                return None
+            response = await asyncio.wait_for(
+                _call_with_policy_async(
+                    client.aio.models.generate_content,
+                    model=model,
+                    contents=prompt,
+                    config=config,
+                ),
+                timeout=timeout,
+            )
+
+        result = response.text
+        if log_info:
+            logger.info("%s response_length=%s", key.label, len(result) if result else 0)
+        _record_success(key)
+        return result
+
+    except asyncio.CancelledError:
+        # Every caller went away; says nothing about Gemini
+        key.breaker.release_probe()
+        raise
+    except asyncio.TimeoutError:
+        # Only a full-length timeout says something about Gemini; a short caller deadline does not
+        if timeout >= settings.gemini_request_timeout_s:
+            key.breaker.record_failure()
+        else:
+            key.breaker.release_probe()
+        logger.warning(
+            "%s call timed out after %s s; model=%s",
+            key.label,
+            timeout,
+            settings.gemini_model,
+        )
+        return None
+    except genai_errors.ClientError as e:
+        if _trip_on_quota_error(e, key):
+            return None
+        key.breaker.release_probe()
+        raise
+    except genai_errors.ServerError:
+        key.breaker.record_failure()
+        raise
 
 
 def generate_text(prompt: str) -> Optional[str]:
@@ -128,8 +486,9 @@ def generate_text_with_system(prompt: str, system_instruction: str) -> Optional[
     """
     Generate text using Gemini model with custom system instruction.
 
-    On 429 RESOURCE_EXHAUSTED, sets a module-level cooldown and returns None.
-    During cooldown, skips the SDK call and returns None.
+    On 429 RESOURCE_EXHAUSTED, opens the circuit breaker for the backoff window and returns
+    None; timeouts and 5xx count toward opening it. While open, skips the SDK call and
+    returns None.
 
     Args:
         prompt: The user prompt to send to the model.
@@ -139,47 +498,83 @@ def generate_text_with_system(prompt: str, system_instruction: str) -> Optional[
         The generated text response, or None on quota exceeded, during cooldown,
         or if the API returns empty.
     """
-    global _quota_cooldown_until
+    return _generate(prompt, _config_for(system_instruction), _primary())
 
-    if _should_skip_due_to_quota():
-        logger.debug(
-            "Skipping Gemini call due to recent quota exceeded; still in cooldown"
+
+def _get_cached_system_handle(client: genai.Client, model: str, system_instruction: str) -> Optional[str]:
+    """
+    Return a Gemini cached_content name holding system_instruction, creating it on first use.
+
+    Instructions shorter than SYSTEM_CACHE_MIN_CHARS are never cached. Creation failures are
+    remembered for the same TTL so we do not retry on every call; callers then send the
+    system instruction inline. Concurrent callers share one creation.
+    """
+    if len(system_instruction) < SYSTEM_CACHE_MIN_CHARS:
+        return None
+    with _system_cache_lock:
+        now = datetime.now(timezone.utc)
+        entry = _system_cache_handles.get(system_instruction)
+        if entry is not None and now < entry[1]:
+            return entry[0]
+        try:
+            cached = client.caches.create(
+                model=model,
+                config=genai.types.CreateCachedContentConfig(
+                    system_instruction=system_instruction,
+                    ttl=f"{SYSTEM_CACHE_TTL_SECONDS}s",
+                ),
+            )
+            name = cached.name
+        except Exception as e:
+            logger.info("Gemini context cache unavailable; sending system instruction inline: %s", e)
+            name = None
+        # Re-check a minute before the server-side TTL lapses
+        _system_cache_handles[system_instruction] = (
+            name,
+            now + timedelta(seconds=SYSTEM_CACHE_TTL_SECONDS - 60),
         )
+        return name
+
+
+def _cached_system_config(
+    client: genai.Client,
+    model: str,
+    system_instruction: str,
+) -> Optional[genai.types.GenerateContentConfig]:
+    """Request config pointing at the cached system instruction, or None to send it inline."""
+    cache_name = _get_cached_system_handle(client, model, system_instruction)
+    if cache_name is None:
         return None
+    return genai.types.GenerateContentConfig(cached_content=cache_name)
 
-    try:
-        client = _get_client()
-        model = settings.gemini_model
 
-        logger.info("Calling Gemini model=%s, prompt_length=%s", model, len(prompt))
+def _drop_cached_system(system_instruction: str, exc: Exception) -> None:
+    """Forget a cache handle Gemini rejected (e.g. expired) so the next call re-creates it."""
+    logger.info("Gemini cached_content rejected; retrying inline: %s", exc)
+    with _system_cache_lock:
+        _system_cache_handles.pop(system_instruction, None)
 
-        response = client.models.generate_content(
-            model=model,
-            contents=prompt,
-            config=genai.types.GenerateContentConfig(
-                system_instruction=system_instruction,
-            ),
-        )
 
-        result = response.text
-        logger.info(
-            "Gemini response_length=%s",
-            len(result) if result else 0,
-        )
-        return result
+def stream_text_with_cached_system(prompt: str, system_instruction: str) -> Iterator[str]:
+    """
+    Stream text chunks from Gemini, reusing a server-side cache of the system instruction.
 
-    except genai_errors.ClientError as e:
-        if _is_quota_error(e):
-            retry_sec = _extract_retry_delay_seconds(e)
-            cooldown_sec = retry_sec if retry_sec is not None else settings.gemini_quota_cooldown_seconds
-            _quota_cooldown_until = datetime.now(timezone.utc) + timedelta(seconds=cooldown_sec)
-            logger.warning(
-                "Gemini quota exceeded (429 RESOURCE_EXHAUSTED); cooldown %s s. retryDelay=%s",
-                cooldown_sec,
-                retry_sec,
-            )
-            return None
-        raise
+    Intended for long system prompts that are identical across calls. No handle means the
+    system instruction is sent inline, and a rejected handle before the first chunk is dropped
+    and the stream retried inline. The caller may stop iterating early; closing the generator
+    ends the HTTP stream.
+
+    On 429 RESOURCE_EXHAUSTED, opens the circuit breaker and stops. While open, yields
+    nothing without calling the SDK.
+
+    Args:
+        prompt: The user prompt to send to the model.
+        system_instruction: Fixed system instruction for the model.
+
+    Yields:
+        Non-empty text chunks in arrival order.
+    """
+    yield from _stream(prompt, _config_for(system_instruction), _primary(), cached_system=system_instruction)
 
 
 def generate_text_with_system_chat(prompt: str, system_instruction: str) -> Optional[str]:
@@ -187,8 +582,8 @@ def generate_text_with_system_chat(prompt: str, system_instruction: str) -> Opti
     Generate text using Gemini model (GEMINI_API_KEY2) with custom system instruction.
     Used only for the conversational chat endpoint.
 
-    On 429 RESOURCE_EXHAUSTED, sets the chat cooldown and returns None.
-    During cooldown, skips the SDK call and returns None.
+    On 429 RESOURCE_EXHAUSTED, opens the chat circuit breaker and returns None.
+    While open, skips the SDK call and returns None.
 
     Args:
         prompt: The user prompt (may include conversation history) to send to the model.
@@ -198,52 +593,122 @@ def generate_text_with_system_chat(prompt: str, system_instruction: str) -> Opti
         The generated text response, or None on quota exceeded, during cooldown,
         or if the API returns empty.
     """
-    global _quota_cooldown_until_chat
+    return _generate(prompt, _config_for(system_instruction), _chat())
 
-    if _should_skip_due_to_quota_chat():
-        logger.debug(
-            "Skipping Gemini chat call due to recent quota exceeded; still in cooldown"
-        )
+
+def _prompt_key(model: str, system_instruction: str, prompt: str) -> bytes:
+    """Compact digest identifying one Gemini request."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (model, system_instruction, prompt):
+        h.update(part.encode())
+        h.update(b"\0")
+    return h.digest()
+
+
+def _call_slot() -> asyncio.Semaphore:
+    """Semaphore bounding in-flight async Gemini calls on the running loop."""
+    loop = asyncio.get_running_loop()
+    slot = _call_slots.get(loop)
+    if slot is None:
+        slot = asyncio.Semaphore(settings.gemini_max_concurrent_requests)
+        _call_slots[loop] = slot
+    return slot
+
+
+def _call_timeout(deadline: Optional[float]) -> Optional[float]:
+    """
+    Timeout for one async Gemini call: gemini_request_timeout_s, shortened to the caller's
+    remaining time (time.monotonic() deadline). None if the deadline has already passed.
+    """
+    if deadline is None:
+        return settings.gemini_request_timeout_s
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
         return None
+    return min(settings.gemini_request_timeout_s, max(0.1, remaining))
 
-    try:
-        client = _get_client_chat()
-        model = settings.gemini_model
 
-        logger.info(
-            "Calling Gemini chat model=%s, prompt_length=%s",
-            model,
-            len(prompt),
-        )
+class _SharedCall:
+    """One in-flight async Gemini call and the number of callers still waiting on it."""
 
-        response = client.models.generate_content(
-            model=model,
-            contents=prompt,
-            config=genai.types.GenerateContentConfig(
-                system_instruction=system_instruction,
-            ),
-        )
+    __slots__ = ("task", "waiters")
 
-        result = response.text
-        logger.info(
-            "Gemini chat response_length=%s",
-            len(result) if result else 0,
-        )
-        return result
+    def __init__(self, task: "asyncio.Task[Optional[str]]") -> None:
+        self.task = task
+        self.waiters = 0
 
-    except genai_errors.ClientError as e:
-        if _is_quota_error(e):
-            retry_sec = _extract_retry_delay_seconds(e)
-            cooldown_sec = retry_sec if retry_sec is not None else settings.gemini_quota_cooldown_seconds
-            _quota_cooldown_until_chat = datetime.now(timezone.utc) + timedelta(seconds=cooldown_sec)
-            logger.warning(
-                "Gemini chat quota exceeded (429 RESOURCE_EXHAUSTED); model=%s cooldown=%s s retryDelay=%s",
-                settings.gemini_model,
-                cooldown_sec,
-                retry_sec,
-            )
-            return None
-        raise
+
+async def _generate_shared(prompt: str, system_instruction: str, key: bytes) -> Optional[str]:
+    """The call behind a _SharedCall: no per-caller deadline, bounded by gemini_request_timeout_s."""
+    result = await _generate_async(prompt, _config_for(system_instruction), _primary())
+    if result:
+        _recent_results.set(key, result)
+    return result
+
+
+def _shared_call_done(key: bytes, shared: _SharedCall, task: asyncio.Task) -> None:
+    if _inflight.get(key) is shared:
+        del _inflight[key]
+    if not task.cancelled():
+        task.exception()  # mark retrieved when every caller has already left
+
+
+async def generate_text_with_system_async(
+    prompt: str,
+    system_instruction: str,
+    *,
+    deadline: Optional[float] = None,
+) -> Optional[str]:
+    """
+    Async generate_text_with_system for request handlers running on the event loop.
+
+    Awaits the SDK's async client instead of blocking the loop, and bounds the call by
+    settings.gemini_request_timeout_s. Same 429 cooldown semantics as the sync version.
+    Identical concurrent requests are coalesced into one Gemini call, and a non-empty
+    reply is reused for RECENT_RESULTS_TTL_SECONDS. The shared call does not inherit any
+    caller's deadline: each caller stops waiting at its own, and the call is cancelled
+    only once every caller has left.
+
+    Args:
+        prompt: The user prompt to send to the model.
+        system_instruction: Custom system instruction for the model.
+        deadline: Optional time.monotonic() value after which the caller no longer wants
+            the reply; the call is skipped once it has passed and None is returned at it.
+
+    Returns:
+        The generated text response, or None on quota exceeded, during cooldown,
+        on timeout or expired deadline, or if the API returns empty.
+    """
+    key = _prompt_key(settings.gemini_model, system_instruction, prompt)
+    cached = _recent_results.get(key)
+    if cached is not None:
+        logger.debug("Reusing recent Gemini reply for identical request")
+        return cached
+
+    if deadline is not None and time.monotonic() >= deadline:
+        logger.info("Skipping Gemini call; caller deadline already passed")
+        return None
+
+    shared = _inflight.get(key)
+    if shared is None:
+        shared = _SharedCall(asyncio.create_task(_generate_shared(prompt, system_instruction, key)))
+        _inflight[key] = shared
+        shared.task.add_done_callback(functools.partial(_shared_call_done, key, shared))
+    else:
+        logger.debug("Joining in-flight Gemini call for identical request")
+
+    # Each caller waits only up to its own deadline; the shared call runs until every caller has left
+    shared.waiters += 1
+    try:
+        wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+        return await asyncio.wait_for(asyncio.shield(shared.task), timeout=wait)
+    except asyncio.TimeoutError:
+        logger.info("Gave up waiting for Gemini reply; caller deadline passed")
+        return None
+    finally:
+        shared.waiters -= 1
+        if shared.waiters == 0 and not shared.task.done():
+            shared.task.cancel()
 
 
 def generate_business_chat_with_search(
@@ -254,7 +719,7 @@ def generate_business_chat_with_search(
     Generate a chat response using Gemini with Google Search grounding as fallback.
     Used for the business chat endpoint when the answer may not be in local context.
 
-    Uses GEMINI_API_KEY2. On 429, sets chat cooldown and returns None.
+    Uses GEMINI_API_KEY2. On 429, opens the chat circuit breaker and returns None.
     The model can use google_search tool when the provided context doesn't contain
     the answer; it returns final text after any internal tool use.
 
@@ -266,58 +731,135 @@ def generate_business_chat_with_search(
     Returns:
         The generated text response, or None on quota exceeded / cooldown.
     """
-    global _quota_cooldown_until_chat
-
-    if _should_skip_due_to_quota_chat():
-        logger.debug(
-            "Skipping Gemini business chat (search) due to recent quota exceeded; still in cooldown"
-        )
-        return None
-
-    if not messages:
-        return None
-
-    # Extract user content: we expect a single user message with context + history + question
+    # We expect a single user message with context + history + question
     user_content = messages[0].get("content", "") if messages else ""
     if not user_content:
         return None
+    return _generate(user_content, _search_config_for(system_prompt), _chat())
 
+
+async def _stream_async(
+    prompt: str,
+    config: genai.types.GenerateContentConfig,
+    key: _KeyState,
+    deadline: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """
+    One streamed Gemini call on key, with deadline, breaker, pacing and 429 handling.
+
+    The first chunk must arrive before the caller's deadline (and within
+    gemini_request_timeout_s); after that each chunk gets gemini_request_timeout_s. Streams
+    are not retried, since part of the reply may already have been sent.
+    """
+    if not key.breaker.allow():
+        logger.debug("Skipping %s stream; circuit open (quota cooldown or repeated failures)", key.label)
+        return
+    if not await _paced_async(key.bucket, deadline):
+        key.breaker.release_probe()
+        return
+
+    yielded = False
     try:
-        client = _get_client_chat()
+        client = key.get_client()
         model = settings.gemini_model
-        grounding_tool = genai.types.Tool(google_search=genai.types.GoogleSearch())
 
-        logger.info(
-            "Calling Gemini business chat (search) model=%s, prompt_length=%s",
-            model,
-            len(user_content),
-        )
+        logger.info("Streaming %s model=%s, prompt_length=%s", key.label, model, len(prompt))
 
-        response = client.models.generate_content(
-            model=model,
-            contents=user_content,
-            config=genai.types.GenerateContentConfig(
-                system_instruction=system_prompt,
-                tools=[grounding_tool],
-            ),
-        )
-
-        result = response.text
-        logger.info(
-            "Gemini business chat (search) response_length=%s",
-            len(result) if result else 0,
+        async with _call_slot():
+            stream = await client.aio.models.generate_content_stream(
+                model=model,
+                contents=prompt,
+                config=config,
+            )
+            try:
+                while True:
+                    timeout = settings.gemini_request_timeout_s if yielded else _call_timeout(deadline)
+                    if timeout is None:
+                        logger.info("Skipping %s stream; caller deadline already passed", key.label)
+                        key.breaker.release_probe()
+                        return
+                    try:
+                        chunk = await asyncio.wait_for(stream.__anext__(), timeout=timeout)
+                    except StopAsyncIteration:
+                        break
+                    if chunk.text:
+                        if not yielded:
+                            _record_success(key)
+                        yielded = True
+                        yield chunk.text
+            finally:
+                await stream.aclose()
+
+    except asyncio.TimeoutError:
+        if not yielded and timeout >= settings.gemini_request_timeout_s:
+            key.breaker.record_failure()
+        elif not yielded:
+            key.breaker.release_probe()
+        logger.warning(
+            "%s stream timed out after %s s (mid-reply=%s); model=%s",
+            key.label,
+            timeout,
+            yielded,
+            settings.gemini_model,
         )
-        return result
-
     except genai_errors.ClientError as e:
-        if _is_quota_error(e):
-            retry_sec = _extract_retry_delay_seconds(e)
-            cooldown_sec = retry_sec if retry_sec is not None else settings.gemini_quota_cooldown_seconds
-            _quota_cooldown_until_chat = datetime.now(timezone.utc) + timedelta(seconds=cooldown_sec)
-            logger.warning(
-                "Gemini business chat (search) quota exceeded; model=%s cooldown=%s s",
-                settings.gemini_model,
-                cooldown_sec,
-            )
-            return None
+        if _trip_on_quota_error(e, key):
+            return
+        key.breaker.release_probe()
+        raise
+    except genai_errors.ServerError:
+        key.breaker.record_failure()
         raise
+
+
+async def stream_text_with_system_async(
+    prompt: str,
+    system_instruction: str,
+    *,
+    deadline: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """
+    Streaming generate_text_with_system_async (GEMINI_API_KEY): yields text as Gemini
+    produces it. Same breaker, pacing and 429 handling; streamed replies are neither
+    coalesced with identical requests nor cached.
+
+    Args:
+        prompt: The user prompt to send to the model.
+        system_instruction: Custom system instruction for the model.
+        deadline: Optional time.monotonic() value after which the caller no longer wants a reply.
+
+    Yields:
+        Non-empty text chunks in arrival order; nothing on quota exceeded, cooldown or timeout.
+    """
+    async with aclosing(_stream_async(prompt, _config_for(system_instruction), _primary(), deadline)) as chunks:
+        async for text in chunks:
+            yield text
+
+
+async def stream_business_chat_with_search_async(
+    system_prompt: str,
+    messages: list[dict],
+    *,
+    deadline: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """
+    Streaming generate_business_chat_with_search: yields text as Gemini produces it, so the
+    first words reach the user after prefill instead of after the whole reply.
+
+    Same key (GEMINI_API_KEY2), Google Search grounding, breaker, pacing and 429 handling.
+    See _stream_async for the deadline and timeout rules.
+
+    Args:
+        system_prompt: System instruction for the model.
+        messages: Same shape as generate_business_chat_with_search.
+        deadline: Optional time.monotonic() value after which the caller no longer wants a reply.
+
+    Yields:
+        Non-empty text chunks in arrival order; nothing on quota exceeded, cooldown or timeout.
+    """
+    user_content = messages[0].get("content", "") if messages else ""
+    if not user_content:
+        return
+    async with aclosing(_stream_async(user_content, _search_config_for(system_prompt), _chat(), deadline)) as chunks:
+        async for text in chunks:
+            yield text
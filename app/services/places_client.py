@@ -1,25 +1,74 @@
 """Google Places API client service for AI grounding."""
 
+import asyncio
+import copy
+import functools
 import logging
 import re
 import traceback
 
 import httpx
+import orjson
 
 from app.core.config import settings
+from app.services._ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
 GOOGLE_PLACES_BASE = "https://maps.googleapis.com/maps/api/place"
+# Places API (New) Text Search; the field mask lets one call return hours as well
+GOOGLE_PLACES_SEARCH_TEXT_URL = "https://places.googleapis.com/v1/places:searchText"
+PLACE_WITH_HOURS_FIELD_MASK = (
+    "places.id,places.displayName,places.formattedAddress,"
+    "places.currentOpeningHours.weekdayDescriptions"
+)
 REQUEST_TIMEOUT = 10.0
 
 # Same default radius as GET /api/v1/places/nearby (Query default 1500)
 DEFAULT_NEARBY_RADIUS_M = 1500
 
+_API_KEY_RE = re.compile(r'key=[^&]+')
+
+# Shared keep-alive client for all Google Places calls (this module and the places router),
+# so back-to-back hops reuse the TLS connection. httpx clients are bound to the event loop
+# that first used them, so a new one is created if the running loop changes.
+_http_client: httpx.AsyncClient | None = None
+_http_client_loop: asyncio.AbstractEventLoop | None = None
+
+# find_place_with_hours results keyed by normalized (query, location_hint). Opening hours
+# rarely change within a day, so repeat grounding lookups skip Google entirely. Concurrent
+# misses for the same key share one in-flight lookup.
+PLACE_HOURS_CACHE_MAXSIZE = 2048
+PLACE_HOURS_CACHE_TTL_SECONDS = 6 * 3600
+_place_hours_cache = TTLCache(PLACE_HOURS_CACHE_MAXSIZE, PLACE_HOURS_CACHE_TTL_SECONDS)
+_place_hours_inflight: "dict[tuple[str, str], asyncio.Task[dict | None]]" = {}
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient for Google Places, creating it on first use in this loop."""
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=2.0),
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared AsyncClient (app shutdown)."""
+    global _http_client, _http_client_loop
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+    _http_client_loop = None
+
 
 def _redact_api_key(url: str) -> str:
     """Remove API key from URL for safe logging."""
-    return re.sub(r'key=[^&]+', 'key=REDACTED', str(url))
+    return _API_KEY_RE.sub('key=REDACTED', str(url))
 
 
 def _get_api_key() -> str:
@@ -29,24 +78,49 @@ def _get_api_key() -> str:
     return settings.google_maps_api_key
 
 
+def _body_preview(response: httpx.Response) -> str:
+    """First 500 characters of the response body, for logs and error messages."""
+    response_text = response.text
+    return response_text[:500] if response_text else "(empty)"
+
+
 async def _call_google_api(url: str, params: dict) -> dict:
     """Call Google Places API with logging. Returns parsed JSON or raises."""
-    full_url = httpx.URL(url, params=params)
-    safe_url = _redact_api_key(str(full_url))
+    # URL building, redaction and body decoding are only paid for when INFO is enabled
+    log_info = logger.isEnabledFor(logging.INFO)
+    if log_info:
+        logger.info("Places service calling: %s", _redact_api_key(str(httpx.URL(url, params=params))))
+    
+    response = await get_http_client().get(url, params=params)
+    
+    if log_info:
+        logger.info("Places response: status=%s, body_preview=%s", response.status_code, _body_preview(response))
     
-    logger.info(f"Places service calling: {safe_url}")
+    if response.status_code != 200:
+        raise Exception(f"Google API HTTP {response.status_code}: {_body_preview(response)}")
     
-    async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-        response = await client.get(url, params=params)
-        response_text = response.text
-        truncated_body = response_text[:500] if response_text else "(empty)"
-        
-        logger.info(f"Places response: status={response.status_code}, body_preview={truncated_body}")
-        
-        if response.status_code != 200:
-            raise Exception(f"Google API HTTP {response.status_code}: {truncated_body}")
-        
-        return response.json()
+    return orjson.loads(response.content)
+
+
+async def _post_google_api(url: str, body: dict, field_mask: str) -> dict:
+    """POST to a Places API (New) endpoint with the given field mask. Returns parsed JSON or raises."""
+    log_info = logger.isEnabledFor(logging.INFO)
+    if log_info:
+        logger.info("Places service calling: POST %s fields=%s", url, field_mask)
+
+    headers = {
+        "X-Goog-Api-Key": _get_api_key(),
+        "X-Goog-FieldMask": field_mask,
+    }
+    response = await get_http_client().post(url, json=body, headers=headers)
+
+    if log_info:
+        logger.info("Places response: status=%s, body_preview=%s", response.status_code, _body_preview(response))
+
+    if response.status_code != 200:
+        raise Exception(f"Google API HTTP {response.status_code}: {_body_preview(response)}")
+
+    return orjson.loads(response.content)
 
 
 async def search_places_text(
@@ -91,131 +165,87 @@ async def search_places_text(
         return []
 
 
-async def text_search(query: str, location_hint: str | None = None) -> dict | None:
+async def find_place_with_hours(query: str, location_hint: str | None = None) -> dict | None:
     """
-    Search for a place using Google Places Text Search.
+    Find a place and get its details including hours.
     
-    Args:
-        query: The search query (e.g., "Papa John's Castle Hill")
-        location_hint: Optional location context (e.g., "Bronx, NY")
+    Uses a single Places API (New) searchText call with a field mask that includes
+    the current opening hours, so no separate details request is needed. Found places
+    are cached for PLACE_HOURS_CACHE_TTL_SECONDS; callers get their own copy.
     
     Returns:
-        The top result dict from Google, or None if no results.
+        Dict with: name, formatted_address, opening_hours (weekday_text list), place_id
+        Returns None if place not found.
     """
-    api_key = _get_api_key()
-    
-    # Combine query with location hint for better results
+    _get_api_key()
+
+    key = (query.casefold().strip(), (location_hint or "").casefold().strip())
+    cached = _place_hours_cache.get(key)
+    if cached is not None:
+        logger.debug(f"Place hours cache hit for: {query}")
+        return copy.deepcopy(cached)
+
+    task = _place_hours_inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_lookup_place_with_hours(key, query, location_hint))
+        _place_hours_inflight[key] = task
+        task.add_done_callback(functools.partial(_place_hours_lookup_done, key))
+    # The lookup runs as its own task, so a cancelled caller does not cancel it for the others
+    place = await asyncio.shield(task)
+    return copy.deepcopy(place) if place is not None else None
+
+
+async def _lookup_place_with_hours(
+    key: tuple[str, str], query: str, location_hint: str | None
+) -> dict | None:
+    """The shared lookup behind find_place_with_hours; caches a found place."""
+    place = await _search_place_with_hours(query, location_hint)
+    if place is not None:
+        _place_hours_cache.set(key, place)
+    return place
+
+
+def _place_hours_lookup_done(key: tuple[str, str], task: asyncio.Task) -> None:
+    if _place_hours_inflight.get(key) is task:
+        del _place_hours_inflight[key]
+    if not task.cancelled():
+        task.exception()  # mark retrieved when every caller has already left
+
+
+async def _search_place_with_hours(query: str, location_hint: str | None) -> dict | None:
+    """One uncached searchText lookup for find_place_with_hours."""
     search_query = query
     if location_hint:
         search_query = f"{query} {location_hint}"
-    
-    url = f"{GOOGLE_PLACES_BASE}/textsearch/json"
-    params = {
-        "query": search_query,
-        "key": api_key,
-    }
-    
+
     try:
-        data = await _call_google_api(url, params)
-        
-        status = data.get("status", "UNKNOWN_ERROR")
-        if status == "ZERO_RESULTS":
-            logger.info(f"Text search returned no results for: {search_query}")
-            return None
-        if status != "OK":
-            logger.error(f"Text search error: status={status}, query={search_query}")
-            return None
-        
-        results = data.get("results", [])
-        if not results:
-            return None
-        
-        # Return top result
-        top = results[0]
-        logger.info(f"Text search top result: name={top.get('name')}, place_id={top.get('place_id')}")
-        return top
-        
+        data = await _post_google_api(
+            GOOGLE_PLACES_SEARCH_TEXT_URL,
+            {"textQuery": search_query, "pageSize": 1},
+            PLACE_WITH_HOURS_FIELD_MASK,
+        )
     except Exception as e:
         logger.error(f"Text search failed: {e}\n{traceback.format_exc()}")
         return None
 
-
-async def get_place_details(place_id: str) -> dict | None:
-    """
-    Get place details including opening hours.
-    
-    Args:
-        place_id: Google Place ID
-    
-    Returns:
-        Place details dict with name, formatted_address, opening_hours, etc.
-        Returns None on error.
-    """
-    api_key = _get_api_key()
-    
-    url = f"{GOOGLE_PLACES_BASE}/details/json"
-    params = {
-        "place_id": place_id,
-        "fields": "place_id,name,formatted_address,opening_hours",
-        "key": api_key,
-    }
-    
-    try:
-        data = await _call_google_api(url, params)
-        
-        status = data.get("status", "UNKNOWN_ERROR")
-        if status != "OK":
-            logger.error(f"Place details error: status={status}, place_id={place_id}")
-            return None
-        
-        result = data.get("result")
-        if result:
-            logger.info(f"Place details: name={result.get('name')}, has_hours={bool(result.get('opening_hours'))}")
-        return result
-        
-    except Exception as e:
-        logger.error(f"Place details failed: {e}\n{traceback.format_exc()}")
+    places = data.get("places") or []
+    if not places:
+        logger.info(f"Text search returned no results for: {search_query}")
         return None
 
-
-async def find_place_with_hours(query: str, location_hint: str | None = None) -> dict | None:
-    """
-    Find a place and get its details including hours.
-    
-    Combines text search + details in one call.
-    
-    Returns:
-        Dict with: name, formatted_address, opening_hours (weekday_text list), place_id
-        Returns None if place not found.
-    """
-    # First, search for the place
-    place = await text_search(query, location_hint)
-    if not place:
-        return None
-    
-    place_id = place.get("place_id")
+    place = places[0]
+    place_id = place.get("id")
     if not place_id:
         return None
-    
-    # Get details with hours
-    details = await get_place_details(place_id)
-    if not details:
-        # Return basic info from search if details fail
-        return {
-            "name": place.get("name"),
-            "formatted_address": place.get("formatted_address"),
-            "opening_hours": None,
-            "place_id": place_id,
-        }
-    
-    # Extract weekday_text from opening_hours
-    opening_hours = details.get("opening_hours", {})
-    weekday_text = opening_hours.get("weekday_text", []) if opening_hours else []
-    
+
+    opening_hours = place.get("currentOpeningHours") or {}
+    weekday_text = opening_hours.get("weekdayDescriptions") or []
+    name = (place.get("displayName") or {}).get("text")
+    logger.info(f"Text search top result: name={name}, place_id={place_id}, has_hours={bool(weekday_text)}")
+
     return {
-        "name": details.get("name"),
-        "formatted_address": details.get("formatted_address"),
+        "name": name,
+        "formatted_address": place.get("formattedAddress"),
         "opening_hours": weekday_text if weekday_text else None,
         "place_id": place_id,
     }
-
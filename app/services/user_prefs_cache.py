@@ -0,0 +1,67 @@
+"""
+Short-lived cache of the caller identity and onboarding preferences used by /ai/chat.
+
+Preferences are small, user-scoped and read on every chat turn but written only from the
+/me onboarding routes, so they are cached per Supabase uid (the JWT sub) for
+USER_PREFS_CACHE_TTL_SECONDS. The /me writers call invalidate_user_prefs() after committing.
+"""
+
+from typing import Any, Callable, NamedTuple
+from uuid import UUID
+
+from sqlalchemy.orm import load_only
+
+from app.models.user import User
+from app.services._ttl_cache import TTLCache
+
+USER_PREFS_CACHE_MAXSIZE = 4096
+USER_PREFS_CACHE_TTL_SECONDS = 600
+
+_user_prefs_cache = TTLCache(USER_PREFS_CACHE_MAXSIZE, USER_PREFS_CACHE_TTL_SECONDS)
+
+
+class UserPrefs(NamedTuple):
+    """Read-only copy of the User fields the chat path needs. onboarding_preferences must not be mutated."""
+
+    id: UUID
+    external_auth_uid: str
+    onboarding_preferences: dict[str, Any] | None
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserPrefs":
+        return cls(user.id, user.external_auth_uid, user.onboarding_preferences)
+
+
+# Loader option for chat-path selects: only the columns UserPrefs copies
+USER_PREFS_COLUMNS = load_only(User.external_auth_uid, User.onboarding_preferences)
+
+
+def get_cached_user_prefs(auth_uid: str) -> UserPrefs | None:
+    """Return the cached entry for auth_uid, or None if absent or expired."""
+    return _user_prefs_cache.get(auth_uid)
+
+
+def cache_user_prefs(user: User) -> UserPrefs:
+    """Snapshot a loaded User row into the cache and return the snapshot."""
+    prefs = UserPrefs.from_user(user)
+    _user_prefs_cache.set(prefs.external_auth_uid, prefs)
+    return prefs
+
+
+def get_or_load(auth_uid: str, loader: Callable[[], User | None]) -> UserPrefs | None:
+    """Return the cached entry, or call loader() and cache its User; None (uncached) if it finds none."""
+    prefs = get_cached_user_prefs(auth_uid)
+    if prefs is not None:
+        return prefs
+    user = loader()
+    return cache_user_prefs(user) if user is not None else None
+
+
+def invalidate_user_prefs(auth_uid: str) -> None:
+    """Drop auth_uid from the cache (call after committing a change to the user's preferences)."""
+    _user_prefs_cache.pop(auth_uid)
+
+
+def clear_user_prefs_cache() -> None:
+    """Empty the cache (tests)."""
+    _user_prefs_cache.clear()
@@ -1,39 +1,50 @@
+import sqlite3
+
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
-from fastapi.testclient import TestClient
-from unittest.mock import patch, Mock
+from sqlalchemy.pool import StaticPool
+from unittest.mock import patch
 from datetime import datetime, timedelta, timezone
-import jwt as pyjwt
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
-from cryptography.hazmat.backends import default_backend
-import base64
-import json
 
+import app.models  # noqa: F401  (registers every table on Base.metadata)
 from app.db.base import Base
 from app.db.session import get_db
-from app.main import app
-from app.seed.seed_data import seed_db
 from app.core.config import settings
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.dialects.sqlite import JSON as SQLiteJSON
-from sqlalchemy import event
 
+# FastAPI/app, JWT and cryptography imports live in the fixtures that need them, so
+# collecting tests that never touch the API or auth does not pay for them.
 
-# Use SQLite in-memory database for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+# Use SQLite in-memory database for testing. StaticPool hands every checkout the same
+# connection, so the database outlives individual sessions and is shared with the
+# TestClient's worker thread.
+SQLALCHEMY_DATABASE_URL = "sqlite://"
+
 
 # Override JSONB type compilation for SQLite
-@event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_conn, connection_record):
     """Set SQLite pragmas and override JSONB handling."""
     # Enable JSON support in SQLite
     dbapi_conn.execute("PRAGMA foreign_keys=ON")
+    # Let SQLAlchemy emit BEGIN itself (below); pysqlite's implicit transactions break SAVEPOINT
+    dbapi_conn.isolation_level = None
+
+
+def do_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+def _sqlite_engine(creator=None):
+    """In-memory SQLite engine on a single shared connection (optionally an existing sqlite3 one)."""
+    kwargs = {"creator": creator} if creator else {"connect_args": {"check_same_thread": False}}
+    sqlite_engine = create_engine(SQLALCHEMY_DATABASE_URL, poolclass=StaticPool, **kwargs)
+    event.listen(sqlite_engine, "connect", set_sqlite_pragma)
+    event.listen(sqlite_engine, "begin", do_begin)
+    return sqlite_engine
+
+
+engine = _sqlite_engine()
 
 # Monkey-patch JSONB to work with SQLite
 import sqlalchemy.dialects.sqlite.base as sqlite_base
@@ -49,24 +60,57 @@ if not getattr(sqlite_base.SQLiteTypeCompiler, 'visit_UUID', None):
         return "CHAR(36)"
     sqlite_base.SQLiteTypeCompiler.visit_UUID = visit_UUID
 
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Sessions join the per-test outer transaction; commit()/rollback() in app code only touch a SAVEPOINT
+TestingSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, join_transaction_mode="create_savepoint"
+)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema():
+    """Create the schema once per test session."""
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def _clear_chat_caches():
+    """Business ids and test uids repeat across tests, so cached snapshots must not leak between them."""
+    from app.services.business_cache import clear_business_cache
+    from app.services.user_prefs_cache import clear_user_prefs_cache
+
+    clear_business_cache()
+    clear_user_prefs_cache()
+    yield
+    clear_business_cache()
+    clear_user_prefs_cache()
 
 
 @pytest.fixture(scope="function")
 def db_session():
-    """Create a fresh database for each test."""
-    Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
+    """
+    Session inside a transaction that is rolled back after each test, leaving the database empty.
+    Tests set up rows with flush(): the API under test shares this session and connection, so
+    flushed rows are visible without a commit (and without expiring and re-loading them).
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = TestingSessionLocal(bind=connection)
     try:
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
 
 
 @pytest.fixture(scope="function")
 def client(db_session):
     """Create a test client with database dependency override."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
     def override_get_db():
         try:
             yield db_session
@@ -79,16 +123,43 @@ def client(db_session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="session")
+def _seed_snapshot():
+    """Seed sample data once into its own in-memory database; tests get copies of it."""
+    from app.seed.seed_data import seed_db
+
+    snapshot = sqlite3.connect(":memory:", check_same_thread=False)
+    seed_engine = _sqlite_engine(creator=lambda: snapshot)
+    Base.metadata.create_all(bind=seed_engine)
+    db = sessionmaker(bind=seed_engine)()
+    try:
+        seed_db(db)
+    finally:
+        db.close()
+    yield snapshot
+    seed_engine.dispose()
+
+
 @pytest.fixture(scope="function")
-def seeded_db(db_session):
-    """Create a database session with seeded data."""
-    seed_db(db_session)
-    return db_session
+def seeded_db(_seed_snapshot):
+    """Create a database session with seeded data (a fresh SQLite backup of the seeded snapshot)."""
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    _seed_snapshot.backup(conn)
+    seeded_engine = _sqlite_engine(creator=lambda: conn)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=seeded_engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+        seeded_engine.dispose()
 
 
 @pytest.fixture(scope="function")
 def seeded_client(seeded_db):
     """Create a test client with seeded database."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
     def override_get_db():
         try:
             yield seeded_db
@@ -101,17 +172,24 @@ def seeded_client(seeded_db):
     app.dependency_overrides.clear()
 
 
-# Test JWT key pair (generated once)
-_test_private_key = rsa.generate_private_key(
-    public_exponent=65537,
-    key_size=2048,
-    backend=default_backend()
-)
-_test_public_key = _test_private_key.public_key()
+@pytest.fixture(scope="session")
+def test_rsa_keys():
+    """Test JWT key pair, generated once per session and only when an auth fixture needs it."""
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    private_key = rsa.generate_private_key(
+        public_exponent=65537,
+        key_size=2048,
+        backend=default_backend()
+    )
+    return private_key, private_key.public_key()
 
 
 def _create_test_jwks(public_key, kid="test-key-id"):
     """Create a test JWKS structure from a public key."""
+    import base64
+
     public_numbers = public_key.public_numbers()
     
     def int_to_base64url(n):
@@ -147,6 +225,9 @@ def _create_test_token(
     kid="test-key-id"
 ):
     """Create a test JWT token with the given claims."""
+    import jwt as pyjwt
+    from cryptography.hazmat.primitives import serialization
+
     if exp is None:
         exp = int((datetime.now(timezone.utc) + timedelta(hours=1)).timestamp())
     
@@ -183,17 +264,17 @@ TEST_SUPABASE_UID_3 = "550e8400-e29b-41d4-a716-446655440002"
 
 
 @pytest.fixture
-def mock_jwks():
+def mock_jwks(test_rsa_keys):
     """Fixture that mocks JWKS so JWT verification uses the test key."""
-    test_jwks = _create_test_jwks(_test_public_key)
+    test_jwks = _create_test_jwks(test_rsa_keys[1])
     with patch("app.core.auth.fetch_jwks", return_value=test_jwks):
         yield test_jwks
 
 
 @pytest.fixture
-def create_test_token():
+def create_test_token(test_rsa_keys):
     """Fixture that provides a function to create test JWT tokens. sub must be a valid UUID."""
     def _create(sub=TEST_SUPABASE_UID_1, email="test@example.com", **kwargs):
-        return _create_test_token(_test_private_key, sub=sub, email=email, **kwargs)
+        return _create_test_token(test_rsa_keys[0], sub=sub, email=email, **kwargs)
     return _create
 
@@ -0,0 +1,15 @@
+"""Core-insert helpers for test data that is only read back through the API."""
+
+import uuid
+
+from sqlalchemy import Connection, insert
+
+from app.models.business import Business
+
+
+def make_business(conn: Connection, **values) -> uuid.UUID:
+    """Insert one businesses row (one INSERT, no ORM unit of work) and return its id."""
+    values.setdefault("id", uuid.uuid4())
+    values.setdefault("provider", "google")
+    conn.execute(insert(Business), values)
+    return values["id"]
@@ -1,13 +1,16 @@
 """Tests for AI chat endpoint: context loading and prompt construction."""
 
 import pytest
+import time
 from datetime import datetime, timezone
 from uuid import UUID
 from unittest.mock import patch, AsyncMock
 
+from app.core.config import settings
 from app.models.user import User
 from app.models.business import Business
 from tests.conftest import TEST_SUPABASE_UID_1, create_test_token
+from tests.factories import make_business
 
 
 def test_chat_loads_business_ai_context_and_user_prefs(client, db_session, mock_jwks, create_test_token):
@@ -22,14 +25,14 @@ def test_chat_loads_business_ai_context_and_user_prefs(client, db_session, mock_
     r_me.raise_for_status()
     user_id = r_me.json()["id"]
     # Set onboarding_preferences and onboarding_completed_at
-    user = db_session.query(User).filter(User.id == UUID(user_id)).first()
+    user = db_session.get(User, UUID(user_id))
     user.onboarding_preferences = {"budget": "mid", "vibe": "casual"}
     user.onboarding_completed_at = datetime.now(timezone.utc)
-    db_session.commit()
+    db_session.flush()
     # Create business with ai_context
-    business = Business(
+    business_id = make_business(
+        db_session.connection(),
         name="Test Restaurant",
-        provider="google",
         provider_place_id="ChIJ-test-chat-123",
         ai_context={
             "summary": "A great spot for dinner",
@@ -37,16 +40,13 @@ def test_chat_loads_business_ai_context_and_user_prefs(client, db_session, mock_
             "vibe": "Casual and cozy",
         },
     )
-    db_session.add(business)
-    db_session.commit()
-    db_session.refresh(business)
 
-    with patch("app.routers.ai.generate_text_with_system") as mock_gen:
+    with patch("app.routers.ai.generate_text_with_system_async", new_callable=AsyncMock) as mock_gen:
         mock_gen.return_value = "Yes, it is great."
         resp = client.post(
             "/api/v1/ai/chat",
             headers={"Authorization": f"Bearer {token}"},
-            json={"message": "Is this place good?", "business_id": str(business.id)},
+            json={"message": "Is this place good?", "business_id": str(business_id)},
         )
 
     assert resp.status_code == 200
@@ -68,22 +68,19 @@ def test_chat_returns_ai_context_when_business_has_it(client, db_session, mock_j
     """Chat response includes ai_context when business has ai_context stored."""
     token = create_test_token(sub=TEST_SUPABASE_UID_1)
     client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
-    business = Business(
+    business_id = make_business(
+        db_session.connection(),
         name="Place With Context",
-        provider="google",
         provider_place_id="ChIJ-ctx-456",
         ai_context={"summary": "Summary here", "vibe": "Chill"},
     )
-    db_session.add(business)
-    db_session.commit()
-    db_session.refresh(business)
 
-    with patch("app.routers.ai.generate_text_with_system") as mock_gen:
+    with patch("app.routers.ai.generate_text_with_system_async", new_callable=AsyncMock) as mock_gen:
         mock_gen.return_value = "Sure."
         resp = client.post(
             "/api/v1/ai/chat",
             headers={"Authorization": f"Bearer {token}"},
-            json={"message": "Tell me more", "business_id": str(business.id)},
+            json={"message": "Tell me more", "business_id": str(business_id)},
         )
 
     assert resp.status_code == 200
@@ -93,6 +90,37 @@ def test_chat_returns_ai_context_when_business_has_it(client, db_session, mock_j
     assert data["ai_context"].get("vibe") == "Chill"
 
 
+def test_business_chat_query_budget(client, db_session, mock_jwks, create_test_token):
+    """A business-linked /ai/chat turn stays within a fixed number of queries (no lazy loads)."""
+    from sqlalchemy import event
+
+    token = create_test_token(sub=TEST_SUPABASE_UID_1)
+    client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
+    business_id = make_business(db_session.connection(), name="Budget Bistro", provider_place_id="ChIJ-budget-1")
+    db_session.expunge_all()
+
+    queries: list[str] = []
+    engine = db_session.get_bind().engine
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        with patch("app.routers.ai.generate_text_with_system_async", new_callable=AsyncMock) as mock_gen:
+            mock_gen.return_value = "Sure."
+            resp = client.post(
+                "/api/v1/ai/chat",
+                headers={"Authorization": f"Bearer {token}"},
+                json={"message": "Is it good?", "business_id": str(business_id)},
+            )
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert resp.status_code == 200
+    assert len(queries) <= 3
+
+
 def test_chat_404_when_business_id_not_found(client, mock_jwks, create_test_token):
     """Chat returns 404 when business_id does not exist."""
     token = create_test_token()
@@ -110,20 +138,17 @@ def test_chat_rejects_invalid_latitude(client, mock_jwks, create_test_token, db_
     """POST /ai/chat with latitude outside [-90, 90] returns 422."""
     token = create_test_token()
     client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
-    business = Business(
+    business_id = make_business(
+        db_session.connection(),
         name="Test Place",
-        provider="google",
         provider_place_id="ChIJ-invalid-lat",
     )
-    db_session.add(business)
-    db_session.commit()
-    db_session.refresh(business)
     resp = client.post(
         "/api/v1/ai/chat",
         headers={"Authorization": f"Bearer {token}"},
         json={
             "message": "How far?",
-            "business_id": str(business.id),
+            "business_id": str(business_id),
             "latitude": 91.0,
             "longitude": 0.0,
         },
@@ -137,20 +162,17 @@ def test_chat_rejects_invalid_longitude(client, mock_jwks, create_test_token, db
     """POST /ai/chat with longitude outside [-180, 180] returns 422."""
     token = create_test_token()
     client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
-    business = Business(
+    business_id = make_business(
+        db_session.connection(),
         name="Test Place",
-        provider="google",
         provider_place_id="ChIJ-invalid-lng",
     )
-    db_session.add(business)
-    db_session.commit()
-    db_session.refresh(business)
     resp = client.post(
         "/api/v1/ai/chat",
         headers={"Authorization": f"Bearer {token}"},
         json={
             "message": "How far?",
-            "business_id": str(business.id),
+            "business_id": str(business_id),
             "latitude": 0.0,
             "longitude": 181.0,
         },
@@ -168,7 +190,7 @@ def test_main_chat_with_location_hint_includes_area_in_prompt(client, mock_jwks,
     token = create_test_token()
     client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
 
-    with patch("app.routers.ai.generate_text_with_system") as mock_gen:
+    with patch("app.routers.ai.generate_text_with_system_async", new_callable=AsyncMock) as mock_gen:
         mock_gen.return_value = "Here are some gyms around Queens, NY."
         resp = client.post(
             "/api/v1/ai/chat",
@@ -190,12 +212,38 @@ def test_main_chat_with_location_hint_includes_area_in_prompt(client, mock_jwks,
     assert data.get("recommended_places") is None
 
 
+def test_main_chat_passes_request_deadline_header_to_gemini(client, mock_jwks, create_test_token):
+    """X-Request-Deadline-Ms bounds the Gemini call; an invalid value falls back to request_sla_ms."""
+    token = create_test_token()
+    body = {"message": "Find me good gyms near me", "location_hint": "Queens, NY"}
+
+    with patch("app.routers.ai.generate_text_with_system_async", new_callable=AsyncMock) as mock_gen:
+        mock_gen.return_value = "Gyms."
+        before = time.monotonic()
+        client.post(
+            "/api/v1/ai/chat",
+            headers={"Authorization": f"Bearer {token}", "X-Request-Deadline-Ms": "2000"},
+            json=body,
+        )
+        short = mock_gen.call_args.kwargs["deadline"]
+        client.post(
+            "/api/v1/ai/chat",
+            headers={"Authorization": f"Bearer {token}", "X-Request-Deadline-Ms": "soon"},
+            json=body,
+        )
+        fallback = mock_gen.call_args.kwargs["deadline"]
+
+    assert before + 2 <= short < time.monotonic() + 2
+    assert fallback >= before + settings.request_sla_ms / 1000
+
+
 def test_main_chat_without_location_hint_returns_fixed_message_without_calling_gemini(client, mock_jwks, create_test_token):
     """Main chat (no business_id) without location_hint returns no-location message and does not call Gemini."""
     token = create_test_token()
     client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
 
-    with patch("app.routers.ai.generate_text_with_system") as mock_gen:
+    with patch("app.routers.ai.generate_text_with_system_async", new_callable=AsyncMock) as mock_gen, \
+            patch("app.routers.ai._load_user_and_business") as mock_load:
         resp = client.post(
             "/api/v1/ai/chat",
             headers={"Authorization": f"Bearer {token}"},
@@ -207,6 +255,8 @@ def test_main_chat_without_location_hint_returns_fixed_message_without_calling_g
     assert "location" in data["reply"].lower()
     assert "don't have your location" in data["reply"] or "setting or changing your location" in data["reply"]
     assert not mock_gen.called
+    # Answered before the caller lookup: no DB work on this path
+    assert not mock_load.called
 
 
 def test_main_chat_empty_location_hint_treated_as_missing(client, mock_jwks, create_test_token):
@@ -214,7 +264,7 @@ def test_main_chat_empty_location_hint_treated_as_missing(client, mock_jwks, cre
     token = create_test_token()
     client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
 
-    with patch("app.routers.ai.generate_text_with_system") as mock_gen:
+    with patch("app.routers.ai.generate_text_with_system_async", new_callable=AsyncMock) as mock_gen:
         resp = client.post(
             "/api/v1/ai/chat",
             headers={"Authorization": f"Bearer {token}"},
@@ -240,7 +290,7 @@ def test_main_chat_places_query_includes_recommended_places(client, mock_jwks, c
         {"place_id": "ChIJ-bjj-3", "name": "NYC Combat"},
     ]
 
-    with patch("app.routers.ai.generate_text_with_system") as mock_gen:
+    with patch("app.routers.ai.generate_text_with_system_async", new_callable=AsyncMock) as mock_gen:
         mock_gen.return_value = "Here are some BJJ gyms near you. Check the options below."
         with patch("app.routers.ai.search_places_text", new_callable=AsyncMock) as mock_places:
             mock_places.return_value = fake_places
@@ -277,7 +327,7 @@ def test_main_chat_non_place_query_has_no_recommended_places(client, mock_jwks,
     token = create_test_token()
     client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
 
-    with patch("app.routers.ai.generate_text_with_system") as mock_gen:
+    with patch("app.routers.ai.generate_text_with_system_async", new_callable=AsyncMock) as mock_gen:
         mock_gen.return_value = "Sorry, I can only help with places near you."
         resp = client.post(
             "/api/v1/ai/chat",
@@ -300,7 +350,7 @@ def test_main_chat_place_query_without_coords_skips_places_call(client, mock_jwk
     token = create_test_token()
     client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
 
-    with patch("app.routers.ai.generate_text_with_system") as mock_gen:
+    with patch("app.routers.ai.generate_text_with_system_async", new_callable=AsyncMock) as mock_gen:
         mock_gen.return_value = "Here are some cafes to work from."
         with patch("app.routers.ai.search_places_text", new_callable=AsyncMock) as mock_places:
             resp = client.post(
@@ -318,3 +368,261 @@ def test_main_chat_place_query_without_coords_skips_places_call(client, mock_jwk
     assert mock_gen.called
     assert not mock_places.called
     assert data.get("recommended_places") is None
+
+
+def test_load_user_and_business_uses_one_query(db_session):
+    """Caller and business come back from a single SELECT; a missing business yields None."""
+    from sqlalchemy import event
+    from app.routers.ai import _load_user_and_business
+
+    user = User(external_auth_uid=TEST_SUPABASE_UID_1, external_auth_provider="email", email="u@example.com")
+    business = Business(name="One Query Cafe", provider="google", provider_place_id="ChIJ-one-query")
+    db_session.add_all([user, business])
+    db_session.flush()
+    business_id = business.id
+    db_session.expunge_all()
+
+    statements: list[str] = []
+    engine = db_session.get_bind().engine
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        loaded_user, loaded_business = _load_user_and_business(db_session, TEST_SUPABASE_UID_1, business_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert len(statements) == 1
+    # Only the snapshot columns are selected (load_only)
+    select_list = statements[0].split(" FROM ")[0]
+    for column in ("businesses.ai_context", "businesses.name", "users.onboarding_preferences"):
+        assert column in select_list
+    for column in ("businesses.provider_place_id", "businesses.photo_url", "businesses.ai_tags", "users.email"):
+        assert column not in select_list
+    assert loaded_user.external_auth_uid == TEST_SUPABASE_UID_1
+    assert loaded_business.name == "One Query Cafe"
+    assert _load_user_and_business(db_session, TEST_SUPABASE_UID_1, UUID(int=0))[1] is None
+
+
+def test_load_user_and_business_reuses_cached_business(db_session):
+    """A repeat turn about the same business is served from business_cache until it is invalidated."""
+    from sqlalchemy import event
+    from app.routers.ai import _load_user_and_business
+    from app.services.business_cache import invalidate_business
+
+    business = Business(
+        name="Cached Cafe",
+        provider="google",
+        provider_place_id="ChIJ-cached",
+        ai_context={"summary": "Cozy"},
+    )
+    db_session.add(business)
+    db_session.flush()
+    business_id = business.id
+    _, first = _load_user_and_business(db_session, None, business_id)
+    assert first.ai_context == {"summary": "Cozy"}
+
+    statements: list[str] = []
+    engine = db_session.get_bind().engine
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        _, again = _load_user_and_business(db_session, None, business_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert statements == []
+    assert again.name == "Cached Cafe"
+
+    business.ai_context = {"summary": "Lively"}
+    db_session.flush()
+    invalidate_business(business_id)
+    _, refreshed = _load_user_and_business(db_session, None, business_id)
+    assert refreshed.ai_context == {"summary": "Lively"}
+
+
+def test_chat_sees_preferences_saved_through_me(client, mock_jwks, create_test_token):
+    """Cached onboarding preferences are dropped when /me saves new ones."""
+    token = create_test_token(sub=TEST_SUPABASE_UID_1)
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/api/v1/me", headers=headers)
+
+    first = client.post("/api/v1/ai/chat", headers=headers, json={"message": "What are my preferences?"})
+    assert first.status_code == 200
+    assert "haven't completed onboarding" in first.json()["reply"]
+
+    saved = client.put(
+        "/api/v1/me/preferences",
+        headers=headers,
+        json={"onboarding_preferences": {"dietary_restrictions": ["vegetarian"]}},
+    )
+    assert saved.status_code == 200
+
+    second = client.post("/api/v1/ai/chat", headers=headers, json={"message": "What are my preferences?"})
+    assert second.status_code == 200
+    assert "vegetarian" in second.json()["reply"]
+
+
+def test_main_chat_places_search_overlaps_caller_lookup(client, mock_jwks, create_test_token):
+    """The Google Places search for a place-like main chat starts before the caller lookup returns."""
+    import threading
+    from app.routers import ai as ai_router
+
+    token = create_test_token()
+    client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
+
+    search_started = threading.Event()
+    seen_during_load: list[bool] = []
+    real_load = ai_router._load_user_and_business
+
+    def slow_load(*args):
+        seen_during_load.append(search_started.wait(timeout=2))
+        return real_load(*args)
+
+    async def fake_search(**kwargs):
+        search_started.set()
+        return [{"place_id": "ChIJ-cafe-1", "name": "Corner Cafe"}]
+
+    with patch("app.routers.ai._load_user_and_business", side_effect=slow_load), \
+            patch("app.routers.ai.search_places_text", side_effect=fake_search), \
+            patch("app.routers.ai.generate_text_with_system_async", new_callable=AsyncMock) as mock_gen:
+        mock_gen.return_value = "Try Corner Cafe."
+        resp = client.post(
+            "/api/v1/ai/chat",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"message": "Any good coffee nearby?", "location_hint": "Queens, NY", "latitude": 40.7, "longitude": -73.8},
+        )
+
+    assert resp.status_code == 200
+    assert seen_during_load == [True]
+    assert resp.json()["recommended_places"] == [{"name": "Corner Cafe", "place_id": "ChIJ-cafe-1"}]
+    assert "Corner Cafe" in mock_gen.call_args.args[1]
+
+
+def test_message_to_place_query_keeps_map_priority():
+    """The single-pass matcher picks the same query as trying PLACE_QUERY_MAP entries in order."""
+    from app.routers.ai import PLACE_QUERY_MAP, _message_to_place_query
+
+    def ordered_lookup(message):
+        for pattern, query in PLACE_QUERY_MAP:
+            if pattern.search(message):
+                return query
+
+    messages = [
+        "Any bar near the gym?",
+        "coffee or brunch this weekend",
+        "Looking for a Brazilian jiu jitsu gym",
+        "pizza place with a bar",
+        "halal dinner spots",
+    ]
+    for message in messages:
+        assert _message_to_place_query(message) == ordered_lookup(message), message
+    # No map entry matches: fall back to the keyword itself
+    assert _message_to_place_query("best salons around here") == "salons"
+    assert _message_to_place_query("What is the capital of France?") is None
+
+
+def test_chat_stream_sends_deltas_then_done(client, db_session, mock_jwks, create_test_token):
+    """/ai/chat/stream relays Gemini chunks as SSE deltas and ends with the rest of the ChatResponse."""
+    import json
+
+    token = create_test_token(sub=TEST_SUPABASE_UID_1)
+    client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
+    business_id = make_business(
+        db_session.connection(),
+        name="Stream Diner",
+        provider_place_id="ChIJ-ai-stream-1",
+        ai_context={"summary": "Late-night classic"},
+    )
+
+    async def fake_stream(prompt, system_instruction, deadline=None):
+        assert "Stream Diner" in system_instruction
+        for text in ("Open ", "late, ", "yes."):
+            yield text
+
+    with patch("app.routers.ai.stream_text_with_system_async", fake_stream):
+        resp = client.post(
+            "/api/v1/ai/chat/stream",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"message": "Good for a late bite?", "business_id": str(business_id)},
+        )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = [e for e in resp.text.split("\n\n") if e]
+    deltas = [json.loads(e.removeprefix("data: "))["delta"] for e in events[:-1]]
+    assert "".join(deltas) == "Open late, yes."
+    assert events[-1].startswith("event: done\n")
+    done = json.loads(events[-1].split("data: ", 1)[1])
+    assert done == {"ai_context": {"summary": "Late-night classic"}, "recommended_places": None}
+
+
+def test_chat_stream_fixed_reply_and_503(client, mock_jwks, create_test_token):
+    """Turns answered without Gemini stream as one delta; a stream with no chunks is a 503."""
+    token = create_test_token()
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/api/v1/me", headers=headers)
+
+    resp = client.post("/api/v1/ai/chat/stream", headers=headers, json={"message": "coffee?"})
+    assert resp.status_code == 200
+    assert resp.text.startswith('data: {"delta": "I don\'t have your location.')
+
+    async def empty_stream(prompt, system_instruction, deadline=None):
+        return
+        yield
+
+    with patch("app.routers.ai.stream_text_with_system_async", empty_stream):
+        resp = client.post(
+            "/api/v1/ai/chat/stream",
+            headers=headers,
+            json={"message": "Tell me a joke", "location_hint": "Queens, NY"},
+        )
+    assert resp.status_code == 503
+    assert resp.json()["detail"]["error"] == "gemini_unavailable"
+
+
+def test_system_instruction_is_memoized_per_inputs():
+    """Repeat turns with the same context get the same rendered instruction object back."""
+    from app.routers.ai import _build_chat_system_instruction
+
+    payload = {"id": "b1", "name": "Memo Cafe"}
+    first = _build_chat_system_instruction(payload, {"budget": "mid"})
+    again = _build_chat_system_instruction(dict(payload), {"budget": "mid"})
+    other = _build_chat_system_instruction(payload, {"budget": "high"})
+
+    assert again is first
+    assert other is not first
+    assert '"budget": "high"' in other
+
+
+def test_json_indented_falls_back_for_ints_orjson_rejects():
+    """Integers wider than 64 bits are still serialized (via stdlib json), like small ones."""
+    from app.routers.ai import _json_indented
+
+    assert _json_indented({"budget": 2**70, "note": "café"}) == '{\n  "budget": 1180591620717411303424,\n  "note": "café"\n}'
+    assert _json_indented({"budget": 2}) == '{\n  "budget": 2\n}'
+
+
+def test_main_chat_accepts_preferences_orjson_cannot_key(client, mock_jwks, create_test_token):
+    """A huge integer in client-sent preferences skips instruction memoization instead of failing."""
+    token = create_test_token()
+
+    with patch("app.routers.ai.generate_text_with_system_async", new_callable=AsyncMock) as mock_gen:
+        mock_gen.return_value = "Gyms."
+        resp = client.post(
+            "/api/v1/ai/chat",
+            headers={"Authorization": f"Bearer {token}"},
+            json={
+                "message": "Find me good gyms near me",
+                "location_hint": "Queens, NY",
+                "onboarding_preferences": {"budget": 2**70},
+            },
+        )
+
+    assert resp.status_code == 200
+    assert '"budget": 1180591620717411303424' in mock_gen.call_args[0][1]
@@ -29,8 +29,7 @@ def test_generate_ai_notes_returns_none_when_llm_returns_none(db_session):
         provider_place_id="ChIJ-test-notes",
     )
     db_session.add(business)
-    db_session.commit()
-    db_session.refresh(business)
+    db_session.flush()
 
     with patch(
         "app.services.ai_notes_service.generate_business_ai_insights",
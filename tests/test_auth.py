@@ -144,6 +144,18 @@ def test_verify_valid_token(mock_jwks_response):
         assert claims["email"] == "test@example.com"
 
 
+def test_verify_reuses_constructed_signing_key(mock_jwks_response):
+    """Test that repeat verifications against the same JWK construct the key once."""
+    from app.core.auth import _construct_signing_key
+
+    _construct_signing_key.cache_clear()
+    with patch("app.core.auth.fetch_jwks", return_value=mock_jwks_response):
+        verify_supabase_token(create_test_token(_test_private_key))
+        verify_supabase_token(create_test_token(_test_private_key, sub="other-user"))
+    info = _construct_signing_key.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+
+
 def test_verify_token_missing_kid(mock_jwks_response):
     """Test that token without kid in header is rejected."""
     # Create token without kid in header
@@ -1,11 +1,13 @@
 """Tests for unified business AI insights (notes, context, tags)."""
 
+from datetime import datetime, timezone
 from unittest.mock import patch
 
 import pytest
 
 from app.models.business import Business
 from app.services.business_ai_insights import (
+    _collect_json_response,
     generate_business_ai_insights,
     generate_and_save_business_ai_insights,
     _normalize_tags,
@@ -33,8 +35,7 @@ def test_generate_business_ai_insights_returns_tags_when_present(db_session):
         provider_place_id="ChIJ-tags-happy",
     )
     db_session.add(business)
-    db_session.commit()
-    db_session.refresh(business)
+    db_session.flush()
 
     response_json = (
         '{"notes": "Cozy spot for coffee.", '
@@ -44,8 +45,8 @@ def test_generate_business_ai_insights_returns_tags_when_present(db_session):
     )
 
     with patch(
-        "app.services.business_ai_insights.generate_text_with_system",
-        return_value=response_json,
+        "app.services.business_ai_insights.stream_text_with_cached_system",
+        return_value=[response_json],
     ):
         notes, context, tags = generate_business_ai_insights(business, _minimal_place_details())
 
@@ -63,8 +64,7 @@ def test_generate_business_ai_insights_tags_missing_defaults_to_empty_list(db_se
         provider_place_id="ChIJ-tags-missing",
     )
     db_session.add(business)
-    db_session.commit()
-    db_session.refresh(business)
+    db_session.flush()
 
     # No "tags" key
     response_json = (
@@ -74,8 +74,8 @@ def test_generate_business_ai_insights_tags_missing_defaults_to_empty_list(db_se
     )
 
     with patch(
-        "app.services.business_ai_insights.generate_text_with_system",
-        return_value=response_json,
+        "app.services.business_ai_insights.stream_text_with_cached_system",
+        return_value=[response_json],
     ):
         notes, context, tags = generate_business_ai_insights(business, _minimal_place_details())
 
@@ -106,8 +106,7 @@ def test_generate_and_save_business_ai_insights_persists_tags(db_session):
         provider_place_id="ChIJ-save-tags",
     )
     db_session.add(business)
-    db_session.commit()
-    db_session.refresh(business)
+    db_session.flush()
     business_id = business.id
 
     response_json = (
@@ -119,11 +118,11 @@ def test_generate_and_save_business_ai_insights_persists_tags(db_session):
     place_details = _minimal_place_details()
 
     with (
-        patch("app.db.session.SessionLocal", return_value=db_session),
+        patch("app.services.business_ai_insights.SessionLocal", return_value=db_session),
         patch.object(db_session, "close"),  # avoid closing test session
         patch(
-            "app.services.business_ai_insights.generate_text_with_system",
-            return_value=response_json,
+            "app.services.business_ai_insights.stream_text_with_cached_system",
+            return_value=[response_json],
         ),
     ):
         generate_and_save_business_ai_insights(business_id, place_details)
@@ -132,3 +131,105 @@ def test_generate_and_save_business_ai_insights_persists_tags(db_session):
     assert business.ai_notes == "Saved notes."
     assert business.ai_context is not None
     assert business.ai_tags == ["quick-bite", "budget"]
+
+
+def test_generate_and_save_business_ai_insights_skips_when_row_is_fresh(db_session):
+    """A job whose business was refreshed by another worker returns without calling the LLM."""
+    business = Business(
+        name="Fresh Place",
+        provider="google",
+        provider_place_id="ChIJ-already-fresh",
+        ai_notes="Existing notes.",
+        ai_context={"summary": "Existing."},
+        ai_context_last_updated=datetime.now(timezone.utc),
+    )
+    db_session.add(business)
+    db_session.flush()
+
+    with (
+        patch("app.services.business_ai_insights.SessionLocal", return_value=db_session),
+        patch.object(db_session, "close"),
+        patch("app.services.business_ai_insights.stream_text_with_cached_system") as mock_llm,
+    ):
+        generate_and_save_business_ai_insights(business.id, _minimal_place_details())
+
+    mock_llm.assert_not_called()
+    assert business.ai_notes == "Existing notes."
+
+
+def test_generate_and_save_business_ai_insights_replaces_invalid_stored_context(db_session):
+    """A fresh timestamp does not protect a stored ai_context that no longer validates."""
+    business = Business(
+        name="Old Shape Place",
+        provider="google",
+        provider_place_id="ChIJ-invalid-context",
+        ai_notes="Old notes.",
+        ai_context={"summary": "Old", "pros": "not-a-list"},
+        ai_context_last_updated=datetime.now(timezone.utc),
+    )
+    db_session.add(business)
+    db_session.flush()
+
+    response_json = (
+        '{"notes": "New notes.", '
+        '"context": {"summary": "New.", "vibe": "", "best_for": [], "pros": ["Tasty"], "cons": [], '
+        '"reliability_notes": "", "source_notes": ""}, '
+        '"tags": []}'
+    )
+    with (
+        patch("app.services.business_ai_insights.SessionLocal", return_value=db_session),
+        patch.object(db_session, "close"),
+        patch(
+            "app.services.business_ai_insights.stream_text_with_cached_system",
+            return_value=[response_json],
+        ),
+    ):
+        generate_and_save_business_ai_insights(business.id, _minimal_place_details())
+
+    db_session.refresh(business)
+    assert business.ai_notes == "New notes."
+    assert business.ai_context["pros"] == ["Tasty"]
+
+
+def test_generate_business_ai_insights_caches_by_business_and_place_details(db_session):
+    """A repeat call with the same business and place details reuses the parsed result."""
+    business = Business(
+        name="Test Cafe",
+        provider="google",
+        provider_place_id="ChIJ-cache-hit",
+    )
+    db_session.add(business)
+    db_session.flush()
+
+    response_json = (
+        '{"notes": "Cached notes.", '
+        '"context": {"summary": "A cafe.", "vibe": "", "best_for": [], "pros": [], "cons": [], '
+        '"reliability_notes": "", "source_notes": ""}, '
+        '"tags": ["coffee"]}'
+    )
+
+    with patch(
+        "app.services.business_ai_insights.stream_text_with_cached_system",
+        return_value=[response_json],
+    ) as mock_llm:
+        first = generate_business_ai_insights(business, _minimal_place_details())
+        second = generate_business_ai_insights(business, _minimal_place_details())
+        changed = _minimal_place_details()
+        changed["rating"] = 3.9
+        generate_business_ai_insights(business, changed)
+
+    assert first == second
+    assert mock_llm.call_count == 2
+
+
+def test_collect_json_response_stops_when_object_closes():
+    """Streaming stops at the closing brace; braces inside strings and a leading fence are ignored."""
+    consumed = []
+
+    def chunks():
+        for part in ['```json\n{"notes": "a } b", ', '"context": {"summary": "x"}}', "\n```", "trailing"]:
+            consumed.append(part)
+            yield part
+
+    assert _collect_json_response(chunks()) == '{"notes": "a } b", "context": {"summary": "x"}}'
+    assert len(consumed) == 2
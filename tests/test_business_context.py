@@ -29,8 +29,7 @@ def test_generate_business_ai_context_returns_none_when_llm_returns_none(db_sess
         provider_place_id="ChIJ-test-ctx",
     )
     db_session.add(business)
-    db_session.commit()
-    db_session.refresh(business)
+    db_session.flush()
 
     with patch(
         "app.ai.business_context.generate_business_ai_insights",
@@ -52,8 +51,7 @@ def test_generate_business_ai_context_prompt_is_generic_no_user_preferences(db_s
         provider_place_id="ChIJ-test-generic",
     )
     db_session.add(business)
-    db_session.commit()
-    db_session.refresh(business)
+    db_session.flush()
     place_data = _minimal_place_data()
 
     with patch("app.ai.business_context.generate_business_ai_insights") as mock_insights:
@@ -111,8 +111,7 @@ def test_ai_insights_returns_ready_when_fresh(client, db_session, mock_jwks, cre
         "pros": ["Good coffee"],
     }
     business.ai_context_last_updated = datetime.now(timezone.utc)
-    db_session.commit()
-    db_session.refresh(business)
+    db_session.flush()
 
     token = create_test_token(sub="550e8400-e29b-41d4-a716-4466554400a2", email="ready@example.com")
     app.dependency_overrides[get_current_user] = lambda: MagicMock(
@@ -152,7 +151,7 @@ def test_ai_insights_returns_pending_when_missing(client, db_session, mock_jwks,
     business = _upsert_business_from_place(db_session, place_id, result)
     assert business.ai_notes is None
     assert business.ai_context is None
-    db_session.commit()
+    db_session.flush()
 
     token = create_test_token(sub="550e8400-e29b-41d4-a716-4466554400a3", email="pending@example.com")
     app.dependency_overrides[get_current_user] = lambda: MagicMock(
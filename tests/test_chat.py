@@ -6,15 +6,16 @@ real external calls. Verifies 200 with assistant_message and metadata,
 no server-side chat storage.
 """
 
+import json
 import pytest
 from datetime import datetime, timezone
 from uuid import UUID
 from unittest.mock import patch
 
-from app.models.business import Business
 from app.models.user import User
 from app.routers.chat import CHAT_BUSINESS_SYSTEM_PROMPT
 from tests.conftest import TEST_SUPABASE_UID_1, create_test_token
+from tests.factories import make_business
 
 
 def test_chat_business_200_returns_assistant_message(
@@ -28,26 +29,23 @@ def test_chat_business_200_returns_assistant_message(
     r_me = client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
     r_me.raise_for_status()
     user_id = r_me.json()["id"]
-    user = db_session.query(User).filter(User.id == UUID(user_id)).first()
+    user = db_session.get(User, UUID(user_id))
     user.onboarding_preferences = {"budget": "mid"}
     user.onboarding_completed_at = datetime.now(timezone.utc)
-    db_session.commit()
+    db_session.flush()
 
-    business = Business(
+    business_id = make_business(
+        db_session.connection(),
         name="Test Restaurant",
-        provider="google",
         provider_place_id="ChIJ-chat-123",
         ai_context={"summary": "Great spot", "vibe": "Casual"},
         ai_notes="Popular for brunch.",
     )
-    db_session.add(business)
-    db_session.commit()
-    db_session.refresh(business)
 
     with patch("app.routers.chat.generate_business_chat_with_search") as mock_gen:
         mock_gen.return_value = "This place is a great fit for you."
         resp = client.post(
-            f"/api/v1/chat/business/{business.id}",
+            f"/api/v1/chat/business/{business_id}",
             headers={"Authorization": f"Bearer {token}"},
             json={"user_message": "Is this place good for brunch?"},
         )
@@ -55,9 +53,9 @@ def test_chat_business_200_returns_assistant_message(
     assert resp.status_code == 200
     data = resp.json()
     assert data["assistant_message"] == "This place is a great fit for you."
-    assert data.get("chat_session_id") == str(business.id)
+    assert data.get("chat_session_id") == str(business_id)
     assert data["metadata"]["model"]
-    assert data["metadata"]["business_id"] == str(business.id)
+    assert data["metadata"]["business_id"] == str(business_id)
     assert "created_at" in data["metadata"]
 
 
@@ -72,26 +70,23 @@ def test_chat_business_context_includes_business_and_user_profile(
     r_me = client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
     r_me.raise_for_status()
     user_id = r_me.json()["id"]
-    user = db_session.query(User).filter(User.id == UUID(user_id)).first()
+    user = db_session.get(User, UUID(user_id))
     user.onboarding_preferences = {"budget": "mid", "vibe": "casual"}
     user.onboarding_completed_at = datetime.now(timezone.utc)
-    db_session.commit()
+    db_session.flush()
 
-    business = Business(
+    business_id = make_business(
+        db_session.connection(),
         name="Test Restaurant",
-        provider="google",
         provider_place_id="ChIJ-ctx-123",
         ai_context={"summary": "Great spot", "vibe": "Casual"},
         ai_notes="Popular for brunch.",
     )
-    db_session.add(business)
-    db_session.commit()
-    db_session.refresh(business)
 
     with patch("app.routers.chat.generate_business_chat_with_search") as mock_gen:
         mock_gen.return_value = "Sure."
         resp = client.post(
-            f"/api/v1/chat/business/{business.id}",
+            f"/api/v1/chat/business/{business_id}",
             headers={"Authorization": f"Bearer {token}"},
             json={"user_message": "Is this good for me?"},
         )
@@ -120,26 +115,23 @@ def test_chat_business_uses_search_enabled_client_with_correct_args(
     r_me = client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
     r_me.raise_for_status()
     user_id = r_me.json()["id"]
-    user = db_session.query(User).filter(User.id == UUID(user_id)).first()
+    user = db_session.get(User, UUID(user_id))
     user.onboarding_preferences = {"budget": "mid"}
     user.onboarding_completed_at = datetime.now(timezone.utc)
-    db_session.commit()
+    db_session.flush()
 
-    business = Business(
+    business_id = make_business(
+        db_session.connection(),
         name="Search Test Cafe",
-        provider="google",
         provider_place_id="ChIJ-search-123",
         ai_context={"summary": "Cozy cafe"},
         ai_notes="Good coffee.",
     )
-    db_session.add(business)
-    db_session.commit()
-    db_session.refresh(business)
 
     with patch("app.routers.chat.generate_business_chat_with_search") as mock_gen:
         mock_gen.return_value = "Based on web search results, it appears that this location opened in 2020."
         resp = client.post(
-            f"/api/v1/chat/business/{business.id}",
+            f"/api/v1/chat/business/{business_id}",
             headers={"Authorization": f"Bearer {token}"},
             json={"user_message": "When was this location established?"},
         )
@@ -167,19 +159,16 @@ def test_chat_business_503_when_gemini_returns_none(client, db_session, mock_jwk
     """When generate_business_chat_with_search returns None (quota), return 503 with model_overloaded."""
     token = create_test_token(sub=TEST_SUPABASE_UID_1)
     client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
-    business = Business(
+    business_id = make_business(
+        db_session.connection(),
         name="Test Place",
-        provider="google",
         provider_place_id="ChIJ-503",
         ai_context={"summary": "Nice"},
     )
-    db_session.add(business)
-    db_session.commit()
-    db_session.refresh(business)
 
     with patch("app.routers.chat.generate_business_chat_with_search", return_value=None):
         resp = client.post(
-            f"/api/v1/chat/business/{business.id}",
+            f"/api/v1/chat/business/{business_id}",
             headers={"Authorization": f"Bearer {token}"},
             json={"user_message": "Tell me more"},
         )
@@ -210,17 +199,14 @@ def test_chat_business_404_when_business_not_found(client, mock_jwks, create_tes
 
 def test_chat_business_401_without_auth(client, db_session):
     """Chat returns 401 or 403 when no Bearer token is provided (auth required)."""
-    business = Business(
+    business_id = make_business(
+        db_session.connection(),
         name="Test",
-        provider="google",
         provider_place_id="ChIJ-401",
     )
-    db_session.add(business)
-    db_session.commit()
-    db_session.refresh(business)
 
     resp = client.post(
-        f"/api/v1/chat/business/{business.id}",
+        f"/api/v1/chat/business/{business_id}",
         json={"user_message": "Hi"},
     )
     assert resp.status_code in (401, 403)
@@ -237,26 +223,23 @@ def test_chat_business_with_distance_miles_injects_into_prompt(
     r_me = client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
     r_me.raise_for_status()
     user_id = r_me.json()["id"]
-    user = db_session.query(User).filter(User.id == UUID(user_id)).first()
+    user = db_session.get(User, UUID(user_id))
     user.onboarding_preferences = {"budget": "mid"}
     user.onboarding_completed_at = datetime.now(timezone.utc)
-    db_session.commit()
+    db_session.flush()
 
-    business = Business(
+    business_id = make_business(
+        db_session.connection(),
         name="Test Restaurant",
-        provider="google",
         provider_place_id="ChIJ-dist-123",
         ai_context={"summary": "Great spot"},
         ai_notes="Popular for brunch.",
     )
-    db_session.add(business)
-    db_session.commit()
-    db_session.refresh(business)
 
     with patch("app.routers.chat.generate_business_chat_with_search") as mock_gen:
         mock_gen.return_value = "About 1.3 miles from you."
         resp = client.post(
-            f"/api/v1/chat/business/{business.id}",
+            f"/api/v1/chat/business/{business_id}",
             headers={"Authorization": f"Bearer {token}"},
             json={"user_message": "How far away is this place?", "distance_miles": 1.3},
         )
@@ -285,25 +268,22 @@ def test_chat_business_without_distance_miles_works_and_omits_distance(
     r_me = client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
     r_me.raise_for_status()
     user_id = r_me.json()["id"]
-    user = db_session.query(User).filter(User.id == UUID(user_id)).first()
+    user = db_session.get(User, UUID(user_id))
     user.onboarding_preferences = {}
     user.onboarding_completed_at = datetime.now(timezone.utc)
-    db_session.commit()
+    db_session.flush()
 
-    business = Business(
+    business_id = make_business(
+        db_session.connection(),
         name="Test Place",
-        provider="google",
         provider_place_id="ChIJ-nodist",
         ai_context={"summary": "Nice"},
     )
-    db_session.add(business)
-    db_session.commit()
-    db_session.refresh(business)
 
     with patch("app.routers.chat.generate_business_chat_with_search") as mock_gen:
         mock_gen.return_value = "I don't have information about your distance."
         resp = client.post(
-            f"/api/v1/chat/business/{business.id}",
+            f"/api/v1/chat/business/{business_id}",
             headers={"Authorization": f"Bearer {token}"},
             json={"user_message": "How far is it?"},
         )
@@ -316,3 +296,72 @@ def test_chat_business_without_distance_miles_works_and_omits_distance(
     assert "Context (JSON):" in user_content
     # When distance_miles is omitted, build_business_chat_context does not add distance_miles to business
     assert '"distance_miles"' not in user_content
+
+
+def test_chat_business_stream_sends_deltas_then_done(client, db_session, mock_jwks, create_test_token):
+    """The stream endpoint relays each Gemini chunk as an SSE delta and ends with a done event."""
+    token = create_test_token(sub=TEST_SUPABASE_UID_1)
+    client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
+    business_id = make_business(
+        db_session.connection(),
+        name="Stream Cafe",
+        provider_place_id="ChIJ-stream-1",
+        ai_context={"summary": "Cozy"},
+    )
+
+    import threading
+
+    from app.routers.chat import _build_business_chat_prompt
+
+    threads: dict[str, int] = {}
+
+    def recording_build(*args):
+        threads["prompt"] = threading.get_ident()
+        return _build_business_chat_prompt(*args)
+
+    async def fake_stream(system_prompt, messages, deadline=None):
+        threads["loop"] = threading.get_ident()
+        assert "Stream Cafe" in messages[0]["content"]
+        for text in ("Great ", "fit ", "for you."):
+            yield text
+
+    with (
+        patch("app.routers.chat._build_business_chat_prompt", recording_build),
+        patch("app.routers.chat.stream_business_chat_with_search_async", fake_stream),
+    ):
+        resp = client.post(
+            f"/api/v1/chat/business/{business_id}/stream",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"user_message": "Is this good?"},
+        )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = [e for e in resp.text.split("\n\n") if e]
+    deltas = [json.loads(e.removeprefix("data: "))["delta"] for e in events[:-1]]
+    assert "".join(deltas) == "Great fit for you."
+    assert events[-1].startswith("event: done\n")
+    done = json.loads(events[-1].split("data: ", 1)[1])
+    assert done["metadata"]["business_id"] == str(business_id)
+    # The sync business lookup ran in a worker thread, not on the event loop
+    assert threads["prompt"] != threads["loop"]
+
+
+def test_chat_business_stream_503_when_no_chunks(client, db_session, mock_jwks, create_test_token):
+    token = create_test_token(sub=TEST_SUPABASE_UID_1)
+    client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
+    business_id = make_business(db_session.connection(), name="Quiet Place", provider_place_id="ChIJ-stream-503")
+
+    async def empty_stream(system_prompt, messages, deadline=None):
+        return
+        yield
+
+    with patch("app.routers.chat.stream_business_chat_with_search_async", empty_stream):
+        resp = client.post(
+            f"/api/v1/chat/business/{business_id}/stream",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"user_message": "Anything?"},
+        )
+
+    assert resp.status_code == 503
+    assert resp.json()["detail"]["error"] == "model_overloaded"
@@ -1,12 +1,19 @@
-"""Tests for Gemini client: 429 handling and cooldown."""
+"""Tests for Gemini client: 429 handling, backoff and circuit breaker."""
 
-from datetime import datetime, timezone, timedelta
+import asyncio
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 from google.genai import errors as genai_errors
 
 from app.services import gemini_client
+from app.services._breaker import CircuitBreaker
+from app.services._rate_limit import TokenBucket
+
+
+# Long enough to pass SYSTEM_CACHE_MIN_CHARS, so the context-cache path is taken
+_LONG_SYSTEM = "long system instruction " * 200
 
 
 class _MockResponse429:
@@ -14,13 +21,30 @@ class _MockResponse429:
     body_segments = [{"error": {"code": 429, "status": "RESOURCE_EXHAUSTED", "message": "quota exceeded"}}]
 
 
+class _MockResponse400:
+    """Minimal mock response that produces a 400 INVALID_ARGUMENT ClientError."""
+    body_segments = [{"error": {"code": 400, "status": "INVALID_ARGUMENT", "message": "bad request"}}]
+
+
+class _MockResponse500:
+    """Minimal mock response that produces a 500 INTERNAL ServerError."""
+    body_segments = [{"error": {"code": 500, "status": "INTERNAL", "message": "boom"}}]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_rate_limits():
+    """Each test starts with full local rate-limit buckets."""
+    gemini_client._bucket.reset()
+    gemini_client._bucket_chat.reset()
+
+
 def test_429_sets_cooldown_and_returns_none():
     """
     When the SDK raises ClientError 429 RESOURCE_EXHAUSTED,
     generate_text_with_system sets the module cooldown and returns None.
     """
-    # Reset cooldown so we are not already in cooldown
-    gemini_client._quota_cooldown_until = None
+    # Close the breaker so we are not already in cooldown
+    gemini_client._record_success(gemini_client._primary())
 
     def raise_429(*args, **kwargs):
         raise genai_errors.ClientError(429, _MockResponse429())
@@ -33,8 +57,9 @@ def test_429_sets_cooldown_and_returns_none():
         result = gemini_client.generate_text_with_system("test prompt", "system")
 
     assert result is None
-    assert gemini_client._quota_cooldown_until is not None
-    assert gemini_client._quota_cooldown_until > datetime.now(timezone.utc)
+    assert gemini_client._breaker.state == "open"
+    assert not gemini_client._breaker.allow()
+    gemini_client._record_success(gemini_client._primary())
 
 
 def test_cooldown_skips_call_and_returns_none():
@@ -42,7 +67,7 @@ def test_cooldown_skips_call_and_returns_none():
     When in cooldown, generate_text_with_system does not call the SDK
     and returns None.
     """
-    gemini_client._quota_cooldown_until = datetime.now(timezone.utc) + timedelta(seconds=60)
+    gemini_client._breaker.trip(60)
 
     try:
         with patch.object(gemini_client, "_get_client") as mock_get_client:
@@ -51,12 +76,12 @@ def test_cooldown_skips_call_and_returns_none():
         assert result is None
         mock_get_client.assert_not_called()
     finally:
-        gemini_client._quota_cooldown_until = None
+        gemini_client._record_success(gemini_client._primary())
 
 
 def test_success_returns_text():
     """When the SDK returns text, generate_text_with_system returns it."""
-    gemini_client._quota_cooldown_until = None
+    gemini_client._record_success(gemini_client._primary())
 
     mock_response = MagicMock()
     mock_response.text = "Hello from Gemini"
@@ -69,3 +94,554 @@ def test_success_returns_text():
         result = gemini_client.generate_text_with_system("test prompt", "system")
 
     assert result == "Hello from Gemini"
+
+
+def test_cached_system_reuses_cache_handle():
+    """stream_text_with_cached_system creates the cache once and passes cached_content."""
+    gemini_client._record_success(gemini_client._primary())
+    gemini_client._system_cache_handles.clear()
+
+    with patch.object(gemini_client, "_get_client") as mock_get_client:
+        mock_client = MagicMock()
+        cached = MagicMock()
+        cached.name = "cachedContents/abc"
+        mock_client.caches.create.return_value = cached
+        mock_client.models.generate_content_stream = MagicMock(
+            side_effect=lambda **kwargs: iter([MagicMock(text="cached")])
+        )
+        mock_get_client.return_value = mock_client
+
+        assert list(gemini_client.stream_text_with_cached_system("p1", _LONG_SYSTEM)) == ["cached"]
+        assert list(gemini_client.stream_text_with_cached_system("p2", _LONG_SYSTEM)) == ["cached"]
+
+    mock_client.caches.create.assert_called_once()
+    config = mock_client.models.generate_content_stream.call_args.kwargs["config"]
+    assert config.cached_content == "cachedContents/abc"
+    assert config.system_instruction is None
+    gemini_client._system_cache_handles.clear()
+
+
+def test_cached_system_skips_cache_for_short_instructions():
+    """Instructions below Gemini's minimum cacheable size are sent inline without trying to cache."""
+    gemini_client._record_success(gemini_client._primary())
+    gemini_client._system_cache_handles.clear()
+
+    with patch.object(gemini_client, "_get_client") as mock_get_client:
+        mock_client = mock_get_client.return_value
+        mock_client.models.generate_content_stream.return_value = iter([MagicMock(text="inline")])
+
+        assert list(gemini_client.stream_text_with_cached_system("p", "short system")) == ["inline"]
+
+    mock_client.caches.create.assert_not_called()
+    assert mock_client.models.generate_content_stream.call_args.kwargs["config"].system_instruction == "short system"
+
+
+def test_cached_system_handle_is_created_once_across_threads():
+    import threading
+
+    gemini_client._system_cache_handles.clear()
+    client = MagicMock()
+
+    def slow_create(**kwargs):
+        time.sleep(0.02)
+        return MagicMock(name="cache")
+
+    client.caches.create.side_effect = slow_create
+    threads = [
+        threading.Thread(
+            target=gemini_client._get_cached_system_handle, args=(client, "model", _LONG_SYSTEM)
+        )
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    client.caches.create.assert_called_once()
+    gemini_client._system_cache_handles.clear()
+
+
+def test_cached_system_falls_back_inline_when_cache_unavailable():
+    """When cache creation fails, the system instruction is sent inline."""
+    gemini_client._record_success(gemini_client._primary())
+    gemini_client._system_cache_handles.clear()
+
+    with patch.object(gemini_client, "_get_client") as mock_get_client:
+        mock_client = MagicMock()
+        mock_client.caches.create.side_effect = RuntimeError("too few tokens")
+        mock_client.models.generate_content_stream = MagicMock(return_value=iter([MagicMock(text="inline")]))
+        mock_get_client.return_value = mock_client
+
+        result = list(gemini_client.stream_text_with_cached_system("p", _LONG_SYSTEM))
+
+    assert result == ["inline"]
+    config = mock_client.models.generate_content_stream.call_args.kwargs["config"]
+    assert config.system_instruction == _LONG_SYSTEM
+    mock_client.caches.create.assert_called_once()
+    gemini_client._system_cache_handles.clear()
+
+
+def test_cached_system_retries_inline_when_handle_rejected():
+    """A non-quota error on the cached handle drops it and repeats the call with the inline config."""
+    gemini_client._record_success(gemini_client._primary())
+    gemini_client._system_cache_handles.clear()
+
+    with patch.object(gemini_client, "_get_client") as mock_get_client:
+        mock_client = MagicMock()
+        mock_client.caches.create.return_value.name = "cachedContents/expired"
+        mock_client.models.generate_content_stream.side_effect = [
+            genai_errors.ClientError(400, _MockResponse400()),
+            iter([MagicMock(text="inline retry")]),
+        ]
+        mock_get_client.return_value = mock_client
+
+        result = list(gemini_client.stream_text_with_cached_system("p", _LONG_SYSTEM))
+
+    assert result == ["inline retry"]
+    configs = [c.kwargs["config"] for c in mock_client.models.generate_content_stream.call_args_list]
+    assert configs[0].cached_content == "cachedContents/expired"
+    assert configs[1] is gemini_client._config_for(_LONG_SYSTEM)
+    assert _LONG_SYSTEM not in gemini_client._system_cache_handles
+
+
+def test_stream_with_cached_system_yields_chunks_inline_when_cache_unavailable():
+    """stream_text_with_cached_system yields non-empty chunk texts, sending the system prompt inline."""
+    gemini_client._record_success(gemini_client._primary())
+    gemini_client._system_cache_handles.clear()
+
+    chunks = [MagicMock(text="{\"a\": "), MagicMock(text=None), MagicMock(text="1}")]
+
+    with patch.object(gemini_client, "_get_client") as mock_get_client:
+        mock_client = MagicMock()
+        mock_client.caches.create.side_effect = RuntimeError("too few tokens")
+        mock_client.models.generate_content_stream = MagicMock(return_value=iter(chunks))
+        mock_get_client.return_value = mock_client
+
+        result = list(gemini_client.stream_text_with_cached_system("p", "short system"))
+
+    assert result == ["{\"a\": ", "1}"]
+    config = mock_client.models.generate_content_stream.call_args.kwargs["config"]
+    assert config.system_instruction == "short system"
+    gemini_client._system_cache_handles.clear()
+
+
+def test_async_call_times_out_and_returns_none():
+    """generate_text_with_system_async returns None when the SDK call exceeds the request timeout."""
+    gemini_client._record_success(gemini_client._primary())
+
+    async def slow_generate(*args, **kwargs):
+        await asyncio.sleep(1)
+
+    with (
+        patch.object(gemini_client, "_get_client") as mock_get_client,
+        patch.object(gemini_client.settings, "gemini_request_timeout_s", 0.01),
+    ):
+        mock_client = MagicMock()
+        mock_client.aio.models.generate_content = slow_generate
+        mock_get_client.return_value = mock_client
+
+        result = asyncio.run(gemini_client.generate_text_with_system_async("test prompt", "system"))
+
+    assert result is None
+
+
+def test_async_call_skipped_when_deadline_passed():
+    """An already-expired caller deadline returns None without calling Gemini or tripping the breaker."""
+    gemini_client._record_success(gemini_client._primary())
+
+    with patch.object(gemini_client, "_get_client") as mock_get_client:
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+
+        result = asyncio.run(
+            gemini_client.generate_text_with_system_async(
+                "deadline prompt", "system", deadline=time.monotonic() - 1
+            )
+        )
+
+    assert result is None
+    assert not mock_client.aio.models.generate_content.called
+    assert gemini_client._breaker.state == "closed"
+
+
+def test_call_timeout_is_capped_by_remaining_deadline():
+    with patch.object(gemini_client.settings, "gemini_request_timeout_s", 15.0):
+        assert gemini_client._call_timeout(None) == 15.0
+        assert gemini_client._call_timeout(time.monotonic() - 0.5) is None
+        assert gemini_client._call_timeout(time.monotonic() + 2) <= 2
+        assert gemini_client._call_timeout(time.monotonic() + 60) == 15.0
+
+
+def test_consecutive_429s_back_off_exponentially_and_reset_on_success():
+    """Each consecutive 429 doubles the cooldown (within jitter); a success resets it."""
+    key = gemini_client._primary()
+    gemini_client._record_success(key)
+
+    with (
+        patch.object(gemini_client.settings, "gemini_quota_cooldown_seconds", 10),
+        patch.object(gemini_client.settings, "gemini_quota_cooldown_cap_seconds", 30),
+    ):
+        first = gemini_client._next_quota_cooldown_seconds(key, None)
+        second = gemini_client._next_quota_cooldown_seconds(key, None)
+        capped = gemini_client._next_quota_cooldown_seconds(key, None)
+        floored = gemini_client._next_quota_cooldown_seconds(key, 120)
+        # The chat key keeps its own count
+        chat_first = gemini_client._next_quota_cooldown_seconds(gemini_client._chat(), None)
+        gemini_client._record_success(key)
+        after_reset = gemini_client._next_quota_cooldown_seconds(key, None)
+
+    assert 7.5 <= first <= 12.5
+    assert 15 <= second <= 25
+    assert 22.5 <= capped <= 37.5
+    assert floored == 120
+    assert 7.5 <= chat_first <= 12.5
+    assert 7.5 <= after_reset <= 12.5
+    gemini_client._record_success(key)
+    gemini_client._record_success(gemini_client._chat())
+
+
+def test_breaker_opens_after_repeated_failures_and_admits_one_probe():
+    """Repeated tripping failures open the breaker; after the window one probe is let through."""
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_after=0.0)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    # reset_after=0: the open window has elapsed, so a single probe is admitted
+    assert breaker.allow() is True
+    assert breaker.state == "half_open"
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow() is True
+
+
+def test_breaker_failed_probe_reopens_with_doubled_window():
+    """A failed half-open probe re-opens the breaker for twice the previous window."""
+    breaker = CircuitBreaker("test", reset_after=10.0)
+    breaker.trip(4.0)
+    assert breaker.allow() is False
+    breaker.opened_at -= 5  # the 4 s window has elapsed
+
+    assert breaker.allow() is True  # probe
+    assert breaker.allow() is False  # second caller waits for the probe
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.open_for == 8.0
+
+
+def test_server_error_counts_as_breaker_failure():
+    """A 5xx that persists through the retries is recorded as one breaker failure and re-raised."""
+    gemini_client._record_success(gemini_client._primary())
+
+    with (
+        patch.object(gemini_client, "_get_client") as mock_get_client,
+        patch.object(gemini_client, "SERVER_RETRY_BASE_SECONDS", 0),
+    ):
+        mock_client = MagicMock()
+        mock_client.models.generate_content.side_effect = genai_errors.ServerError(500, _MockResponse500())
+        mock_get_client.return_value = mock_client
+
+        with pytest.raises(genai_errors.ServerError):
+            gemini_client.generate_text_with_system("test prompt", "system")
+
+    assert mock_client.models.generate_content.call_count == 1 + gemini_client.MAX_RETRIES
+    assert gemini_client._breaker.failure_count == 1
+    gemini_client._record_success(gemini_client._primary())
+
+
+def test_transient_server_error_is_retried():
+    gemini_client._record_success(gemini_client._primary())
+    ok = MagicMock()
+    ok.text = "recovered"
+
+    with (
+        patch.object(gemini_client, "_get_client") as mock_get_client,
+        patch.object(gemini_client, "SERVER_RETRY_BASE_SECONDS", 0),
+    ):
+        mock_client = MagicMock()
+        mock_client.models.generate_content.side_effect = [
+            genai_errors.ServerError(503, _MockResponse500()),
+            ok,
+        ]
+        mock_get_client.return_value = mock_client
+
+        result = gemini_client.generate_text_with_system("test prompt", "system")
+
+    assert result == "recovered"
+    assert mock_client.models.generate_content.call_count == 2
+
+
+def test_validation_error_is_not_retried():
+    """A 400 is raised straight away without a second call."""
+    gemini_client._record_success(gemini_client._primary())
+
+    with patch.object(gemini_client, "_get_client") as mock_get_client:
+        mock_client = MagicMock()
+        mock_client.models.generate_content.side_effect = genai_errors.ClientError(400, _MockResponse400())
+        mock_get_client.return_value = mock_client
+
+        with pytest.raises(genai_errors.ClientError):
+            gemini_client.generate_text_with_system("test prompt", "system")
+
+    assert mock_client.models.generate_content.call_count == 1
+
+
+def test_async_identical_requests_share_one_call_and_reuse_reply():
+    """Concurrent identical async requests hit Gemini once; a later identical request reuses the reply."""
+    gemini_client._record_success(gemini_client._primary())
+    gemini_client._recent_results.clear()
+    calls = 0
+
+    async def generate(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return MagicMock(text="shared reply")
+
+    async def run():
+        first = await asyncio.gather(
+            gemini_client.generate_text_with_system_async("same prompt", "system"),
+            gemini_client.generate_text_with_system_async("same prompt", "system"),
+        )
+        again = await gemini_client.generate_text_with_system_async("same prompt", "system")
+        return first, again
+
+    with patch.object(gemini_client, "_get_client") as mock_get_client:
+        mock_client = MagicMock()
+        mock_client.aio.models.generate_content = generate
+        mock_get_client.return_value = mock_client
+
+        first, again = asyncio.run(run())
+
+    assert first == ["shared reply", "shared reply"]
+    assert again == "shared reply"
+    assert calls == 1
+    gemini_client._recent_results.clear()
+
+
+def test_async_shared_call_outlives_a_short_deadline_and_a_cancelled_caller():
+    """A caller's deadline or disconnect only affects that caller, not others joined to the call."""
+    gemini_client._record_success(gemini_client._primary())
+    gemini_client._recent_results.clear()
+    calls = 0
+
+    async def generate(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return MagicMock(text="shared reply")
+
+    async def run():
+        impatient = asyncio.create_task(
+            gemini_client.generate_text_with_system_async("p", "system", deadline=time.monotonic() + 0.01)
+        )
+        leaving = asyncio.create_task(gemini_client.generate_text_with_system_async("p", "system"))
+        patient = asyncio.create_task(gemini_client.generate_text_with_system_async("p", "system"))
+        await asyncio.sleep(0.02)
+        leaving.cancel()
+        return await impatient, await asyncio.gather(leaving, return_exceptions=True), await patient
+
+    with patch.object(gemini_client, "_get_client") as mock_get_client:
+        mock_get_client.return_value.aio.models.generate_content = generate
+        impatient, (leaving,), patient = asyncio.run(run())
+
+    assert impatient is None
+    assert isinstance(leaving, asyncio.CancelledError)
+    assert patient == "shared reply"
+    assert calls == 1
+    gemini_client._recent_results.clear()
+
+
+def test_async_shared_call_is_cancelled_when_every_caller_leaves():
+    gemini_client._record_success(gemini_client._primary())
+    gemini_client._recent_results.clear()
+    cancelled = False
+
+    async def generate(*args, **kwargs):
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    async def run():
+        result = await gemini_client.generate_text_with_system_async(
+            "abandoned", "system", deadline=time.monotonic() + 0.01
+        )
+        await asyncio.sleep(0)  # let the cancellation land
+        return result
+
+    with patch.object(gemini_client, "_get_client") as mock_get_client:
+        mock_get_client.return_value.aio.models.generate_content = generate
+        result = asyncio.run(run())
+
+    assert result is None
+    assert cancelled
+    assert not gemini_client._inflight
+    assert gemini_client._breaker.state == "closed"
+
+
+def test_async_calls_are_bounded_by_concurrency_setting():
+    """No more than gemini_max_concurrent_requests async Gemini calls are in flight at once."""
+    gemini_client._record_success(gemini_client._primary())
+    gemini_client._recent_results.clear()
+    in_flight = 0
+    peak = 0
+
+    async def generate(*args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return MagicMock(text="ok")
+
+    async def run():
+        return await asyncio.gather(
+            *(gemini_client.generate_text_with_system_async(f"prompt {i}", "system") for i in range(6))
+        )
+
+    with (
+        patch.object(gemini_client, "_get_client") as mock_get_client,
+        patch.object(gemini_client.settings, "gemini_max_concurrent_requests", 2),
+    ):
+        mock_client = MagicMock()
+        mock_client.aio.models.generate_content = generate
+        mock_get_client.return_value = mock_client
+
+        results = asyncio.run(run())
+
+    assert results == ["ok"] * 6
+    assert peak == 2
+    gemini_client._recent_results.clear()
+
+
+def test_client_is_reused_per_api_key():
+    """_get_client returns the same genai.Client for the same key and a new one when the key changes."""
+    with patch.object(gemini_client.settings, "gemini_api_key", "key-a"):
+        first = gemini_client._get_client()
+        second = gemini_client._get_client()
+    with patch.object(gemini_client.settings, "gemini_api_key", "key-b"):
+        other = gemini_client._get_client()
+
+    assert first is second
+    assert other is not first
+    gemini_client._client_for_key.cache_clear()
+
+
+def test_token_bucket_paces_bursts_and_refuses_long_waits():
+    bucket = TokenBucket("test", rate_per_minute=60, burst=2)
+
+    assert bucket.reserve(max_wait=0) == 0.0
+    assert bucket.reserve(max_wait=0) == 0.0
+    # Bucket empty: the next slot is ~1 s away at 60 rpm
+    assert bucket.reserve(max_wait=0.5) is None
+    wait = bucket.reserve(max_wait=2)
+    assert 0.9 <= wait <= 1.0
+    # A refused reservation must not consume a token; the queued one pushed the next slot out
+    assert 1.9 <= bucket.reserve(max_wait=5) <= 2.0
+
+
+def test_local_rate_limit_skips_call_instead_of_waiting_too_long():
+    """When no slot frees up within gemini_max_block_s the call returns None without hitting Gemini."""
+    gemini_client._record_success(gemini_client._primary())
+
+    with (
+        patch.object(gemini_client, "_get_client") as mock_get_client,
+        patch.object(gemini_client, "_bucket", TokenBucket("gemini", rate_per_minute=1, burst=1)),
+        patch.object(gemini_client.settings, "gemini_max_block_s", 0.01),
+    ):
+        mock_client = MagicMock()
+        mock_client.models.generate_content.return_value.text = "ok"
+        mock_get_client.return_value = mock_client
+
+        first = gemini_client.generate_text_with_system("p1", "system")
+        second = gemini_client.generate_text_with_system("p2", "system")
+
+    assert first == "ok"
+    assert second is None
+    assert mock_client.models.generate_content.call_count == 1
+
+
+def test_business_chat_stream_yields_chunks_and_records_success():
+    gemini_client._breaker_chat.trip(0)
+
+    async def chunks():
+        for text in ("Hello", None, " there"):
+            chunk = MagicMock()
+            chunk.text = text
+            yield chunk
+
+    async def generate_content_stream(**kwargs):
+        return chunks()
+
+    async def collect():
+        return [
+            text
+            async for text in gemini_client.stream_business_chat_with_search_async(
+                "system", [{"role": "user", "content": "hi"}]
+            )
+        ]
+
+    with patch.object(gemini_client, "_get_client_chat") as mock_get_client:
+        mock_client = MagicMock()
+        mock_client.aio.models.generate_content_stream = generate_content_stream
+        mock_get_client.return_value = mock_client
+
+        result = asyncio.run(collect())
+
+    assert result == ["Hello", " there"]
+    assert gemini_client._breaker_chat.state == "closed"
+
+
+def test_business_chat_with_search_uses_chat_key_and_search_config():
+    gemini_client._record_success(gemini_client._chat())
+
+    with (
+        patch.object(gemini_client, "_get_client_chat") as mock_get_client_chat,
+        patch.object(gemini_client, "_get_client") as mock_get_client,
+    ):
+        mock_get_client_chat.return_value.models.generate_content.return_value.text = "grounded"
+        result = gemini_client.generate_business_chat_with_search(
+            "system", [{"role": "user", "content": "question"}]
+        )
+
+    assert result == "grounded"
+    mock_get_client.assert_not_called()
+    kwargs = mock_get_client_chat.return_value.models.generate_content.call_args.kwargs
+    assert kwargs["contents"] == "question"
+    assert kwargs["config"] is gemini_client._search_config_for("system")
+
+
+def test_text_stream_uses_primary_key_and_system_config():
+    seen = {}
+
+    async def chunks():
+        for text in ("Hi", "!"):
+            chunk = MagicMock()
+            chunk.text = text
+            yield chunk
+
+    async def generate_content_stream(**kwargs):
+        seen.update(kwargs)
+        return chunks()
+
+    async def collect():
+        return [text async for text in gemini_client.stream_text_with_system_async("prompt", "system x")]
+
+    with patch.object(gemini_client, "_get_client") as mock_get_client:
+        mock_get_client.return_value.aio.models.generate_content_stream = generate_content_stream
+        result = asyncio.run(collect())
+
+    assert result == ["Hi", "!"]
+    assert seen["contents"] == "prompt"
+    assert seen["config"] is gemini_client._config_for("system x")
+
+
+def test_request_config_is_shared_per_system_instruction():
+    assert gemini_client._config_for("system a") is gemini_client._config_for("system a")
+    assert gemini_client._config_for("system a") is not gemini_client._config_for("system b")
+    assert gemini_client._config_for("system a").system_instruction == "system a"
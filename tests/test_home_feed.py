@@ -69,7 +69,7 @@ def test_home_feed_includes_ai_tag_sections_when_businesses_have_tags(client, db
     )
     db_session.add(b1)
     db_session.add(b2)
-    db_session.commit()
+    db_session.flush()
 
     token = create_test_token(sub="550e8400-e29b-41d4-a716-4466554400d2", email="homefeed2@example.com")
     _complete_onboarding(client, token)
@@ -228,7 +228,7 @@ def test_home_feed_business_to_place_result_includes_photo_url(client, db_sessio
         ai_tags=["coffee"],
     )
     db_session.add(biz_no_photo)
-    db_session.commit()
+    db_session.flush()
 
     out_url = _business_to_place_result(biz_with_url)
     assert out_url.photo_url == "https://maps.googleapis.com/maps/api/place/photo?maxwidth=1200&photo_reference=ref1&key=test"
@@ -253,7 +253,7 @@ def test_home_feed_includes_quick_bites_when_business_has_tag(client, db_session
         ai_tags=["quick-bite"],
     )
     db_session.add(b)
-    db_session.commit()
+    db_session.flush()
 
     token = create_test_token(sub="550e8400-e29b-41d4-a716-4466554400d5", email="quickbites@example.com")
     _complete_onboarding(client, token)
@@ -325,3 +325,36 @@ def test_home_feed_includes_restaurants_nearby_when_mocked(client, mock_jwks, cr
     assert rest.get("subtitle") == "Restaurants within about a mile"
     assert len(rest["businesses"]) == 1
     assert rest["businesses"][0]["name"] == "Test Restaurant"
+
+
+def test_home_feed_fetches_nearby_sections_concurrently(client, mock_jwks, create_test_token):
+    """Nearby sections are fetched concurrently (bounded) and still come back in spec order."""
+    import asyncio
+    from app.routers.home import NEARBY_FETCH_CONCURRENCY, NEARBY_SECTION_SPECS
+
+    token = create_test_token(sub="550e8400-e29b-41d4-a716-4466554400d7", email="concurrent@example.com")
+    _complete_onboarding(client, token)
+
+    in_flight = 0
+    peak = 0
+
+    async def slow_nearby(lat, lng, radius, type_):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        place = PlaceResult(provider="google", provider_place_id=f"p_{type_}", name=type_, lat=lat, lng=lng)
+        return ([place], [place.provider_place_id])
+
+    with patch("app.routers.home._fetch_nearby_places_async", side_effect=slow_nearby):
+        response = client.get(
+            "/api/v1/home-feed",
+            params={"lat": 40.7128, "lng": -74.0060},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert peak == NEARBY_FETCH_CONCURRENCY
+    ids = [s["id"] for s in response.json()["sections"]][: len(NEARBY_SECTION_SPECS)]
+    assert ids == [spec[0] for spec in NEARBY_SECTION_SPECS]
@@ -324,6 +324,25 @@ def test_update_preferences_with_datetime_string(client, mock_jwks, create_test_
     assert get_data["onboarding_completed_at"] == completed_at
 
 
+def test_update_preferences_rejects_invalid_datetime(client, mock_jwks, create_test_token):
+    """PUT /me/preferences with a non-ISO onboarding_completed_at is rejected by schema validation."""
+    token = create_test_token(sub="550e8400-e29b-41d4-a716-44665544010a", email="bad_datetime@example.com")
+    client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"})
+
+    response = client.put(
+        "/api/v1/me/preferences",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "onboarding_preferences": {"companion": "Solo"},
+            "onboarding_completed_at": "not-a-date",
+        },
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    me = client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"}).json()
+    assert me["onboarding_completed_at"] is None
+
+
 def test_update_preferences_with_explicit_datetime(client, mock_jwks, create_test_token):
     """Test that onboarding_completed_at can be set explicitly."""
     token = create_test_token(sub="550e8400-e29b-41d4-a716-446655440104", email="test_precedence@example.com")
@@ -1,16 +1,23 @@
 """Tests for places router, including _upsert_business_from_place, GET /details, and GET /nearby."""
 
+import math
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import anyio
 import pytest
 from fastapi import status
+from pydantic import ValidationError
 
 from app.core.auth import get_current_user
 from app.main import app
 from app.models.business import Business
 from app.models.user import User
+from app.schemas.places import PLACE_RESULT_LIST, PlaceResult, TextSearchResponse
+from app.core.geo import haversine_distance_km
 from app.routers.places import (
+    _normalize_opening_hours,
+    _validated_results,
     _upsert_business_from_place,
     PREWARM_CAP,
 )
@@ -70,7 +77,7 @@ def test_upsert_business_from_place_updates_existing_row(db_session):
     result1 = _minimal_place_result(place_id, name="Original Name")
     b1 = _upsert_business_from_place(db_session, place_id, result1)
     b1.ai_notes = "curated user notes"
-    db_session.commit()
+    db_session.flush()
 
     result2 = _minimal_place_result(place_id, name="Updated Name")
     b2 = _upsert_business_from_place(db_session, place_id, result2)
@@ -104,8 +111,7 @@ def test_place_details_when_ai_fresh_returns_ready_and_includes_ai(client, db_se
     business.ai_notes = "Test ai notes"
     business.ai_context = fixed_ai_context
     business.ai_context_last_updated = datetime.now(timezone.utc)
-    db_session.commit()
-    db_session.refresh(business)
+    db_session.flush()
 
     mock_user = MagicMock(spec=User)
     mock_user.id = None
@@ -139,6 +145,42 @@ def test_place_details_when_ai_fresh_returns_ready_and_includes_ai(client, db_se
     assert data["result"]["ai_context"] == fixed_ai_context
 
 
+def test_place_details_with_invalid_stored_ai_context_returns_pending(client, db_session):
+    """A stored ai_context that no longer validates is treated as missing instead of failing with 500."""
+    place_id = "ChIJ-bad-context"
+    minimal_result = _minimal_place_result(place_id, name="Old Shape Cafe")
+    business = _upsert_business_from_place(db_session, place_id, minimal_result)
+    business.ai_notes = "Old notes"
+    business.ai_context = {"summary": "Old", "pros": "not-a-list"}
+    business.ai_context_last_updated = datetime.now(timezone.utc)
+    db_session.flush()
+
+    mock_user = MagicMock(spec=User)
+    mock_user.id = None
+    mock_user.onboarding_completed_at = datetime.now(timezone.utc)
+    mock_user.onboarding_preferences = None
+    app.dependency_overrides[get_current_user] = lambda: mock_user
+
+    try:
+        with (
+            patch(
+                "app.routers.places._call_google_api",
+                new_callable=AsyncMock,
+                return_value={"status": "OK", "result": minimal_result},
+            ),
+            patch("app.routers.places.generate_and_save_business_ai_insights") as mock_save_insights,
+        ):
+            response = client.get(f"/api/v1/places/details?place_id={place_id}")
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["ai_status"] == "pending"
+    assert data["ai_context"] is None
+    mock_save_insights.assert_called_once()
+
+
 def test_place_details_when_ai_missing_returns_pending_and_schedules_background_task(client, db_session):
     """
     When ai_notes/context are missing, GET /places/details returns quickly with ai_status="pending",
@@ -213,7 +255,10 @@ def test_place_details_returns_200_with_pending_when_no_ai_data(client, db_sessi
     assert data["result"]["provider_place_id"] == place_id
     assert data["result"]["name"] == "Place No AI"
     assert data.get("ai_status") == "pending"
-    assert data.get("ai_context") is None
+    # Unset fields are sent as null, not omitted
+    assert data["ai_context"] is None
+    assert data["result"]["ai_notes"] is None
+    assert data["result"]["opening_hours"] is None
 
 
 # --- GET /places/nearby: arbitrary coordinates and validation ---
@@ -428,8 +473,7 @@ def test_prewarm_skips_business_with_fresh_ai(db_session):
     business.ai_notes = "Cached notes"
     business.ai_context = {"summary": "Cached"}
     business.ai_context_last_updated = datetime.now(timezone.utc)
-    db_session.commit()
-    db_session.refresh(business)
+    db_session.flush()
 
     with (
         patch("app.db.session.SessionLocal", return_value=db_session),
@@ -437,6 +481,98 @@ def test_prewarm_skips_business_with_fresh_ai(db_session):
         patch("app.routers.places._fetch_place_details_sync", return_value={"status": "OK", "result": result}),
         patch("app.routers.places.generate_and_save_business_ai_insights") as mock_save,
     ):
-        _prewarm_ai_insights_for_place_ids([place_id])
+        anyio.run(_prewarm_ai_insights_for_place_ids, [place_id])
 
     mock_save.assert_not_called()
+
+
+def test_normalize_opening_hours_drops_malformed_periods():
+    """Periods outside day 0-6 or not "HHMM" are rejected; valid ones pass through."""
+    hours = _normalize_opening_hours({
+        "open_now": True,
+        "periods": [
+            {"open": {"day": 1, "time": "0900"}, "close": {"day": 1, "time": "1700"}},
+            {"open": {"day": 7, "time": "0900"}},
+            {"open": {"day": 2, "time": "9am"}},
+            {"open": {"day": 0, "time": "0000"}},
+        ],
+    })
+
+    assert [(p.open_day, p.open_time, p.close_time) for p in hours.periods] == [
+        (1, "0900", "1700"),
+        (0, "0000", None),
+    ]
+
+
+def test_validated_results_rejects_malformed_constructed_result():
+    """Search payloads built with model_construct are still validated once before going out."""
+    good = PlaceResult.model_construct(provider="google", provider_place_id="p1", name="Ok", lat=1.0, lng=2.0)
+    bad = PlaceResult.model_construct(provider="google", provider_place_id="p2", name=None, lat=1.0, lng=2.0)
+
+    assert _validated_results(PLACE_RESULT_LIST, [good])[0]["name"] == "Ok"
+    with pytest.raises(ValidationError):
+        _validated_results(PLACE_RESULT_LIST, [good, bad])
+
+
+def test_places_search_distance_matches_geo_helper_and_handles_antipode(client):
+    """Search distances come from app.core.geo; a point opposite the origin does not raise."""
+    google_results = [
+        {"place_id": "bronx", "name": "Bronx", "geometry": {"location": {"lat": 40.8448, "lng": -73.8648}}},
+        {"place_id": "antipode", "name": "Antipode", "geometry": {"location": {"lat": -40.7, "lng": 106.1}}},
+    ]
+    with patch(
+        "app.routers.places._call_google_api",
+        new_callable=AsyncMock,
+        return_value={"status": "OK", "results": google_results},
+    ):
+        response = client.get(
+            "/api/v1/places/search",
+            params={"q": "pizza", "lat": 40.7, "lng": -73.9},
+        )
+    assert response.status_code == status.HTTP_200_OK
+    bronx, antipode = response.json()["results"]
+    assert abs(bronx["distance_m"] - haversine_distance_km(40.7, -73.9, 40.8448, -73.8648) * 1000) <= 1
+    assert abs(antipode["distance_m"] - math.pi * 6371000) <= 1
+
+
+def test_places_search_returns_valid_payload_sorted_by_distance(client):
+    """GET /places/search serializes directly; payload must still match TextSearchResponse."""
+    google_results = [
+        {
+            "place_id": "far",
+            "name": "Far Pizza",
+            "formatted_address": "2 Far St",
+            "geometry": {"location": {"lat": 40.80, "lng": -73.90}},
+            "types": ["restaurant", "point_of_interest"],
+            "rating": 4,
+            "user_ratings_total": 12,
+            "photos": [{"photo_reference": "ref_far"}],
+        },
+        {
+            "place_id": "near",
+            "name": "Near Pizza",
+            "formatted_address": "1 Near St",
+            "geometry": {"location": {"lat": 40.7001, "lng": -73.9001}},
+            "types": ["point_of_interest", "cafe"],
+            "price_level": 2,
+        },
+    ]
+    with patch(
+        "app.routers.places._call_google_api",
+        new_callable=AsyncMock,
+        return_value={"status": "OK", "results": google_results},
+    ):
+        response = client.get(
+            "/api/v1/places/search",
+            params={"q": "pizza", "lat": 40.7, "lng": -73.9},
+        )
+    assert response.status_code == status.HTTP_200_OK
+    parsed = TextSearchResponse.model_validate(response.json())
+    assert [r.provider_place_id for r in parsed.results] == ["near", "far"]
+    near, far = parsed.results
+    assert near.category == "cafe"
+    assert near.price_level == 2
+    assert near.photo_url is None
+    assert far.category == "restaurant"
+    assert far.photo_url.endswith("&photo_reference=ref_far")
+    assert near.distance_m < far.distance_m
@@ -0,0 +1,127 @@
+"""Tests for the Google Places client service used for AI grounding."""
+
+import asyncio
+
+import anyio
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services import places_client
+
+
+@pytest.fixture(autouse=True)
+def _clear_place_hours_cache():
+    places_client._place_hours_cache.clear()
+    yield
+    places_client._place_hours_cache.clear()
+
+
+def _fake_response(payload: dict, status_code: int = 200) -> httpx.Response:
+    return httpx.Response(status_code, json=payload)
+
+
+def test_find_place_with_hours_uses_single_search_text_call():
+    """Name, address and hours come back from one searchText POST (no details hop)."""
+    payload = {
+        "places": [
+            {
+                "id": "ChIJ-papa-1",
+                "displayName": {"text": "Papa John's", "languageCode": "en"},
+                "formattedAddress": "123 Castle Hill Ave, Bronx, NY",
+                "currentOpeningHours": {"weekdayDescriptions": ["Monday: 10:00 AM – 11:00 PM"]},
+            }
+        ]
+    }
+    http_client = MagicMock()
+    http_client.post = AsyncMock(return_value=_fake_response(payload))
+    http_client.get = AsyncMock()
+
+    with patch.object(places_client.settings, "google_maps_api_key", "test-key"), \
+            patch("app.services.places_client.get_http_client", return_value=http_client):
+        result = anyio.run(places_client.find_place_with_hours, "Papa John's", "Bronx, NY")
+
+    assert result == {
+        "name": "Papa John's",
+        "formatted_address": "123 Castle Hill Ave, Bronx, NY",
+        "opening_hours": ["Monday: 10:00 AM – 11:00 PM"],
+        "place_id": "ChIJ-papa-1",
+    }
+    http_client.post.assert_awaited_once()
+    assert not http_client.get.called
+    args, kwargs = http_client.post.call_args
+    assert args[0] == places_client.GOOGLE_PLACES_SEARCH_TEXT_URL
+    assert kwargs["json"]["textQuery"] == "Papa John's Bronx, NY"
+    assert kwargs["headers"]["X-Goog-Api-Key"] == "test-key"
+    assert "currentOpeningHours.weekdayDescriptions" in kwargs["headers"]["X-Goog-FieldMask"]
+
+
+def test_find_place_with_hours_no_results_returns_none():
+    http_client = MagicMock()
+    http_client.post = AsyncMock(return_value=_fake_response({}))
+
+    with patch.object(places_client.settings, "google_maps_api_key", "test-key"), \
+            patch("app.services.places_client.get_http_client", return_value=http_client):
+        result = anyio.run(places_client.find_place_with_hours, "Nowhere Diner", None)
+
+    assert result is None
+
+
+def test_find_place_with_hours_caches_by_normalized_query():
+    """A repeat lookup (case/whitespace-insensitive) is served from cache as a fresh copy."""
+    payload = {
+        "places": [
+            {
+                "id": "ChIJ-cache-1",
+                "displayName": {"text": "Joe's Pizza"},
+                "formattedAddress": "7 Carmine St, New York, NY",
+                "currentOpeningHours": {"weekdayDescriptions": ["Monday: 10:00 AM – 4:00 AM"]},
+            }
+        ]
+    }
+    http_client = MagicMock()
+    http_client.post = AsyncMock(return_value=_fake_response(payload))
+
+    with patch.object(places_client.settings, "google_maps_api_key", "test-key"), \
+            patch("app.services.places_client.get_http_client", return_value=http_client):
+        first = anyio.run(places_client.find_place_with_hours, "Joe's Pizza", "New York")
+        first["opening_hours"].append("mutated")
+        second = anyio.run(places_client.find_place_with_hours, "  joe's pizza ", "NEW YORK")
+
+    assert http_client.post.await_count == 1
+    assert second["place_id"] == "ChIJ-cache-1"
+    assert second["opening_hours"] == ["Monday: 10:00 AM – 4:00 AM"]
+
+
+def test_find_place_with_hours_joiner_survives_cancelled_first_caller():
+    """Cancelling the caller that started a lookup does not cancel it for a caller that joined."""
+    payload = {"places": [{"id": "ChIJ-shared", "displayName": {"text": "Shared Cafe"}}]}
+    release = None
+
+    async def slow_post(*args, **kwargs):
+        await release.wait()
+        return _fake_response(payload)
+
+    http_client = MagicMock()
+    http_client.post = AsyncMock(side_effect=slow_post)
+
+    async def scenario():
+        nonlocal release
+        release = anyio.Event()
+        first = asyncio.create_task(places_client.find_place_with_hours("Shared Cafe", None))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(places_client.find_place_with_hours("shared cafe", None))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return first, await second
+
+    with patch.object(places_client.settings, "google_maps_api_key", "test-key"), \
+            patch("app.services.places_client.get_http_client", return_value=http_client):
+        first, joined = anyio.run(scenario)
+
+    assert first.cancelled()
+    assert joined["place_id"] == "ChIJ-shared"
+    assert http_client.post.await_count == 1
+    assert places_client._place_hours_inflight == {}
@@ -0,0 +1,62 @@
+import uuid
+
+from fastapi import status
+
+from app.models.menu_item import MenuItem
+from app.models.scan_session import ScanSession
+
+
+def _item_payload(menu_item_id, rank):
+    return {
+        "menu_item_id": str(menu_item_id),
+        "rank": rank,
+        "is_recommended": True,
+        "recommendation_label": "RECOMMENDED",
+        "display_mention_count": 3,
+        "display_avg_rating": 4.5,
+    }
+
+
+def test_create_recommendation_items_bulk(seeded_client, seeded_db):
+    """Bulk create returns every inserted row, in request order, with server-generated fields."""
+    scan_session = seeded_db.query(ScanSession).first()
+    menu_items = seeded_db.query(MenuItem).limit(2).all()
+    items = [_item_payload(m.id, rank) for m, rank in zip(menu_items, (2, 1))]
+
+    response = seeded_client.post(
+        f"/api/v1/scan-sessions/{scan_session.id}/recommendations",
+        json={"items": items},
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    data = response.json()
+    assert [(d["menu_item_id"], d["rank"]) for d in data] == [
+        (item["menu_item_id"], item["rank"]) for item in items
+    ]
+    for d in data:
+        assert d["scan_session_id"] == str(scan_session.id)
+        assert d["id"]
+        assert d["created_at"]
+
+
+def test_create_recommendation_items_missing_menu_item(seeded_client, seeded_db):
+    """Unknown menu item ids are rejected before anything is inserted."""
+    scan_session = seeded_db.query(ScanSession).first()
+
+    response = seeded_client.post(
+        f"/api/v1/scan-sessions/{scan_session.id}/recommendations",
+        json={"items": [_item_payload(uuid.uuid4(), 1)]},
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_create_recommendation_items_invalid_body(seeded_client, seeded_db):
+    """Malformed items are rejected with a FastAPI-style 422 pointing into the body."""
+    scan_session = seeded_db.query(ScanSession).first()
+
+    response = seeded_client.post(
+        f"/api/v1/scan-sessions/{scan_session.id}/recommendations",
+        json={"items": [{"menu_item_id": "not-a-uuid", "rank": 1}]},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    locs = [tuple(d["loc"]) for d in response.json()["detail"]]
+    assert ("body", "items", 0, "menu_item_id") in locs
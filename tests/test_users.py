@@ -46,3 +46,16 @@ def test_get_user_not_found(seeded_client):
     response = seeded_client.get(f"/api/v1/users/{fake_id}")
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
+
+
+def test_create_user_rejects_non_uuid_external_auth_uid(client):
+    """external_auth_uid is validated as a UUID by the schema."""
+    response = client.post(
+        "/api/v1/users",
+        json={
+            "external_auth_uid": "not-a-uuid",
+            "auth_provider_id": "bad_uid",
+            "email": "bad_uid@example.com",
+        },
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY